@@ -0,0 +1,198 @@
+import html
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+from cliente_http import ClienteSessao, ErroApi, sessao_do_navegador
+
+ARQUIVO_CONFIGURACAO = os.environ.get(
+    "AUTOMACAO_ALM_API", os.path.join(os.path.dirname(os.path.abspath(__file__)), "alm_api.json")
+)
+
+# "{dc:type/dc:title} {dc:identifier}": propriedades OSLC, com "/" para propriedades de um recurso expandido
+RE_PROPRIEDADE = re.compile(r"\{([^}]+)\}")
+RE_TAG = re.compile(r"<[^>]+>")
+
+# Operações da etapa 11, na ordem em que a tela as faz
+OPERACOES_RESULTADO = ("comentar", "adicionar_link", "atualizar_pf")
+
+
+def carregar_configuracao(caminho=ARQUIVO_CONFIGURACAO):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+# ==============================================================================
+# INTERFACE COMUM: NAVEGADOR (automation.AlmNavegador) OU API (ClienteAlm)
+# ==============================================================================
+class BackendAlm:
+    """Leitura e escrita de um work item do ALM."""
+
+    def ler_campos(self, id_item, campos):
+        """Retorna {campo: texto ou None} para os campos de armazem.CAMPOS_ALM pedidos."""
+        raise NotImplementedError
+
+    def comentar(self, id_item, comentario):
+        raise NotImplementedError
+
+    def adicionar_link(self, id_item, link, rotulo):
+        raise NotImplementedError
+
+    def atualizar_pf(self, id_item, pf):
+        raise NotImplementedError
+
+    def registrar_resultado(self, id_item, comentario, link, rotulo, pf, operacoes=OPERACOES_RESULTADO):
+        """Grava o comentário da contagem, o link do Pontua e o tamanho em PF (só as `operacoes` pedidas)."""
+        argumentos = {"comentar": (comentario,), "adicionar_link": (link, rotulo), "atualizar_pf": (pf,)}
+        for operacao in operacoes:
+            getattr(self, operacao)(id_item, *argumentos[operacao])
+
+
+class GravacaoParcial(ErroApi):
+    """Parte do resultado não foi gravada pela API; `pendentes` lista as operações que faltaram."""
+
+    def __init__(self, mensagem, pendentes):
+        super().__init__(mensagem)
+        self.pendentes = pendentes
+
+
+# ==============================================================================
+# CLIENTE OSLC DO JAZZ CCM
+# ==============================================================================
+def _valor(recurso, caminho):
+    for parte in caminho.split("/"):
+        if not isinstance(recurso, dict):
+            return None
+        recurso = recurso.get(parte)
+    return recurso
+
+
+def _texto(valor):
+    """Texto como o navegador exibe: sem as tags HTML do CKEditor e com espaços normalizados."""
+    if valor is None:
+        return None
+    texto = html.unescape(RE_TAG.sub(" ", str(valor)))
+    return " ".join(texto.split()) or None
+
+
+class ClienteAlm(ClienteSessao, BackendAlm):
+    """Lê e grava work items pelas APIs OSLC do Jazz CCM, com os cookies da aba do ALM.
+
+    As propriedades de cada campo, o atributo do tamanho em PF e os caminhos dos recursos
+    vêm de alm_api.json. Várias demandas podem ser lidas ou gravadas de uma vez, em paralelo
+    sobre o mesmo pool de conexões.
+    """
+
+    def __init__(self, url_base, cookies=None, configuracao=None, conexoes=4, timeout=30):
+        self.configuracao = configuracao or carregar_configuracao()
+        super().__init__(url_base, cookies, self.configuracao.get("cabecalhos"), conexoes, timeout)
+
+    @classmethod
+    def do_navegador(cls, navegador, configuracao=None):
+        """Cliente com os cookies da aba atual, que deve estar no ALM e autenticada."""
+        url_base, cookies = sessao_do_navegador(navegador)
+        return cls(url_base, cookies, configuracao)
+
+    def sessao_expirada(self, resposta):
+        # O Jazz responde 200 com a página de login e este cabeçalho quando a sessão acabou
+        return super().sessao_expirada(resposta) or resposta.headers.get("X-com-ibm-team-repository-web-auth-msg") == "authrequired"
+
+    def _caminho(self, recurso, id_item, propriedades=None):
+        caminho = self.configuracao["recursos"][recurso].format(id=id_item)
+        if propriedades:
+            caminho += "?oslc_cm.properties=" + quote(propriedades, safe=":,{}")
+        return caminho
+
+    def _propriedades(self, campos):
+        """'dc:title,dc:creator{dc:title}' para os campos pedidos."""
+        expandidas = {}
+        for campo in campos:
+            for caminho in RE_PROPRIEDADE.findall(self.configuracao["campos"][campo]):
+                raiz, _, resto = caminho.partition("/")
+                filhos = expandidas.setdefault(raiz, set())
+                if resto:
+                    filhos.add(resto.replace("/", "{") + "}" * resto.count("/"))
+        return ",".join(f"{raiz}{{{','.join(sorted(filhos))}}}" if filhos else raiz for raiz, filhos in expandidas.items())
+
+    # ---------------- leitura ----------------
+    def ler_campos(self, id_item, campos):
+        item = self.requisitar_json("GET", self._caminho("item", id_item, self._propriedades(campos)))
+        textos = {}
+        for campo in campos:
+            modelo = self.configuracao["campos"][campo]
+            valores = {caminho: _texto(_valor(item, caminho)) for caminho in RE_PROPRIEDADE.findall(modelo)}
+            textos[campo] = (
+                RE_PROPRIEDADE.sub(lambda encontrado: valores[encontrado.group(1)], modelo).strip()
+                if all(valores.values()) else None
+            )
+        return textos
+
+    def ler_itens(self, ids, campos):
+        """Lê vários work items em paralelo. Retorna {id: textos ou a exceção da leitura}."""
+        def ler(id_item):
+            try:
+                return self.ler_campos(id_item, campos)
+            except ErroApi as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=self.conexoes) as executor:
+            return dict(zip(ids, executor.map(ler, ids)))
+
+    # ---------------- escrita ----------------
+    def comentar(self, id_item, comentario):
+        texto = html.escape(comentario.strip()).replace("\n", "<br/>")
+        self.requisitar("POST", self._caminho("comentarios", id_item), {"dc:description": texto})
+
+    def adicionar_link(self, id_item, link, rotulo):
+        self.requisitar("POST", self._caminho("links", id_item), {"rdf:resource": link, "oslc_cm:label": rotulo})
+
+    def atualizar_atributos(self, id_item, atributos):
+        """Atualização parcial: só os atributos informados, com o ETag atual do item (If-Match)."""
+        propriedades = ",".join(atributos)
+        caminho = self._caminho("item", id_item, propriedades)
+        for _ in range(2):
+            etag = self.requisitar("GET", caminho).headers.get("ETag")
+            resposta = self.requisitar("PUT", caminho, atributos, {"If-Match": etag} if etag else None, aceitar=(412,))
+            if resposta.status != 412:
+                return
+        raise ErroApi(f"PUT {caminho}: o item mudou durante a atualização (412)", 412)
+
+    def atualizar_pf(self, id_item, pf):
+        self.atualizar_atributos(id_item, {self.configuracao["atributo_pf"]: str(pf)})
+
+    def registrar_resultado(self, id_item, comentario, link, rotulo, pf, operacoes=OPERACOES_RESULTADO):
+        # Comentário e link são recursos independentes e vão em paralelo; o PF altera o próprio item
+        argumentos = {"comentar": (comentario,), "adicionar_link": (link, rotulo), "atualizar_pf": (pf,)}
+        falhas = {}
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            envios = {
+                operacao: executor.submit(getattr(self, operacao), id_item, *argumentos[operacao])
+                for operacao in operacoes if operacao != "atualizar_pf"
+            }
+            for operacao, envio in envios.items():
+                try:
+                    envio.result()
+                except ErroApi as e:
+                    falhas[operacao] = e
+        if "atualizar_pf" in operacoes:
+            try:
+                self.atualizar_pf(id_item, pf)
+            except ErroApi as e:
+                falhas["atualizar_pf"] = e
+        if falhas:
+            pendentes = [operacao for operacao in operacoes if operacao in falhas]
+            detalhes = "; ".join(f"{operacao}: {erro}" for operacao, erro in falhas.items())
+            raise GravacaoParcial(f"Work item {id_item}: {detalhes}", pendentes)
+
+    def registrar_resultados(self, resultados):
+        """Grava vários resultados em paralelo: [(id, comentario, link, rotulo, pf)]. Retorna {id: None ou a exceção}."""
+        def registrar(resultado):
+            try:
+                self.registrar_resultado(*resultado)
+            except ErroApi as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, self.conexoes // 2)) as executor:
+            return dict(zip((r[0] for r in resultados), executor.map(registrar, resultados)))
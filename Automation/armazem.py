@@ -0,0 +1,167 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from decisoes import normalizar_numero
+
+ARQUIVO_BANCO = os.environ.get("AUTOMACAO_BANCO", "demandas.sqlite3")
+# Campos extraídos há mais tempo que isto são lidos de novo no ALM
+VALIDADE_PADRAO = timedelta(hours=float(os.environ.get("AUTOMACAO_VALIDADE_HORAS", "24")))
+
+# Campos lidos do ALM, na ordem da extração
+CAMPOS_ALM = ["resumo", "numero_demanda", "solicitante", "data_criacao", "codigo_servico", "tipo_demanda", "responsavel"]
+
+# Estados de uma demanda, na ordem em que o fluxo os produz
+EXTRAIDO = "extraido"
+REGISTRADO = "registrado"
+CONCLUIDO = "concluido"
+PENDENTE = "pendente_revisao"
+
+COLUNAS_JSON = ("dados", "extraido_em", "tempos", "etapas")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS demandas (
+    chave TEXT PRIMARY KEY,
+    item TEXT,
+    estado TEXT,
+    dados TEXT,
+    extraido_em TEXT,
+    link_pontua TEXT,
+    pf TEXT,
+    erro TEXT,
+    tempos TEXT,
+    atualizado_em TEXT,
+    etapas TEXT
+)
+"""
+COLUNAS = ["chave", "item", "estado", "dados", "extraido_em", "link_pontua", "pf", "erro", "tempos", "atualizado_em", "etapas"]
+
+
+def chave_do_item(link_alm):
+    """ID do work item no fim do link (igual ao número da demanda); links sem ID usam um hash curto."""
+    numero = normalizar_numero(link_alm)
+    return numero if numero.isdigit() else hashlib.sha1(link_alm.encode("utf-8")).hexdigest()[:12]
+
+
+# ==============================================================================
+# ARMAZENAMENTO DAS DEMANDAS EM SQLITE
+# ==============================================================================
+class ArmazemDemandas:
+    """Demandas extraídas do ALM e os resultados no Pontua, por número da demanda.
+
+    Cada campo do ALM guarda o horário em que foi lido, para que execuções seguintes
+    busquem de novo só os campos vencidos. Uma conexão é compartilhada entre as threads.
+    """
+
+    def __init__(self, caminho=ARQUIVO_BANCO, validade=VALIDADE_PADRAO):
+        self.caminho = caminho
+        self.validade = validade
+        self._trava = threading.Lock()
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.row_factory = sqlite3.Row
+        with self._trava, self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(ESQUEMA)
+            existentes = {linha["name"] for linha in self._conexao.execute("PRAGMA table_info(demandas)")}
+            if "etapas" not in existentes:  # bancos criados antes dos checkpoints por etapa
+                self._conexao.execute("ALTER TABLE demandas ADD COLUMN etapas TEXT")
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
+
+    def _para_registro(self, linha):
+        registro = dict(linha)
+        for coluna in COLUNAS_JSON:
+            registro[coluna] = json.loads(registro[coluna]) if registro[coluna] else {}
+        return registro
+
+    def carregar(self, chave):
+        with self._trava:
+            linha = self._conexao.execute("SELECT * FROM demandas WHERE chave = ?", (chave,)).fetchone()
+        return self._para_registro(linha) if linha else None
+
+    def listar(self, estado=None):
+        consulta, parametros = "SELECT * FROM demandas", ()
+        if estado:
+            consulta, parametros = consulta + " WHERE estado = ?", (estado,)
+        with self._trava:
+            linhas = self._conexao.execute(consulta + " ORDER BY chave", parametros).fetchall()
+        return [self._para_registro(linha) for linha in linhas]
+
+    def atualizar(self, chave, **campos):
+        """Mescla `campos` no registro da demanda, criando-o se não existir."""
+        with self._trava, self._conexao:
+            linha = self._conexao.execute("SELECT * FROM demandas WHERE chave = ?", (chave,)).fetchone()
+            registro = self._para_registro(linha) if linha else {"chave": chave}
+            registro.update(campos)
+            registro["atualizado_em"] = datetime.now().isoformat(timespec="seconds")
+            valores = [
+                json.dumps(registro.get(coluna) or {}, ensure_ascii=False) if coluna in COLUNAS_JSON else registro.get(coluna)
+                for coluna in COLUNAS
+            ]
+            self._conexao.execute(
+                f"INSERT OR REPLACE INTO demandas ({', '.join(COLUNAS)}) VALUES ({', '.join('?' * len(COLUNAS))})", valores
+            )
+        return registro
+
+    def registrar_extracao(self, chave, item, dados, campos_lidos):
+        """Grava os dados extraídos e marca como recém-lidos os campos em `campos_lidos`."""
+        registro = self.carregar(chave) or {}
+        agora = datetime.now().isoformat(timespec="seconds")
+        extraido_em = dict(registro.get("extraido_em") or {})
+        extraido_em.update({campo: agora for campo in campos_lidos if dados.get(campo)})
+        estado = registro.get("estado") if registro.get("estado") in (REGISTRADO, CONCLUIDO) else EXTRAIDO
+        return self.atualizar(chave, item=item, estado=estado, dados=dados, extraido_em=extraido_em)
+
+    def campos_validos(self, chave):
+        """Valores dos campos do ALM lidos dentro da validade; os ausentes precisam ser lidos de novo."""
+        registro = self.carregar(chave)
+        if not registro:
+            return {}
+        limite = datetime.now() - self.validade
+        validos = {}
+        for campo in CAMPOS_ALM:
+            lido_em = registro["extraido_em"].get(campo)
+            valor = registro["dados"].get(campo)
+            if valor and lido_em and datetime.fromisoformat(lido_em) >= limite:
+                validos[campo] = valor
+        return validos
+
+    def registrar_etapa(self, chave, numero, **saidas):
+        """Checkpoint: a etapa `numero` terminou, com as saídas necessárias para retomar depois dela."""
+        registro = self.carregar(chave) or {}
+        etapas = dict(registro.get("etapas") or {})
+        etapas[str(numero)] = dict(saidas, concluida_em=datetime.now().isoformat(timespec="seconds"))
+        return self.atualizar(chave, etapas=etapas)
+
+    def ultima_pendente(self):
+        """Demanda não concluída atualizada mais recentemente, para retomar sem informar a chave."""
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT * FROM demandas WHERE estado IS NULL OR estado != ? ORDER BY atualizado_em DESC LIMIT 1", (CONCLUIDO,)
+            ).fetchone()
+        return self._para_registro(linha) if linha else None
+
+    def concluida(self, chave):
+        registro = self.carregar(chave)
+        return bool(registro and registro.get("estado") == CONCLUIDO)
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lista as demandas gravadas no banco local.")
+    parser.add_argument("--banco", default=ARQUIVO_BANCO)
+    parser.add_argument("--estado", default=None, choices=[EXTRAIDO, REGISTRADO, CONCLUIDO, PENDENTE])
+    args = parser.parse_args()
+
+    armazem = ArmazemDemandas(args.banco)
+    for registro in armazem.listar(args.estado):
+        print(f"{registro['chave']}\t{registro['estado'] or '-'}\t{registro['pf'] or '-'}\t{registro['link_pontua'] or '-'}\t{registro['erro'] or ''}")
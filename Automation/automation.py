@@ -1,19 +1,37 @@
-import pyautogui as pg
+import argparse
 import logging
 import time
 from datetime import datetime
 import os
-import sys
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.common.exceptions import TimeoutException
+from cache_driver import resolver_driver
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    JavascriptException,
+    NoSuchElementException,
+    TimeoutException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
+from prontidao import Prontidao
+from ng_select import OPCOES, selecionar_opcao
+from cliente_http import ErroApi, SessaoExpirada
+from alm_api import OPERACOES_RESULTADO, BackendAlm, ClienteAlm, GravacaoParcial
+from pontua_api import PROPOSITO, ROTEIRO, ClientePontua, payload_contagem, payload_demanda
+from instrumentacao import Instrumentacao, instrumentado
+from retentativas import FalhaAcao, Retentativas, retentavel
+from normalizacao import normalizar_registro
+from regras import REGRAS
+from localizadores import LOCATORS, MEMORIA, REGISTRO, condicao_localizador, host_da_url
+from interacao import OperacaoCancelada, criar_interacao
+from armazem import ARQUIVO_BANCO, CAMPOS_ALM, CONCLUIDO, PENDENTE, REGISTRADO, ArmazemDemandas, chave_do_item
+from decisoes import RevisaoPendente
+from daemon_navegador import liberar_navegador, obter_navegador
 
 # ==============================================================================
 # CONFIGURAÇÃO
@@ -21,6 +39,22 @@ from selenium.webdriver.support.ui import Select
 data_hoje = datetime.now().strftime('%d/%m/%Y')
 logging.basicConfig(level=logging.INFO, format=f'{data_hoje} - %(message)s')
 
+# Podem ser sobrescritas por variáveis de ambiente para apontar para o simulador local
+ALM_URL_BASE = os.environ.get(
+    "AUTOMACAO_ALM_URL_BASE",
+    "https://alm.serpro/ccm/web/projects/Gest%C3%A3o%20de%20Demandas%20Internas#action=com.ibm.team.workitem.viewWorkItem&id=",
+)
+PONTUA_URL = os.environ.get("AUTOMACAO_PONTUA_URL", "https://pontua.estaleiro.serpro.gov.br/pontua-web/#/dashboard")
+# Pasta onde cada execução grava seu relatório de tempos (vazio desativa)
+PASTA_RELATORIOS = os.environ.get("AUTOMACAO_RELATORIOS", "relatorios")
+# "ui" preenche os formulários do Pontua no navegador; "api" cria demanda e contagem por HTTP (pontua_api.py)
+PONTUA_BACKEND = os.environ.get("AUTOMACAO_PONTUA_BACKEND", "ui")
+# "ui" lê e grava o work item na página do ALM; "api" usa as APIs OSLC do Jazz (alm_api.py)
+ALM_BACKEND = os.environ.get("AUTOMACAO_ALM_BACKEND", "ui")
+# Como perguntas e confirmações são respondidas: "gui" (pyautogui), "cli" (terminal), "arquivo" ou "manifesto"
+interacao = criar_interacao(os.environ.get("AUTOMACAO_INTERACAO", "gui"), os.environ.get("AUTOMACAO_RESPOSTAS"))
+VIEWPORT_PADRAO = "1920,1080"
+
 # ==============================================================================
 # FUNÇÕES UTILITÁRIAS
 # ==============================================================================
@@ -29,7 +63,7 @@ def obter_link_do_usuario():
     titulo = "Automação ALM"
     texto = "Por favor, insira o link completo do ALM e clique em OK:"
     
-    link_inserido = pg.prompt(text=texto, title=titulo)
+    link_inserido = interacao.perguntar(texto, titulo, chave="link_alm")
 
     if link_inserido:
         logging.info(f"Link recebido: {link_inserido}")
@@ -41,366 +75,858 @@ def obter_link_do_usuario():
         return None
 
 
-def iniciar_navegador_com_perfil_usuario(url):
+def diretorio_perfil_edge():
+    return os.path.join(os.path.expanduser("~"), "AppData", "Local", "Microsoft", "Edge", "User Data")
+
+
+def iniciar_navegador_com_perfil_usuario(url, user_data_dir=None, headless=False, sem_gpu=False, viewport=VIEWPORT_PADRAO):
     if not url:
         return None
     try:
         logging.info("Configurando o driver para o Microsoft Edge com perfil de usuário...")
         edge_options = EdgeOptions()
-        user_data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "Microsoft", "Edge", "User Data")
+        user_data_dir = user_data_dir or diretorio_perfil_edge()
         edge_options.add_argument(f"user-data-dir={user_data_dir}")
-        service = EdgeService(EdgeChromiumDriverManager().install())
+        # Eventos de rede do CDP, usados pelo motor de prontidão
+        edge_options.set_capability("ms:loggingPrefs", {"performance": "ALL"})
+        if headless:
+            edge_options.add_argument("--headless=new")
+            # Sem janela não há o que maximizar: o tamanho fixo mantém o layout responsivo igual ao da tela cheia
+            edge_options.add_argument(f"--window-size={viewport}")
+        if sem_gpu:
+            # Servidores e containers sem placa de vídeo nem /dev/shm grande
+            edge_options.add_argument("--disable-gpu")
+            edge_options.add_argument("--disable-dev-shm-usage")
+        service = EdgeService(resolver_driver())
         driver = webdriver.Edge(service=service, options=edge_options)
         driver.get(url)
-        driver.maximize_window()
+        if not headless:
+            driver.maximize_window()
         logging.info("Navegador iniciado e site acessado com sucesso.")
         return driver
     except Exception as e:
         logging.error(f"Erro ao iniciar o navegador: {e}")
-        pg.alert(f"Ocorreu um erro ao iniciar o navegador: {e}", "Erro de Automação")
+        interacao.alertar(f"Ocorreu um erro ao iniciar o navegador: {e}", "Erro de Automação")
         return None
 
 
 # ==============================================================================
 # CLASSE DA PÁGINA ALM
 # ==============================================================================
+# Lê todos os campos pedidos em uma única avaliação de JavaScript. Recebe os seletores
+# agrupados [{por, valor, campos: [{nome, indice}]}], consulta o DOM uma vez por
+# seletor e devolve {nome: texto ou null}.
+SCRIPT_EXTRACAO_EM_LOTE = """
+const grupos = arguments[0];
+const resultado = {};
+for (const grupo of grupos) {
+    let elementos = [];
+    try {
+        if (grupo.por === "xpath") {
+            const nos = document.evaluate(grupo.valor, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < nos.snapshotLength; i++) elementos.push(nos.snapshotItem(i));
+        } else if (grupo.por === "id") {
+            const elemento = document.getElementById(grupo.valor);
+            if (elemento) elementos.push(elemento);
+        } else if (grupo.por === "class name") {
+            elementos = Array.from(document.getElementsByClassName(grupo.valor));
+        } else if (grupo.por === "js") {
+            const encontrado = (new Function(grupo.valor))();
+            elementos = encontrado ? (encontrado.length !== undefined ? Array.from(encontrado) : [encontrado]) : [];
+        } else {
+            elementos = Array.from(document.querySelectorAll(grupo.valor));
+        }
+    } catch (e) {
+        elementos = [];
+    }
+    for (const campo of grupo.campos) {
+        const elemento = elementos.length > campo.indice ? elementos[campo.indice] : elementos[0];
+        const texto = elemento ? (elemento.innerText || elemento.textContent || "").trim() : "";
+        resultado[campo.nome] = texto || null;
+    }
+}
+return resultado;
+"""
+
+
 class automation:
     def __init__(self, driver):
         self.driver = driver
-        self.locators = {
-            "resumo": (By.CSS_SELECTOR, ".RichTextEditorWidget.cke_editable.cke_contents_ltr"),
-            "numero_demanda": (By.CLASS_NAME, "TitleText"),
-            "solicitante": (By.XPATH, "//span[@class='ValueLabelHolder']"),
-            "data_criacao": (By.CLASS_NAME, "TimeLabel"),
-            "codigo_servico": (By.XPATH, "//div[@aria-label='Código de Serviço']"),
-            "responsavel": (By.XPATH, "//span[@class='ValueLabelHolder']"),
-            "tipo_demanda": (By.XPATH, "//span[@class='ValueLabelHolder']"),
-            "aba_atendimento": (By.XPATH, "//a[@title='Atendimento']"),
-            "aba_demanda": (By.XPATH, "//span[contains(@class, 'nav-label') and contains(text(), 'Demanda')]"),
-            "aba_incluirDemanda": (By.ID, "IncluirDemanda"),
-            "nome_demanda": (By.ID, "nome"),
-            "descricao_demanda":  (By.ID, "descricao"),
-            "nomeResponsavel": (By.ID, "nomeResponsavel"),
-            "numero_da_demanda": (By.ID, "numeroDemanda"),
-            "salvar": (By.ID, "confirmar"),
-            "criarContagem": (By.CSS_SELECTOR,"button.swal2-confirm.btn.btn-primary.btn-pills.ml-2"),
-            "descricao_contagem": (By.ID, "descricao"),
-            "proposito": (By.ID, "proposito"),
-            "escopo": (By.ID, "escopo"),
-            "titulo": (By.CLASS_NAME, "title-5 align-middle"),
-            "url": (By.CSS_SELECTOR, "input[dojoattachpoint='_urlField']"),
-            "rotulo" : (By.CSS_SELECTOR, "input[dojoattachpoint='_textField']"),
-            "tamanhoPF": (By.XPATH, "//input[@aria-label='Tamanho (PF)']"),
-            "aba_visaogeral": (By.XPATH, "//a[@title='Visão Geral']"),
-            "comentario": (), # <-- 
-
-        }
-
+        self.prontidao = Prontidao(driver)
+        self.instrumentacao = Instrumentacao(driver)
+        self.retentativas = Retentativas()
+        self.cliente_pontua = None  # ClientePontua reaproveitado entre demandas quando PONTUA_BACKEND == "api"
+        self.cliente_alm = None  # ClienteAlm reaproveitado entre demandas quando ALM_BACKEND == "api"
+        # Registro compilado em localizadores.py a partir de localizadores.json, compartilhado entre instâncias
+        self.locators = LOCATORS
+        self.registro = REGISTRO
+
+    def _localizador(self, nome):
+        localizador = self.registro.get(nome)
+        if not localizador:
+            logging.error(f"❌ Localizador '{nome}' não definido.")
+            raise ValueError(f"Localizador '{nome}' não definido.")
+        return localizador
+
+    def _aguardar_localizador(self, nome, timeout, clicavel=False):
+        """Espera o campo pelas estratégias do registro, começando pela que funcionou da última vez neste host."""
+        host = host_da_url(self.driver.current_url)
+        return WebDriverWait(self.driver, timeout).until(
+            condicao_localizador(self._localizador(nome), host, clicavel=clicavel),
+            f"'{nome}' não encontrado após {timeout} segundos",
+        )
+
+    # Cada ação levanta exceção quando falha; @retentavel repete conforme a classe da falha
+    # e, esgotadas as tentativas, levanta FalhaAcao para interromper a demanda.
+    @instrumentado
+    @retentavel
     def obter_textoElemento(self, nome_do_localizador, timeout=20):
-        try:
-            localizador = self.locators.get(nome_do_localizador)
-            if not localizador:
-                logging.error(f"❌ Localizador '{nome_do_localizador}' não definido.")
-                return None
-
-            logging.info(f"🔎 Aguardando campo '{nome_do_localizador}' (timeout={timeout}s)...")
-            wait = WebDriverWait(self.driver, timeout)
-            elementos = wait.until(EC.presence_of_all_elements_located(localizador))
-
-            # Lógica por nome
-            indices = {
-                "solicitante": 1,
-                "tipo_demanda": 3,
-                "responsavel": 2,
-            }
-            index = indices.get(nome_do_localizador, 0)
-
-            if len(elementos) > index:
-                texto_elemento = elementos[index].text.strip()
-            elif elementos:
-                texto_elemento = elementos[0].text.strip()
-            else:
-                logging.error(f"⚠️ Nenhum elemento encontrado para '{nome_do_localizador}'")
-                return None
-
-            logging.info(f"✅ Texto de '{nome_do_localizador}': {texto_elemento[:100]}...")
-            return texto_elemento
+        localizador = self._localizador(nome_do_localizador)
+        logging.info(f"🔎 Aguardando campo '{nome_do_localizador}' (timeout={timeout}s)...")
+        elementos = self._aguardar_localizador(nome_do_localizador, timeout)
+
+        index = localizador.indice
+        elemento = elementos[index] if len(elementos) > index else elementos[0]
+        texto_elemento = elemento.text.strip()
+        logging.info(f"✅ Texto de '{nome_do_localizador}': {texto_elemento[:100]}...")
+        return texto_elemento
+
+    @instrumentado
+    def obter_textos(self, nomes, timeout=20, timeout_individual=2):
+        """Lê vários campos com uma única chamada a execute_script por tentativa.
+
+        Os campos que não forem encontrados até o timeout são buscados individualmente
+        com obter_textoElemento. Retorna {nome: texto ou None}.
+        """
+        # Campos com o mesmo seletor (ex.: solicitante, responsável e tipo) compartilham uma só busca no DOM
+        host = host_da_url(self.driver.current_url)
+        grupos = {}
+        for nome in nomes:
+            localizador = self.registro.get(nome)
+            if localizador:
+                por, valor = MEMORIA.ordenar(host, localizador)[0]
+                grupo = grupos.setdefault((por, valor), {"por": por, "valor": valor, "campos": []})
+                grupo["campos"].append({"nome": nome, "indice": localizador.indice})
+        especificacao = list(grupos.values())
+
+        textos = {}
+
+        def extracao_completa(driver):
+            parcial = driver.execute_script(SCRIPT_EXTRACAO_EM_LOTE, especificacao) or {}
+            textos.update(parcial)
+            return bool(parcial) and all(parcial.values())
 
+        try:
+            logging.info(f"🔎 Extraindo {len(nomes)} campos com {len(especificacao)} seletores em lote (timeout={timeout}s)...")
+            WebDriverWait(self.driver, timeout).until(extracao_completa)
         except TimeoutException:
-            logging.error(f"⏰ Timeout: elemento '{nome_do_localizador}' não foi encontrado após {timeout} segundos.")
-            return None
+            logging.warning(f"⏰ Extração em lote incompleta após {timeout} segundos.")
         except Exception as e:
-            logging.error(f"💥 Erro inesperado ao buscar '{nome_do_localizador}': {e}")
-            return None
+            logging.error(f"💥 Erro na extração em lote: {e}")
+
+        resultado = {}
+        for nome in nomes:
+            texto = textos.get(nome)
+            if texto is None:
+                logging.warning(f"⚠️ Campo '{nome}' ausente na extração em lote; buscando individualmente.")
+                try:
+                    texto = self.obter_textoElemento(nome, timeout=timeout_individual)
+                except FalhaAcao as e:
+                    logging.error(f"❌ {e}")
+            else:
+                logging.info(f"✅ Texto de '{nome}': {texto[:100]}...")
+            resultado[nome] = texto
+        return resultado
+
+    @instrumentado
+    @retentavel
     def clicar_botao(self, nome_do_botao, timeout=20):
+        logging.info(f"Aguardando botão '{nome_do_botao}' ficar clicável (timeout={timeout}s)...")
+
+        # Espera o botão estar visível e clicável diretamente
+        elemento = self._aguardar_localizador(nome_do_botao, timeout, clicavel=True)[0]
+
+        # Rola até o botão (opcional, mas ajuda)
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento)
+        self.prontidao.elemento_desobstruido(elemento, timeout=timeout)
+
         try:
-            localizador = self.locators.get(nome_do_botao)
-            if not localizador:
-                logging.error(f"Localizador '{nome_do_botao}' não definido.")
-                return None
-    
-            logging.info(f"Aguardando botão '{nome_do_botao}' ficar clicável (timeout={timeout}s)...")
-            wait = WebDriverWait(self.driver, timeout)
-    
-            # Espera o botão estar visível e clicável diretamente
-            elemento = wait.until(EC.element_to_be_clickable(localizador))
-    
-            # Rola até o botão (opcional, mas ajuda)
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elemento)
-            time.sleep(0.5)
-    
-            try:
-                elemento.click()
-                logging.info(f"✅ Clique realizado no botão '{nome_do_botao}' com .click().")
-            except Exception as e_click:
-                logging.warning(f"⚠️ Falha no .click(): {e_click}. Tentando via JavaScript.")
-                self.driver.execute_script("arguments[0].click();", elemento)
-                logging.info(f"✅ Clique forçado com JavaScript no botão '{nome_do_botao}'.")
-    
-            return True
-    
-        except TimeoutException:
-            logging.error(f"❌ Botão '{nome_do_botao}' não clicável após {timeout} segundos.")
-            return None
-        except Exception as e:
-            logging.error(f"❌ Erro inesperado ao clicar no botão '{nome_do_botao}': {e}")
-            return None
-    
+            elemento.click()
+            logging.info(f"✅ Clique realizado no botão '{nome_do_botao}' com .click().")
+        except ElementClickInterceptedException as e_click:
+            logging.warning(f"⚠️ Falha no .click(): {e_click.msg}. Tentando via JavaScript.")
+            self.instrumentacao.registrar_retentativa()
+            self.driver.execute_script("arguments[0].click();", elemento)
+            logging.info(f"✅ Clique forçado com JavaScript no botão '{nome_do_botao}'.")
+
+        return True
+
+    @instrumentado
+    @retentavel
     def preencher_campo(self, nome_do_campo, texto, timeout=20):
-        try:
-            localizador = self.locators.get(nome_do_campo)
-            if not localizador:
-                logging.error(f"Localizador '{nome_do_campo}' não definido.")
-                return None
-
-            logging.info(f"Aguardando campo '{nome_do_campo}' (timeout={timeout}s)...")
-            wait = WebDriverWait(self.driver, timeout)
-            campo = wait.until(EC.element_to_be_clickable(localizador))
-            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", campo)
-
-            campo.clear()
-            campo.send_keys(texto)
-            logging.info(f"✅ Preenchido '{nome_do_campo}' com: {texto}")
-            return True
+        logging.info(f"Aguardando campo '{nome_do_campo}' (timeout={timeout}s)...")
+        campo = self._aguardar_localizador(nome_do_campo, timeout, clicavel=True)[0]
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", campo)
 
-        except TimeoutException:
-            logging.error(f"❌ Campo '{nome_do_campo}' não encontrado após {timeout} segundos.")
-            return None
-        except Exception as e:
-            logging.error(f"❌ Erro ao preencher o campo '{nome_do_campo}': {e}")
-            return None
+        campo.clear()
+        campo.send_keys(texto)
+        logging.info(f"✅ Preenchido '{nome_do_campo}' com: {texto}")
+        return True
+
+    @instrumentado
+    @retentavel
     def selecionar_Dropdown(self, placeholder_texto, texto_opcao, timeout=10):
+        # Caminho rápido: abre, clica a opção exata e confere o valor em um único comando (ng_select.py)
         try:
-            wait = WebDriverWait(self.driver, timeout)
-
-            # Clica no dropdown pelo placeholder
-            ng_select = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, f"ng-select[placeholder='{placeholder_texto}']"))
-            )
-            ng_select.click()
-
-            # Localiza o input de pesquisa dentro do dropdown aberto
-            input_pesquisa = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, f"ng-select[placeholder='{placeholder_texto}'] input[type='text']"))
-            )
-            input_pesquisa.clear()
-            input_pesquisa.send_keys(texto_opcao)
-            time.sleep(1)  # espera as opções aparecerem
-
-            # Pressiona ENTER para confirmar a seleção
-            input_pesquisa.send_keys(Keys.ENTER)
-
-            logging.info(f"✅ Opção '{texto_opcao}' selecionada no dropdown '{placeholder_texto}' com ENTER.")
+            rotulo = selecionar_opcao(self.driver, placeholder_texto, texto_opcao, timeout)
+        except JavascriptException as e:
+            logging.warning(f"⚠️ Seleção direta falhou em '{placeholder_texto}': {e.msg}")
+            rotulo = None
+        if rotulo is not None:
+            logging.info(f"✅ Opção '{rotulo}' selecionada no dropdown '{placeholder_texto}'.")
             return True
-
-        except Exception as e:
-            logging.error(f"❌ Erro ao selecionar '{texto_opcao}' no dropdown '{placeholder_texto}': {e}")
-            return False
+        return self.selecionar_Dropdown_digitando(placeholder_texto, texto_opcao, timeout)
+
+    def selecionar_Dropdown_digitando(self, placeholder_texto, texto_opcao, timeout=10):
+        """Caminho antigo: digita o texto na busca do ng-select, espera as opções e confirma com ENTER."""
+        wait = WebDriverWait(self.driver, timeout)
+
+        # Clica no dropdown pelo placeholder
+        ng_select = wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, f"ng-select[placeholder='{placeholder_texto}']"))
+        )
+        ng_select.click()
+
+        # Localiza o input de pesquisa dentro do dropdown aberto
+        input_pesquisa = wait.until(
+            EC.element_to_be_clickable((By.CSS_SELECTOR, f"ng-select[placeholder='{placeholder_texto}'] input[type='text']"))
+        )
+        input_pesquisa.clear()
+        input_pesquisa.send_keys(texto_opcao)
+        self.prontidao.opcao_ng_select(texto_opcao, timeout=timeout)  # espera as opções aparecerem
+
+        # Pressiona ENTER para confirmar a seleção
+        input_pesquisa.send_keys(Keys.ENTER)
+
+        logging.info(f"✅ Opção '{texto_opcao}' selecionada no dropdown '{placeholder_texto}' com ENTER.")
+        return True
+
+    @instrumentado
+    @retentavel
     def preencher_dataIndice(self, index, data, timeout=10):
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            campos = wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "input[placeholder='__/__/____']"))
-            )
-            if index >= len(campos):
-                logging.error(f"❌ Índice {index} inválido. Só existem {len(campos)} campos.")
-                return False    
-
-            campos[index].clear()
-            campos[index].send_keys(data)
-            campos[index].send_keys(Keys.TAB)
-            logging.info(f"📅 Data '{data}' preenchida no campo de índice {index}")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Erro ao preencher campo de data no índice {index}: {e}")
-            return False
+        wait = WebDriverWait(self.driver, timeout)
+        campos = wait.until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "input[placeholder='__/__/____']"))
+        )
+        if index >= len(campos):
+            logging.error(f"❌ Índice {index} inválido. Só existem {len(campos)} campos.")
+            raise NoSuchElementException(f"Campo de data de índice {index} não existe ({len(campos)} campos).")
+
+        campos[index].clear()
+        campos[index].send_keys(data)
+        campos[index].send_keys(Keys.TAB)
+        logging.info(f"📅 Data '{data}' preenchida no campo de índice {index}")
+        return True
+
+    @instrumentado
+    @retentavel
     def selecionar_dropdown_padrão(self, id_do_select, texto_ou_valor, por_valor=True, timeout=10):
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            select_element = wait.until(EC.presence_of_element_located((By.ID, id_do_select)))
-            select = Select(select_element) 
+        wait = WebDriverWait(self.driver, timeout)
+        select_element = wait.until(EC.presence_of_element_located((By.ID, id_do_select)))
+        select = Select(select_element)
 
-            if por_valor:
-                select.select_by_value(texto_ou_valor)
-                logging.info(f"✅ Selecionado valor '{texto_ou_valor}' no select '{id_do_select}'")
-            else:
-                select.select_by_visible_text(texto_ou_valor)
-                logging.info(f"✅ Selecionado texto '{texto_ou_valor}' no select '{id_do_select}'")
-            return True
-        except Exception as e:
-            logging.error(f"❌ Erro ao selecionar no dropdown '{id_do_select}': {e}")
-            return False
+        if por_valor:
+            select.select_by_value(texto_ou_valor)
+            logging.info(f"✅ Selecionado valor '{texto_ou_valor}' no select '{id_do_select}'")
+        else:
+            select.select_by_visible_text(texto_ou_valor)
+            logging.info(f"✅ Selecionado texto '{texto_ou_valor}' no select '{id_do_select}'")
+        return True
+
+    @instrumentado
+    @retentavel
     def preencher_campo_comentario(self, texto, timeout=20):
-        try:
-            wait = WebDriverWait(self.driver, timeout)
-            campos = wait.until(EC.presence_of_all_elements_located(
-                (By.XPATH, "//div[contains(@class, 'RichTextEditorWidget') and contains(@aria-label, 'Coment')]")))
-            for campo in campos:
-                if "Coment" in campo.get_attribute("aria-label"):
-                    campo.click()
-                    time.sleep(0.5)
-                    campo.send_keys(texto)
-                    logging.info("✅ Comentário preenchido com sucesso!")
-                    return True
-            logging.warning("⚠️ Campo de comentário não encontrado.")
-            return False
-        except Exception as e:
-            logging.error(f"❌ Erro ao preencher o campo de comentário: {e}")
-            return False
+        campos = self._aguardar_localizador("comentario", timeout)
+        for campo in campos:
+            if "Coment" in (campo.get_attribute("aria-label") or ""):
+                campo.click()
+                self.prontidao.elemento_focado(campo, timeout=timeout)
+                campo.send_keys(texto)
+                logging.info("✅ Comentário preenchido com sucesso!")
+                return True
+        logging.warning("⚠️ Campo de comentário não encontrado.")
+        raise NoSuchElementException("Campo de comentário não encontrado.")
 
 
-# Função de execução
-def executar_automacao(link_alm):
-    navegador = iniciar_navegador_com_perfil_usuario(link_alm)
-    if not navegador:
-        return
+# ==============================================================================
+# ETAPAS DA AUTOMAÇÃO
+# ==============================================================================
+def abrir_aba_pontua(navegador, aba_pontua=None):
+    """Abre o Pontua em nova aba ou reaproveita a aba já aberta em execuções anteriores."""
+    if aba_pontua is None and len(navegador.window_handles) > 1:
+        # O Edge do daemon já mantém uma aba do Pontua aberta e autenticada
+        for aba in navegador.window_handles[1:]:
+            navegador.switch_to.window(aba)
+            if navegador.current_url.startswith(PONTUA_URL.split("#", 1)[0]):
+                aba_pontua = aba
+                break
+    if aba_pontua and aba_pontua in navegador.window_handles:
+        navegador.switch_to.window(aba_pontua)
+        navegador.get(PONTUA_URL)
+        return aba_pontua
+    navegador.execute_script(f"window.open('{PONTUA_URL}','_blank');")
+    navegador.switch_to.window(navegador.window_handles[-1])
+    return navegador.current_window_handle
+
+
+class AlmNavegador(BackendAlm):
+    """Lê e grava o work item pela página do ALM aberta na aba atual (caminho Selenium)."""
+
+    def __init__(self, automacao):
+        self.automacao = automacao
+
+    def ler_campos(self, id_item, campos):
+        automacao = self.automacao
+        instr = automacao.instrumentacao
+        textos = {}
+
+        with instr.etapa(1, "Aguardando o carregamento da página inicial..."):
+            if campos:
+                automacao.prontidao.pagina_alm_pronta()
+
+        with instr.etapa(2, "Extraindo informações do ALM..."):
+            campos_visao_geral = [campo for campo in campos if campo != "responsavel"]
+            if campos_visao_geral:
+                textos.update(automacao.obter_textos(campos_visao_geral))
+            else:
+                logging.info("🗃️ Campos da visão geral reaproveitados do banco local.")
 
-    try:
-        automacao = automation(navegador)
+        with instr.etapa(3, "Clicando na aba de atendimento..."):
+            if "responsavel" in campos:
+                automacao.clicar_botao("aba_atendimento")
+                textos["responsavel"] = automacao.obter_textoElemento("responsavel")
+        return textos
 
-        print("✅ [1/12] Aguardando o carregamento da página inicial...")
-        time.sleep(8)
+    def comentar(self, id_item, comentario):
+        self.automacao.clicar_botao("aba_visaogeral")
+        # O comentário digitado no editor é gravado junto com o work item; não há botão próprio
+        self.automacao.preencher_campo_comentario(comentario)
+        self.automacao.prontidao.dom_estavel()
 
-        print("✅ [2/12] Extraindo informações do ALM...")
-        resumo = automacao.obter_textoElemento("resumo")
-        numero_demanda = automacao.obter_textoElemento("numero_demanda")
-        numeroDemanda = numero_demanda[15:].strip()
-        solicitante = automacao.obter_textoElemento("solicitante")
-        data_criacao = automacao.obter_textoElemento("data_criacao")
+    def adicionar_link(self, id_item, link, rotulo):
+        interacao.atalho(self.automacao.driver, "ctrl", "l")
+        self.automacao.preencher_campo("url", link)
+        self.automacao.preencher_campo("rotulo", rotulo)
 
-        meses = {
-            'jan': '01', 'fev': '02', 'mar': '03', 'abr': '04', 'mai': '05',
-            'jun': '06', 'jul': '07', 'ago': '08', 'set': '09', 'out': '10',
-            'nov': '11', 'dez': '12'
-        }
-        partes = data_criacao.split()
-        dia = partes[0]
-        mes = meses.get(partes[2], partes[2])
-        ano = partes[4]
-        data_formatada = f"{dia}/{mes}/{ano}"
+    def atualizar_pf(self, id_item, pf):
+        self.automacao.clicar_botao("aba_atendimento")
+        self.automacao.preencher_campo("tamanhoPF", pf)
+
+
+def cliente_alm(navegador, automacao):
+    """ClienteAlm com os cookies da aba do ALM, criado na primeira vez e reaproveitado depois."""
+    if automacao.cliente_alm is None:
+        automacao.cliente_alm = ClienteAlm.do_navegador(navegador)
+    return automacao.cliente_alm
+
+
+def _falha_api_alm(automacao, erro):
+    if isinstance(erro, SessaoExpirada):
+        automacao.cliente_alm = None  # a página renova o login; a próxima demanda pega os novos cookies
+    logging.warning(f"⚠️ API do ALM indisponível ({erro}); seguindo pela página.")
+
+
+def extrair_dados_alm(navegador, automacao, conhecidos=None, id_item=None):
+    """Lê os campos da demanda no ALM. Campos em `conhecidos` (ainda válidos no banco local) não são lidos de novo."""
+    textos = dict(conhecidos or {})
+    faltantes = [campo for campo in CAMPOS_ALM if not textos.get(campo)]
+    id_item = id_item or chave_do_item(navegador.current_url)
+
+    if faltantes and ALM_BACKEND == "api" and id_item.isdigit():
+        with automacao.instrumentacao.etapa(1, "Lendo o work item pela API do ALM..."):
+            try:
+                textos.update(cliente_alm(navegador, automacao).ler_campos(id_item, faltantes))
+            except (ErroApi, OSError) as e:
+                _falha_api_alm(automacao, e)
+        faltantes = [campo for campo in faltantes if not textos.get(campo)]
+        if not faltantes:
+            return normalizar_registro(textos)
 
-        codigo_servico = automacao.obter_textoElemento("codigo_servico")
-        tipo_demanda = automacao.obter_textoElemento("tipo_demanda")
+    textos.update(AlmNavegador(automacao).ler_campos(id_item, faltantes))
+    return normalizar_registro(textos)
 
-        print("✅ [3/12] Clicando na aba de atendimento...")
-        automacao.clicar_botao("aba_atendimento")
 
-        responsavel = automacao.obter_textoElemento("responsavel")
+def confirmar_continuacao(automacao, chave="confirmar_contagem", confirmadas=None):
+    """Pede a confirmação `chave`; as já registradas em `confirmadas` (mesma demanda) não são pedidas de novo."""
+    if confirmadas is not None and chave in confirmadas:
+        logging.info(f"✔️ '{chave}' já confirmado para esta demanda.")
+        return
+    with automacao.instrumentacao.acao("interacao:confirm"):
+        resposta = interacao.confirmar("Deseja continuar com a automação?", "Confirmação", ["OK", "Cancelar"], chave=chave)
+    if resposta != 'OK':
+        print("🚫 Operação cancelada pelo usuário.")
+        raise OperacaoCancelada("operação cancelada pelo usuário")
+    if confirmadas is not None:
+        confirmadas.add(chave)
+
+
+# Perguntas feitas quando regras.json não cobre o valor do ALM
+PERGUNTAS_SEM_REGRA = {
+    "tipo_demanda": "Digite o tipo de demanda e aperte OK:",
+    "fronteira": "Digite a Fronteira/Aplicação e aperte OK:",
+    "processo": "Digite o processo e aperte OK:",
+    "plataforma": "Digite a plataforma e aperte OK:",
+    "linguagem": "Digite a linguagem e aperte OK:",
+    "banco_de_dados": "Digite o banco de dados e aperte OK:",
+}
+
+
+def opcao_pontua(instr, tabela, valor_alm):
+    """Opção do Pontua pela tabela de regras; sem regra, pergunta ao usuário (ou ao manifesto)."""
+    opcao = REGRAS.resolver(tabela, valor_alm)
+    if opcao is None:
+        with instr.acao("interacao:prompt"):
+            opcao = interacao.perguntar(PERGUNTAS_SEM_REGRA[tabela], "Automação", chave=tabela)
+        if not opcao:
+            raise OperacaoCancelada(f"sem resposta para {tabela}")
+    return opcao
+
+
+# Dropdown do formulário de demanda preenchido por cada tabela de regras, e o campo do ALM usado na regra
+DROPDOWNS_DEMANDA = {
+    "fronteira": ("selecionar Fronteira/Aplicação", "codigo_aplicacao"),
+    "processo": ("selecionar processo", "tipo_demanda"),
+    "tipo_demanda": ("selecionar tipo de demanda", "tipo_demanda"),
+    "plataforma": ("selecionar plataforma", "codigo_aplicacao"),
+    "linguagem": ("selecionar linguagem", "codigo_aplicacao"),
+    "banco_de_dados": ("selecionar banco de dados", "codigo_aplicacao"),
+}
+
+
+def registrar_no_pontua_api(navegador, automacao, dados, aba_pontua=None, checkpoint=None, confirmadas=None):
+    """Etapas 4 a 9 pela API do Pontua, autenticada com os cookies da aba do Pontua.
+
+    Falhas em que a demanda certamente não foi criada levantam ErroApi (quem chama segue
+    pela interface). Se a criação pode ter sido gravada (resposta perdida, 5xx) ou a demanda
+    já existe, DemandaIncompleta, para não criá-la de novo.
+    """
+    instr = automacao.instrumentacao
+    checkpoint = checkpoint or (lambda etapa, **saidas: None)
+    aba_pontua = sessao_pontua(navegador, automacao, aba_pontua)
+
+    with instr.etapa(5, "Montando a demanda para a API do Pontua..."):
+        # Com as opções dos ng-select já em cache, envia o texto exato da opção, como a tela faria
+        opcoes = {}
+        for tabela, (placeholder, campo) in DROPDOWNS_DEMANDA.items():
+            valor = opcao_pontua(instr, tabela, dados[campo])
+            opcoes[tabela] = OPCOES.resolver(placeholder, valor) or valor
+        demanda = payload_demanda(dados, opcoes, datetime.now().strftime("%d/%m/%Y"))
+
+    with instr.etapa(6, "Confirmando antes de criar contagem..."):
+        confirmar_continuacao(automacao, confirmadas=confirmadas)
+
+    cliente = automacao.cliente_pontua
+    with instr.etapa(7, "Criando demanda pela API..."):
+        try:
+            with instr.acao("api:criar_demanda"):
+                id_demanda = cliente.criar_demanda(demanda)
+        except ErroApi as e:
+            if not e.resultado_incerto:
+                raise
+            # Sem o ID não há como continuar a contagem; a retomada pede a conferência no Pontua
+            checkpoint(7, url_demanda=None, erro=str(e))
+            raise DemandaIncompleta(
+                f"A criação da demanda no Pontua não foi confirmada ({e}) e ela pode ter sido gravada. "
+                "Confira no Pontua antes de retomar; se ela existir, conclua a contagem e informe --link-pontua."
+            ) from e
+        checkpoint(7, url_demanda=cliente.link_demanda(id_demanda), id_demanda=id_demanda)
+
+    return criar_contagem_api(automacao, dados, id_demanda, checkpoint), aba_pontua
+
+
+def sessao_pontua(navegador, automacao, aba_pontua=None):
+    """Etapa 4 pela API: ClientePontua com os cookies da aba do Pontua, criado uma vez por sessão."""
+    with automacao.instrumentacao.etapa(4, "Obtendo a sessão do Pontua..."):
+        if automacao.cliente_pontua is None:
+            aba_pontua = abrir_aba_pontua(navegador, aba_pontua)
+            automacao.prontidao.pagina_ociosa()
+            automacao.cliente_pontua = ClientePontua.do_navegador(navegador)
+    return aba_pontua
+
+
+def criar_contagem_api(automacao, dados, id_demanda, checkpoint):
+    """Etapas 8 e 9 pela API, para uma demanda já criada. Retorna o link da contagem."""
+    instr = automacao.instrumentacao
+    cliente = automacao.cliente_pontua
+    with instr.etapa(8, "Confirmando antes de finalizar a contagem..."):
+        confirmar_continuacao(automacao, chave="confirmar_finalizacao")
+
+    with instr.etapa(9, "Salvando contagem pela API..."):
+        contagem = payload_contagem(dados, OPCOES.resolver("selecionar Roteiro", ROTEIRO) or ROTEIRO)
+        try:
+            with instr.acao("api:criar_contagem"):
+                link_pontua = cliente.criar_contagem(id_demanda, contagem)
+        except ErroApi as e:
+            raise DemandaIncompleta(
+                f"Demanda {id_demanda} criada no Pontua, mas a contagem falhou ({e}). "
+                f"Retome com --retomar para criar só a contagem, ou conclua em {cliente.link_demanda(id_demanda)} "
+                "e retome com --link-pontua."
+            ) from e
+    checkpoint(9, link_pontua=link_pontua)
+    return link_pontua
+
+
+def registrar_no_pontua(navegador, automacao, dados, aba_pontua=None, checkpoint=None):
+    """Etapas 4 a 9. `checkpoint(etapa, **saidas)` é chamado assim que a demanda e a contagem são salvas."""
+    # A resposta dada antes de a API falhar vale para a interface: o usuário não é perguntado duas vezes
+    confirmadas = set()
+    if PONTUA_BACKEND == "api":
+        try:
+            return registrar_no_pontua_api(navegador, automacao, dados, aba_pontua, checkpoint, confirmadas)
+        except (ErroApi, OSError) as e:
+            if isinstance(e, SessaoExpirada):
+                automacao.cliente_pontua = None  # a interface renova o login; a próxima demanda pega os novos cookies
+            logging.warning(f"⚠️ API do Pontua indisponível ({e}); registrando pela interface.")
 
-        print("✅ [4/12] Acessando o Pontua em nova aba...")
-        navegador.execute_script("window.open('https://pontua.estaleiro.serpro.gov.br/pontua-web/#/dashboard','_blank');")
-        navegador.switch_to.window(navegador.window_handles[-1])
+    instr = automacao.instrumentacao
+    checkpoint = checkpoint or (lambda etapa, **saidas: None)
 
-        print("✅ [5/12] Inserindo nova demanda no Pontua...")
+    with instr.etapa(4, "Acessando o Pontua em nova aba..."):
+        aba_pontua = abrir_aba_pontua(navegador, aba_pontua)
+
+    resumo = dados["resumo"]
+    numero_demanda = dados["numero_demanda"]
+    numeroDemanda = dados["numeroDemanda"]
+    codigo_aplicacao = dados["codigo_aplicacao"]
+    tipo_demanda = dados["tipo_demanda"]
+
+    with instr.etapa(5, "Inserindo nova demanda no Pontua..."):
         automacao.clicar_botao("aba_demanda")
         automacao.clicar_botao("aba_incluirDemanda")
         automacao.preencher_campo("nome_demanda", f"{numeroDemanda}: {resumo}")
-        automacao.selecionar_Dropdown("selecionar Fronteira/Aplicação", f"{codigo_servico[-5:]}")
+        automacao.selecionar_Dropdown("selecionar Fronteira/Aplicação", opcao_pontua(instr, "fronteira", codigo_aplicacao))
         automacao.preencher_campo("descricao_demanda", f"Solicitação: {resumo}")
-        automacao.selecionar_Dropdown("selecionar processo", "Ágil")
+        automacao.selecionar_Dropdown("selecionar processo", opcao_pontua(instr, "processo", tipo_demanda))
+        automacao.selecionar_Dropdown("selecionar tipo de demanda", opcao_pontua(instr, "tipo_demanda", tipo_demanda))
 
-        if tipo_demanda == "Apuração":
-            automacao.selecionar_Dropdown("selecionar tipo de demanda", "Apuração Especial (AESP)")
-        elif tipo_demanda == "Melhoria":
-            automacao.selecionar_Dropdown("selecionar tipo de demanda", "Manutenção Corretiva")
-        else:
-            automacao.selecionar_Dropdown("selecionar tipo de demanda", f"{pg.prompt('Digite o tipo de demanda e aperte OK:', 'Automação')}")
-
-        automacao.preencher_dataIndice(0, data_formatada)
+        automacao.preencher_dataIndice(0, dados["data_formatada"])
         data_atual = datetime.now().strftime("%d/%m/%Y")
         automacao.preencher_dataIndice(1, data_atual)
-        automacao.preencher_campo("nomeResponsavel", responsavel)
+        automacao.preencher_campo("nomeResponsavel", dados["responsavel"])
         automacao.preencher_campo("numero_da_demanda", numeroDemanda)
-        automacao.selecionar_Dropdown("selecionar plataforma", "Web")
-
-        if codigo_servico[-5:] == "80728":
-            automacao.selecionar_Dropdown("selecionar linguagem", "JAVA")
-        else:
-            automacao.selecionar_Dropdown("selecionar linguagem", "Low-Code")
+        automacao.selecionar_Dropdown("selecionar plataforma", opcao_pontua(instr, "plataforma", codigo_aplicacao))
+        automacao.selecionar_Dropdown("selecionar linguagem", opcao_pontua(instr, "linguagem", codigo_aplicacao))
+        automacao.selecionar_Dropdown("selecionar banco de dados", opcao_pontua(instr, "banco_de_dados", codigo_aplicacao))
 
-        automacao.selecionar_Dropdown("selecionar banco de dados", "MySql")
+    with instr.etapa(6, "Confirmando antes de criar contagem..."):
+        confirmar_continuacao(automacao, confirmadas=confirmadas)
 
-        print("✅ [6/12] Confirmando antes de criar contagem...")
-        resposta = pg.confirm("Deseja continuar com a automação?", "Confirmação", ["OK", "Cancelar"])
-        if resposta != 'OK':
-            print("🚫 Operação cancelada pelo usuário.")
-            sys.exit()
-
-        print("✅ [7/12] Criando contagem...")
-        time.sleep(5)
+    with instr.etapa(7, "Criando contagem..."):
+        automacao.prontidao.pagina_ociosa()
         automacao.clicar_botao("salvar")
+        automacao.prontidao.swal_visivel()
+        # A partir daqui a demanda existe no Pontua: repetir a etapa 5 criaria uma duplicata
+        checkpoint(7, url_demanda=navegador.current_url)
         automacao.clicar_botao("criarContagem")
-        time.sleep(2)
-        automacao.preencher_campo("descricao_contagem", f"Contagem da {numero_demanda}")
-        automacao.selecionar_dropdown_padrão("tipoContagem", "1: MANUTENCAO", por_valor=True)
-        automacao.selecionar_dropdown_padrão("metodoContagem", "5: CONTAGEM_SFP", por_valor=True)
-        automacao.selecionar_Dropdown("selecionar Roteiro", "SERPRO V3")
-        automacao.preencher_campo("proposito", "Fornecer o tamanho funcional de uma demanda de manutenção da aplicação.")
-        automacao.preencher_campo("escopo", "Fornecer o tamanho funcional de uma demanda de manutenção da aplicação.")
-
-        print("✅ [8/12] Confirmando antes de finalizar a contagem...")
-        resposta = pg.confirm("Deseja continuar com a automação?", "Confirmação", ["OK", "Cancelar"])
-        if resposta != 'OK':
-            print("🚫 Operação cancelada pelo usuário.")
-            sys.exit()
-
-        print("✅ [9/12] Salvando contagem...")
-        automacao.clicar_botao("salvar")
+        preencher_contagem(automacao, numero_demanda)
+
+    return salvar_contagem(navegador, automacao, checkpoint), aba_pontua
 
+
+def preencher_contagem(automacao, numero_demanda):
+    """Formulário da contagem, aberto pelo alerta após salvar a demanda ou pela página da demanda."""
+    automacao.prontidao.aguardar("formulario_contagem", EC.presence_of_element_located((By.ID, "tipoContagem")))
+    automacao.prontidao.pagina_ociosa()
+    automacao.preencher_campo("descricao_contagem", f"Contagem da {numero_demanda}")
+    automacao.selecionar_dropdown_padrão("tipoContagem", "1: MANUTENCAO", por_valor=True)
+    automacao.selecionar_dropdown_padrão("metodoContagem", "5: CONTAGEM_SFP", por_valor=True)
+    automacao.selecionar_Dropdown("selecionar Roteiro", ROTEIRO)
+    automacao.preencher_campo("proposito", PROPOSITO)
+    automacao.preencher_campo("escopo", PROPOSITO)
+
+
+def salvar_contagem(navegador, automacao, checkpoint):
+    """Etapas 8 e 9 pela interface. Retorna o link da contagem salva."""
+    instr = automacao.instrumentacao
+    with instr.etapa(8, "Confirmando antes de finalizar a contagem..."):
+        confirmar_continuacao(automacao, chave="confirmar_finalizacao")
+
+    with instr.etapa(9, "Salvando contagem..."):
+        automacao.clicar_botao("salvar")
         link_pontua = navegador.current_url
+    checkpoint(9, link_pontua=link_pontua)
+    return link_pontua
+
+
+def continuar_contagem(navegador, automacao, dados, etapa_demanda, aba_pontua=None, checkpoint=None):
+    """Etapas 7 a 9 de uma demanda salva no Pontua em uma execução anterior: cria só a contagem.
+
+    `etapa_demanda` é o checkpoint da etapa 7 (link da demanda e, pela API, o seu ID).
+    """
+    checkpoint = checkpoint or (lambda etapa, **saidas: None)
+    url_demanda = etapa_demanda.get("url_demanda")
+    if not url_demanda:
+        raise DemandaIncompleta(
+            f"Não se sabe se a demanda foi criada no Pontua ({etapa_demanda.get('erro')}). "
+            "Confira no Pontua e retome informando --link-pontua."
+        )
+    logging.info(f"🔁 Demanda já salva no Pontua ({url_demanda}); criando só a contagem.")
+
+    if PONTUA_BACKEND == "api" and etapa_demanda.get("id_demanda") is not None:
+        aba_pontua = sessao_pontua(navegador, automacao, aba_pontua)
+        return criar_contagem_api(automacao, dados, etapa_demanda["id_demanda"], checkpoint), aba_pontua
+
+    with automacao.instrumentacao.etapa(7, "Abrindo a demanda já salva no Pontua..."):
+        aba_pontua = abrir_aba_pontua(navegador, aba_pontua)
+        navegador.get(url_demanda)
+        automacao.prontidao.pagina_ociosa()
+        automacao.clicar_botao("novaContagem")
+        preencher_contagem(automacao, dados["numero_demanda"])
+    return salvar_contagem(navegador, automacao, checkpoint), aba_pontua
+
+
+def registrar_ou_continuar(navegador, automacao, dados, etapas, aba_pontua=None, checkpoint=None):
+    """Etapas 4 a 9 a partir do que já foi gravado: com a demanda salva (etapa 7), só a contagem."""
+    if "7" in etapas:
+        return continuar_contagem(navegador, automacao, dados, etapas["7"], aba_pontua, checkpoint)
+    return registrar_no_pontua(navegador, automacao, dados, aba_pontua, checkpoint)
+
+
+def atualizar_alm(navegador, automacao, dados, link_pontua, aba_alm=None, pf=None, checkpoint=None, id_item=None, feitas=()):
+    """Etapas 10 e 11. Um `pf` já informado em uma execução anterior não é perguntado de novo.
+
+    `feitas` são as operações da etapa 11 já gravadas antes (checkpoint da etapa 11): ao
+    retomar, o comentário e o link não são enviados de novo.
+    """
+    instr = automacao.instrumentacao
+    checkpoint = checkpoint or (lambda etapa, **saidas: None)
+
+    with instr.etapa(10, "Retornando ao ALM..."):
+        navegador.switch_to.window(aba_alm or navegador.window_handles[0])
+        if pf is None:
+            with instr.acao("interacao:prompt"):
+                pf = interacao.perguntar("Quantidade de PF: ", "Pontos de função", chave="pf")
+            if not pf:
+                raise OperacaoCancelada("quantidade de PF não informada")
+    checkpoint(10, pf=pf)
+
+    with instr.etapa(11, "Preenchendo informações finais no ALM..."):
+        mensagem = f"Contagem da {dados['numero_demanda']} em método SFP = {pf} PF.\n"
+        mensagem += f"Estimativa realizada em {dados['data_formatada']} pelo estgiário Augusto Saboia\n"
+        id_item = id_item or chave_do_item(navegador.current_url)
+        feitas = [operacao for operacao in OPERACOES_RESULTADO if operacao in feitas]
+        pendentes = [operacao for operacao in OPERACOES_RESULTADO if operacao not in feitas]
+        if feitas:
+            logging.info(f"🗃️ Já gravados no ALM em uma execução anterior: {', '.join(feitas)}.")
+        if pendentes and ALM_BACKEND == "api" and id_item.isdigit():
+            try:
+                with instr.acao("api:registrar_resultado"):
+                    cliente_alm(navegador, automacao).registrar_resultado(
+                        id_item, mensagem, link_pontua, "Link do Pontua", pf, pendentes
+                    )
+                feitas, pendentes = feitas + pendentes, []
+            except GravacaoParcial as e:
+                # Só o que não foi gravado segue pela página, para não duplicar comentário ou link
+                feitas += [operacao for operacao in pendentes if operacao not in e.pendentes]
+                pendentes = e.pendentes
+                logging.warning(f"⚠️ {e}; concluindo {', '.join(pendentes)} pela página.")
+            except (ErroApi, OSError) as e:
+                _falha_api_alm(automacao, e)
+            checkpoint(11, operacoes=feitas)
+        pagina = AlmNavegador(automacao)
+        for operacao in pendentes:
+            pagina.registrar_resultado(id_item, mensagem, link_pontua, "Link do Pontua", pf, (operacao,))
+            feitas.append(operacao)
+            checkpoint(11, operacoes=feitas)
+    return pf
+
+
+class DemandaIncompleta(Exception):
+    """A demanda foi salva no Pontua, mas a contagem não; refazer as etapas 5 a 9 criaria uma duplicata."""
+
+
+def link_pontua_registrado(anterior):
+    """Link da contagem já salva em uma execução anterior, ou None se ela ainda não existe.
+
+    Uma demanda salva sem contagem (checkpoint da etapa 7) segue por registrar_ou_continuar.
+    """
+    etapas = anterior.get("etapas") or {}
+    if "9" in etapas:
+        return etapas["9"]["link_pontua"]
+    if anterior.get("estado") in (REGISTRADO, CONCLUIDO) and anterior.get("link_pontua"):
+        return anterior["link_pontua"]
+    return None
+
+
+def processar_demanda(navegador, automacao, link_alm=None, aba_pontua=None, armazem=None, item=None, chave=None):
+    """Executa as etapas 1 a 11 de uma demanda em uma sessão de navegador já aberta.
+
+    Quando `link_alm` é informado, a aba do ALM (primeira aba) navega para ele antes
+    da extração; `item` é o link que quem chamou já abriu nessa aba. A chave no banco
+    local vem de um deles (ou de `chave`), nunca da URL atual, que o Jazz pode reescrever.
+    Retorna o registro da demanda e o handle da aba do Pontua, para que a mesma aba seja
+    reaproveitada na próxima demanda.
+
+    Com um `armazem` (armazem.ArmazemDemandas), os campos ainda válidos não são lidos de
+    novo e cada etapa concluída grava um checkpoint: ao retomar, a demanda segue da
+    última etapa gravada, sem registrar de novo no Pontua nem perguntar o PF outra vez.
+    """
+    aba_alm = navegador.window_handles[0]
+    if link_alm:
+        navegador.switch_to.window(aba_alm)
+        navegador.get(link_alm)
+
+    item = link_alm or item
+    if not item:
+        raise ValueError("processar_demanda precisa do link do ALM (link_alm ou item).")
+    chave = chave or chave_do_item(item)
+    anterior = (armazem.carregar(chave) if armazem else None) or {}
+    conhecidos = armazem.campos_validos(chave) if armazem else {}
+    etapas = anterior.get("etapas") or {}
+    checkpoint = (lambda etapa, **saidas: armazem.registrar_etapa(chave, etapa, **saidas)) if armazem else None
+
+    instr = automacao.instrumentacao
+    instr.nova_execucao(item)
+    automacao.prontidao.esperas.clear()
+    automacao.retentativas.nova_execucao()
+    tempos = {}
+    inicio = time.perf_counter()
+    try:
+        dados = extrair_dados_alm(navegador, automacao, conhecidos, chave)
+        tempos["alm_extracao"] = time.perf_counter() - inicio
+        if armazem:
+            lidos = [campo for campo in CAMPOS_ALM if campo not in conhecidos]
+            armazem.registrar_extracao(chave, item, dados, lidos)
+            checkpoint(3)
+        # Com um manifesto de decisões, a demanda sem decisão é desviada aqui, antes de tocar no Pontua
+        interacao.definir_contexto(dados)
+
+        marca = time.perf_counter()
+        link_pontua = link_pontua_registrado(anterior)
+        if link_pontua:
+            logging.info(f"🗃️ Demanda já registrada no Pontua: {link_pontua}")
+        else:
+            link_pontua, aba_pontua = registrar_ou_continuar(navegador, automacao, dados, etapas, aba_pontua, checkpoint)
+            if armazem:
+                armazem.atualizar(chave, estado=REGISTRADO, link_pontua=link_pontua)
+        tempos["pontua"] = time.perf_counter() - marca
+
+        marca = time.perf_counter()
+        pf_anterior = (etapas.get("10") or {}).get("pf")
+        feitas = (etapas.get("11") or {}).get("operacoes") or ()
+        pf = atualizar_alm(navegador, automacao, dados, link_pontua, aba_alm, pf_anterior, checkpoint, chave, feitas)
+        tempos["alm_atualizacao"] = time.perf_counter() - marca
+        tempos["total"] = time.perf_counter() - inicio
+        if armazem:
+            armazem.atualizar(chave, estado=CONCLUIDO, pf=pf, erro=None, tempos=tempos)
+    except RevisaoPendente as e:
+        # Uma demanda que já está no Pontua continua como registrada, para não ser criada de novo
+        if armazem and anterior.get("estado") not in (REGISTRADO, CONCLUIDO):
+            armazem.atualizar(chave, estado=PENDENTE, erro=str(e))
+        raise
+    except Exception as e:
+        if armazem:
+            armazem.atualizar(chave, erro=str(e))
+        raise
+    finally:
+        instr.anexar("retentativas", automacao.retentativas.resumo())
+        if PASTA_RELATORIOS:
+            nome = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            instr.salvar_relatorio(os.path.join(PASTA_RELATORIOS, f"execucao-{nome}.json"))
 
-        print("✅ [10/12] Retornando ao ALM...")
-        navegador.switch_to.window(navegador.window_handles[0])
-        automacao.clicar_botao("aba_visaogeral")
-        pf = pg.prompt("Quantidade de PF: ", "Pontos de função")
-
-        print("✅ [11/12] Preenchendo informações finais no ALM...")
-        mensagem = f"Contagem da {numero_demanda} em método SFP = {pf} PF.\n"
-        mensagem += f"Estimativa realizada em {data_formatada} pelo estgiário Augusto Saboia\n"
-        automacao.preencher_campo_comentario(mensagem)
-        automacao.clicar_botao("comentario")
-        time.sleep(2)
-        pg.hotkey("ctrl", "l")
-        automacao.preencher_campo("url", link_pontua)
-        automacao.preencher_campo("rotulo", "Link do Pontua")
-        automacao.clicar_botao("aba_atendimento")
-        automacao.preencher_campo("tamanhoPF", pf)
-
-        print("✅ [12/12] Finalizando...")
-        logging.info("--- EXTRAÇÃO FINALIZADA ---")
-        pg.alert("Execução finalizada! O navegador será fechado.", "Encerrando")
-        time.sleep(2)
+    registro = dict(
+        dados, link_pontua=link_pontua, pf=pf, tempos=tempos, esperas=automacao.prontidao.resumo(),
+        retentativas=automacao.retentativas.resumo(),
+    )
+    logging.info(f"⏱️ Tempo total aguardando a página: {automacao.prontidao.total_esperado():.1f}s")
+    return registro, aba_pontua
 
+
+# Função de execução
+def executar_automacao(link_alm, armazem=None, chave=None, **opcoes_navegador):
+    chave = chave or chave_do_item(link_alm)
+    navegador = obter_navegador(link_alm, iniciar_navegador_com_perfil_usuario, **opcoes_navegador)
+    if not navegador:
+        return
+
+    try:
+        automacao = automation(navegador)
+        # O link já foi aberto por obter_navegador: processa sob a chave dele, sem navegar de novo
+        processar_demanda(navegador, automacao, armazem=armazem, item=link_alm, chave=chave)
+
+        with automacao.instrumentacao.etapa(12, "Finalizando..."):
+            logging.info("--- EXTRAÇÃO FINALIZADA ---")
+        interacao.alertar("Execução finalizada!", "Encerrando")
+
+    except (OperacaoCancelada, DemandaIncompleta) as e:
+        logging.warning(f"⏸️ {e}")
+        if armazem:
+            logging.info(f"💾 Progresso salvo. Para continuar: python automation.py --retomar {chave}")
     except Exception as e:
         logging.error(f"Erro durante a automação: {e}")
-        pg.alert(f"Ocorreu um erro durante a execução: {e}", "Erro")
+        interacao.alertar(f"Ocorreu um erro durante a execução: {e}", "Erro")
+        if armazem:
+            logging.info(f"💾 Progresso salvo. Para continuar: python automation.py --retomar {chave}")
     finally:
-        logging.info("Fechando o navegador.")
-        navegador.quit()
+        liberar_navegador(navegador)
+
+
+def retomar_automacao(armazem, chave=None, link_pontua=None, **opcoes_navegador):
+    """Continua uma demanda interrompida a partir da última etapa gravada no banco local.
+
+    Sem `chave`, retoma a demanda não concluída mais recente. `link_pontua` registra uma
+    contagem concluída manualmente no Pontua, liberando as etapas 10 e 11.
+    """
+    registro = armazem.carregar(chave) if chave else armazem.ultima_pendente()
+    if not registro or not registro.get("item"):
+        logging.warning(f"Nenhuma demanda para retomar{f' com a chave {chave}' if chave else ''}.")
+        return
+    if registro.get("estado") == CONCLUIDO:
+        logging.info(f"✅ A demanda {registro['chave']} já foi concluída.")
+        return
+    if link_pontua:
+        armazem.registrar_etapa(registro["chave"], 9, link_pontua=link_pontua)
+        armazem.atualizar(registro["chave"], estado=REGISTRADO, link_pontua=link_pontua)
+
+    etapas = sorted(int(etapa) for etapa in registro.get("etapas") or {})
+    logging.info(f"🔁 Retomando a demanda {registro['chave']} após a etapa {etapas[-1] if etapas else 0}.")
+    executar_automacao(registro["item"], armazem, registro["chave"], **opcoes_navegador)
 
 
 # EXECUÇÃO PRINCIPAL
 if __name__ == "__main__":
- link = obter_link_do_usuario()
- if link:
-     executar_automacao(link)
\ No newline at end of file
+ parser = argparse.ArgumentParser(description="Registra no Pontua uma demanda do ALM e atualiza o ALM com o link e os PF.")
+ parser.add_argument("link", nargs="?", help="Link do ALM; se omitido, é perguntado ao usuário.")
+ parser.add_argument("--headless", action="store_true", help="Executa o Edge sem janela.")
+ parser.add_argument("--sem-gpu", action="store_true", help="Desativa GPU e /dev/shm (servidores e containers).")
+ parser.add_argument("--viewport", default=VIEWPORT_PADRAO, help="Tamanho da janela no modo headless (largura,altura).")
+ parser.add_argument("--interacao", choices=["gui", "cli", "arquivo", "manifesto"], default=None,
+                     help="Como responder perguntas e confirmações (padrão: AUTOMACAO_INTERACAO ou gui).")
+ parser.add_argument("--respostas", default=None,
+                     help="Arquivo JSON {chave: resposta} (--interacao arquivo) ou manifesto CSV/JSON (--interacao manifesto).")
+ parser.add_argument("--pontua", choices=["ui", "api"], default=PONTUA_BACKEND,
+                     help="Registra no Pontua pela interface ou pela API com a sessão do navegador (padrão: AUTOMACAO_PONTUA_BACKEND ou ui).")
+ parser.add_argument("--alm", choices=["ui", "api"], default=ALM_BACKEND,
+                     help="Lê e grava o work item pela página ou pela API OSLC com a sessão do navegador (padrão: AUTOMACAO_ALM_BACKEND ou ui).")
+ parser.add_argument("--banco", default=ARQUIVO_BANCO, help="Banco SQLite com os checkpoints de cada etapa ('' desativa).")
+ parser.add_argument("--retomar", nargs="?", const="", default=None, metavar="NUMERO",
+                     help="Continua uma demanda interrompida (sem número: a mais recente).")
+ parser.add_argument("--link-pontua", default=None, help="Com --retomar: link da contagem concluída manualmente no Pontua.")
+ args = parser.parse_args()
+
+ if args.interacao:
+     interacao = criar_interacao(args.interacao, args.respostas)
+ PONTUA_BACKEND = args.pontua
+ ALM_BACKEND = args.alm
+ armazem = ArmazemDemandas(args.banco) if args.banco else None
+ opcoes = {"headless": args.headless, "sem_gpu": args.sem_gpu, "viewport": args.viewport}
+ if args.retomar is not None:
+     if not armazem:
+         parser.error("--retomar precisa do banco local (--banco).")
+     retomar_automacao(armazem, args.retomar or None, args.link_pontua, **opcoes)
+ else:
+     link = args.link or obter_link_do_usuario()
+     if link:
+         if not link.startswith(("http://", "https://")):
+             link = "https://" + link
+         executar_automacao(link, armazem, **opcoes)
@@ -7,7 +7,7 @@ import sys
 from selenium import webdriver
 from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from cache_driver import resolver_driver
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -49,9 +49,8 @@ def iniciar_navegador_com_perfil_usuario(url):
         edge_options = EdgeOptions()
         user_data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "Microsoft", "Edge", "User Data")
         edge_options.add_argument(f"user-data-dir={user_data_dir}")
-        # Caminho fixo para o driver local
-        driver_path = r"C:\WebDriver\Edge\msedgedriver.exe"
-        service = EdgeService(executable_path=driver_path)
+        # Driver resolvido pelo cache (inclui o caminho fixo C:\WebDriver\Edge\msedgedriver.exe)
+        service = EdgeService(executable_path=resolver_driver())
         driver = webdriver.Edge(service=service, options=edge_options)
         driver.get(url)
         driver.maximize_window()
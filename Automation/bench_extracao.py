@@ -0,0 +1,55 @@
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+
+from automation import automation, iniciar_navegador_com_perfil_usuario
+from simulador.servidor import iniciar_servidor, urls_do_simulador
+
+CAMPOS = ["resumo", "numero_demanda", "solicitante", "data_criacao", "codigo_servico", "tipo_demanda", "responsavel"]
+
+# ==============================================================================
+# BENCHMARK: EXTRAÇÃO CAMPO A CAMPO x EXTRAÇÃO EM LOTE
+# ==============================================================================
+def medir(navegador, instrumentacao, funcao, repeticoes):
+    tempos, comandos = [], []
+    for _ in range(repeticoes):
+        navegador.refresh()
+        antes = instrumentacao.comandos
+        inicio = time.perf_counter()
+        textos = funcao()
+        tempos.append(time.perf_counter() - inicio)
+        comandos.append(instrumentacao.comandos - antes)
+    return textos, statistics.median(tempos), statistics.median(comandos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara obter_textoElemento campo a campo com obter_textos em lote.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    servidor, url_base = iniciar_servidor()
+    alm_url_base, _ = urls_do_simulador(url_base)
+    with tempfile.TemporaryDirectory(prefix="automacao-bench-") as perfil:
+        navegador = iniciar_navegador_com_perfil_usuario(alm_url_base + "4817285", user_data_dir=perfil, headless=True)
+        try:
+            automacao = automation(navegador)
+            instrumentacao = automacao.instrumentacao
+
+            individual, t_individual, c_individual = medir(
+                navegador, instrumentacao, lambda: {c: automacao.obter_textoElemento(c) for c in CAMPOS}, args.repeticoes
+            )
+            lote, t_lote, c_lote = medir(navegador, instrumentacao, lambda: automacao.obter_textos(CAMPOS), args.repeticoes)
+        finally:
+            navegador.quit()
+            servidor.shutdown()
+
+    divergentes = [c for c in CAMPOS if individual[c] != lote[c]]
+    print(f"{'caminho':<20}{'comandos':>10}{'tempo (ms)':>14}")
+    print(f"{'campo a campo':<20}{c_individual:>10}{t_individual * 1000:>14.1f}")
+    print(f"{'em lote':<20}{c_lote:>10}{t_lote * 1000:>14.1f}")
+    print(f"Redução de comandos: {c_individual / max(c_lote, 1):.1f}x | tempo: {t_individual / max(t_lote, 1e-9):.1f}x")
+    if divergentes:
+        print(f"⚠️ Campos com valores diferentes entre os caminhos: {divergentes}")
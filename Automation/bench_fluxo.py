@@ -0,0 +1,99 @@
+import argparse
+import json
+import logging
+import tempfile
+import time
+
+import automation as modulo_automacao
+from automation import automation, iniciar_navegador_com_perfil_usuario, processar_demanda
+from instrumentacao import resumir_relatorios
+from interacao import criar_interacao
+from simulador.servidor import iniciar_servidor, urls_do_simulador
+
+# ==============================================================================
+# BENCHMARK DO FLUXO COMPLETO CONTRA O SIMULADOR LOCAL
+# ==============================================================================
+def criar_navegador(url, perfil, navegador="edge"):
+    """Inicia um navegador headless. Chrome é aceito para máquinas Linux sem o Edge instalado."""
+    if navegador == "chrome":
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+        opcoes = ChromeOptions()
+        opcoes.add_argument("--headless=new")
+        opcoes.add_argument(f"--window-size={modulo_automacao.VIEWPORT_PADRAO}")
+        opcoes.add_argument("--disable-gpu")
+        opcoes.add_argument("--disable-dev-shm-usage")
+        opcoes.add_argument(f"user-data-dir={perfil}")
+        opcoes.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        driver = webdriver.Chrome(options=opcoes)
+        driver.get(url)
+        return driver
+    return iniciar_navegador_com_perfil_usuario(url, user_data_dir=perfil, headless=True, sem_gpu=True)
+
+
+def executar_benchmark(demandas, latencia, navegador="edge", primeiro_id=1000, pontua="ui", alm="ui"):
+    """Executa o fluxo completo para `demandas` itens e retorna (relatórios, eventos do simulador, duração)."""
+    servidor, url_base = iniciar_servidor(latencia=latencia)
+    modulo_automacao.ALM_URL_BASE, modulo_automacao.PONTUA_URL = urls_do_simulador(url_base)
+    modulo_automacao.PASTA_RELATORIOS = ""
+    modulo_automacao.interacao = criar_interacao("simulador")
+    modulo_automacao.PONTUA_BACKEND = pontua
+    modulo_automacao.ALM_BACKEND = alm
+
+    relatorios = []
+    inicio = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="automacao-bench-") as perfil:
+        driver = criar_navegador(modulo_automacao.ALM_URL_BASE + str(primeiro_id), perfil, navegador)
+        try:
+            automacao = automation(driver)
+            aba_pontua = None
+            for posicao in range(demandas):
+                # A primeira demanda já está aberta; as seguintes navegam para o seu link
+                link = modulo_automacao.ALM_URL_BASE + str(primeiro_id + posicao)
+                try:
+                    _, aba_pontua = processar_demanda(
+                        driver, automacao, link if posicao else None, aba_pontua, item=link
+                    )
+                except Exception as e:
+                    logging.error(f"❌ Demanda {primeiro_id + posicao} falhou: {e}")
+                relatorios.append(automacao.instrumentacao.relatorio())
+        finally:
+            driver.quit()
+            servidor.shutdown()
+    return relatorios, servidor.eventos, time.perf_counter() - inicio
+
+
+def imprimir_resumo(resumo):
+    print(f"{'tipo':<10}{'nome':<55}{'n':>4}{'p50 (s)':>10}{'p95 (s)':>10}{'cmds':>7}")
+    for linha in resumo:
+        if linha["tipo"] == "acao":
+            continue
+        print(f"{linha['tipo']:<10}{linha['nome'][:54]:<55}{linha['amostras']:>4}{linha['p50']:>10.2f}"
+              f"{linha['p95']:>10.2f}{linha['comandos_p50']:>7.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede o fluxo ALM → Pontua → ALM de ponta a ponta no simulador local.")
+    parser.add_argument("-n", "--demandas", type=int, default=5)
+    parser.add_argument("--latencia-rede", type=int, default=50, help="Atraso de cada resposta HTTP, em ms.")
+    parser.add_argument("--latencia-render", type=int, default=200, help="Atraso de exibição de telas e diálogos, em ms.")
+    parser.add_argument("--latencia-opcoes", type=int, default=100, help="Atraso das opções dos ng-select, em ms.")
+    parser.add_argument("--navegador", choices=["edge", "chrome"], default="edge")
+    parser.add_argument("--pontua", choices=["ui", "api"], default="ui", help="Registro no Pontua pela interface ou pela API.")
+    parser.add_argument("--alm", choices=["ui", "api"], default="ui", help="Leitura e gravação no ALM pela página ou pela API.")
+    parser.add_argument("--saida", help="Grava os relatórios e o resumo em JSON.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    latencia = {"rede": args.latencia_rede, "render": args.latencia_render, "opcoes": args.latencia_opcoes}
+    relatorios, eventos, duracao = executar_benchmark(args.demandas, latencia, args.navegador, pontua=args.pontua, alm=args.alm)
+    resumo = resumir_relatorios(relatorios)
+
+    contagens = sum(1 for e in eventos if e.get("tipo") == "contagem")
+    print(f"ALM: {args.alm} | Pontua: {args.pontua} | Latência: {latencia} | {args.demandas} demandas em {duracao:.1f}s | {contagens} contagens salvas no simulador")
+    imprimir_resumo(resumo)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"latencia": latencia, "duracao": duracao, "resumo": resumo, "relatorios": relatorios},
+                      arquivo, ensure_ascii=False, indent=2)
@@ -0,0 +1,79 @@
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+
+from automation import automation, iniciar_navegador_com_perfil_usuario
+from ng_select import OPCOES
+from simulador.servidor import iniciar_servidor, urls_do_simulador
+
+# Seleções feitas em cada demanda: (função que renderiza a tela no simulador, placeholder, texto pedido)
+SELECOES = [
+    ("renderizarDemanda", "selecionar Fronteira/Aplicação", "80728"),
+    ("renderizarDemanda", "selecionar processo", "Ágil"),
+    ("renderizarDemanda", "selecionar tipo de demanda", "Manutenção Evolutiva"),
+    ("renderizarDemanda", "selecionar plataforma", "Web"),
+    ("renderizarDemanda", "selecionar linguagem", "JAVA"),
+    ("renderizarDemanda", "selecionar banco de dados", "MySql"),
+    ("renderizarContagem", "selecionar Roteiro", "SERPRO V3"),
+]
+
+# ==============================================================================
+# BENCHMARK: DIGITAR E CONFIRMAR COM ENTER x CLICAR A OPÇÃO EXATA
+# ==============================================================================
+def medir(navegador, instrumentacao, selecionar, repeticoes):
+    """Tempo e comandos por demanda (todas as SELECOES), e os valores exibidos ao final."""
+    tempos, comandos = [], []
+    for _ in range(repeticoes):
+        tempo, quantidade, valores = 0.0, 0, {}
+        for tela in dict.fromkeys(t for t, _, _ in SELECOES):
+            navegador.execute_script(f"{tela}();")
+            for _, placeholder, texto in (s for s in SELECOES if s[0] == tela):
+                antes = instrumentacao.comandos
+                inicio = time.perf_counter()
+                selecionar(placeholder, texto)
+                tempo += time.perf_counter() - inicio
+                quantidade += instrumentacao.comandos - antes
+                valores[placeholder] = navegador.execute_script("return valorNgSelect(arguments[0]);", placeholder)
+        tempos.append(tempo)
+        comandos.append(quantidade)
+    return valores, statistics.median(tempos), statistics.median(comandos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara a seleção de ng-select digitando com a seleção direta da opção.")
+    parser.add_argument("-r", "--repeticoes", type=int, default=10)
+    parser.add_argument("--latencia-opcoes", type=int, default=150, help="Atraso das opções dos ng-select, em ms.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    servidor, url_base = iniciar_servidor(latencia={"opcoes": args.latencia_opcoes})
+    _, pontua_url = urls_do_simulador(url_base)
+    with tempfile.TemporaryDirectory(prefix="automacao-bench-") as perfil:
+        navegador = iniciar_navegador_com_perfil_usuario(pontua_url, user_data_dir=perfil, headless=True)
+        try:
+            automacao = automation(navegador)
+            instrumentacao = automacao.instrumentacao
+            resultados = {}
+            resultados["digitando + ENTER"] = medir(
+                navegador, instrumentacao, automacao.selecionar_Dropdown_digitando, args.repeticoes
+            )
+            OPCOES.limpar()
+            resultados["direta (1ª demanda)"] = medir(navegador, instrumentacao, automacao.selecionar_Dropdown, 1)
+            resultados["direta (com cache)"] = medir(navegador, instrumentacao, automacao.selecionar_Dropdown, args.repeticoes)
+        finally:
+            navegador.quit()
+            servidor.shutdown()
+
+    print(f"{'caminho':<24}{'comandos':>10}{'tempo (ms)':>14}")
+    for caminho, (_, tempo, comandos) in resultados.items():
+        print(f"{caminho:<24}{comandos:>10}{tempo * 1000:>14.1f}")
+    _, t_antigo, c_antigo = resultados["digitando + ENTER"]
+    _, t_novo, c_novo = resultados["direta (com cache)"]
+    print(f"Por demanda ({len(SELECOES)} dropdowns) — comandos: {c_antigo / max(c_novo, 1):.1f}x | tempo: {t_antigo / max(t_novo, 1e-9):.1f}x")
+
+    esperados = {placeholder: valor for placeholder, valor in resultados["digitando + ENTER"][0].items()}
+    divergentes = [p for p, valor in resultados["direta (com cache)"][0].items() if valor != esperados.get(p)]
+    if divergentes:
+        print(f"⚠️ Dropdowns com valores diferentes entre os caminhos: {divergentes}")
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import time
+
+from normalizacao import normalizar_data, normalizar_lote
+
+ARQUIVO_AMOSTRAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "amostras_alm.json")
+
+
+# ==============================================================================
+# IMPLEMENTAÇÃO ANTERIOR (ÍNDICES FIXOS), PARA COMPARAÇÃO
+# ==============================================================================
+def normalizar_por_indices(textos):
+    meses = {
+        'jan': '01', 'fev': '02', 'mar': '03', 'abr': '04', 'mai': '05',
+        'jun': '06', 'jul': '07', 'ago': '08', 'set': '09', 'out': '10',
+        'nov': '11', 'dez': '12'
+    }
+    partes = textos["data_criacao"].split()
+    return dict(
+        textos,
+        numeroDemanda=textos["numero_demanda"][15:].strip(),
+        data_formatada=f"{partes[0]}/{meses.get(partes[2], partes[2])}/{partes[4]}",
+        codigo_aplicacao=textos["codigo_servico"][-5:],
+    )
+
+
+def verificar_corpus(amostras):
+    """Confere a normalização contra os valores esperados do corpus. Retorna o número de divergências."""
+    normalizados, erros = normalizar_lote([amostra["textos"] for amostra in amostras])
+    divergencias = 0
+    for posicao, (amostra, resultado) in enumerate(zip(amostras, normalizados)):
+        esperado = amostra["esperado"]
+        if esperado is None:
+            ok = resultado is None
+        else:
+            ok = resultado is not None and all(resultado[campo] == valor for campo, valor in esperado.items())
+        if not ok:
+            divergencias += 1
+            print(f"❌ Amostra {posicao}: esperado {esperado}, obtido {resultado or erros.get(posicao)}")
+    print(f"Corpus: {len(amostras) - divergencias}/{len(amostras)} amostras corretas.")
+    return divergencias
+
+
+def medir(funcao, repeticoes):
+    inicio = time.perf_counter()
+    funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida e mede a normalização dos campos do ALM.")
+    parser.add_argument("-n", "--repeticoes", type=int, default=2000, help="Cópias do corpus no lote medido.")
+    args = parser.parse_args()
+
+    with open(ARQUIVO_AMOSTRAS, encoding="utf-8") as arquivo:
+        amostras = json.load(arquivo)
+    verificar_corpus(amostras)
+
+    # Só o formato que a implementação anterior entende, para uma comparação justa
+    validas = [amostra["textos"] for amostra in amostras[:1]] * args.repeticoes
+    anterior = medir(lambda: [normalizar_por_indices(textos) for textos in validas], len(validas))
+    normalizar_data.cache_clear()
+    atual = medir(lambda: normalizar_lote(validas), len(validas))
+    # Uma data diferente por registro: mede o caminho sem o cache de normalizar_data
+    meses = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+    distintas = [dict(textos, data_criacao=f"{1 + i % 28} de {meses[i // 28 % 12]} de {1900 + i // 336} 10:15")
+                 for i, textos in enumerate(validas)]
+    anterior_distintas = medir(lambda: [normalizar_por_indices(textos) for textos in distintas], len(distintas))
+    normalizar_data.cache_clear()
+    sem_cache = medir(lambda: normalizar_lote(distintas), len(distintas))
+    todas = [amostra["textos"] for amostra in amostras] * args.repeticoes
+    normalizar_data.cache_clear()
+    corpus = medir(lambda: normalizar_lote(todas), len(todas))
+
+    print(f"Índices fixos (só o formato pt-BR): {anterior:8.2f} µs/registro")
+    print(f"normalizar_lote (mesmo formato):    {atual:8.2f} µs/registro")
+    print(f"Índices fixos (datas distintas):    {anterior_distintas:8.2f} µs/registro")
+    print(f"normalizar_lote (datas distintas):  {sem_cache:8.2f} µs/registro")
+    print(f"normalizar_lote (corpus completo):  {corpus:8.2f} µs/registro")
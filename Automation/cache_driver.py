@@ -0,0 +1,128 @@
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+
+from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+ARQUIVO_CACHE = os.environ.get(
+    "AUTOMACAO_CACHE_DRIVER",
+    os.path.join(os.path.expanduser("~"), ".cache", "automation-serpro", "drivers.json"),
+)
+
+# Drivers instalados manualmente que podem ser usados sem consultar o webdriver_manager
+CAMINHOS_CONHECIDOS = [r"C:\WebDriver\Edge\msedgedriver.exe"]
+
+RE_VERSAO = re.compile(r"(\d+)\.(\d+)\.(\d+)\.(\d+)")
+
+# ==============================================================================
+# VERSÕES DO NAVEGADOR E DO DRIVER
+# ==============================================================================
+def versao_navegador():
+    """Versão instalada do Edge, sem acesso à rede. Retorna None se não for possível descobrir."""
+    if sys.platform == "win32":
+        import winreg
+
+        for raiz in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+            try:
+                with winreg.OpenKey(raiz, r"Software\Microsoft\Edge\BLBeacon") as chave:
+                    return winreg.QueryValueEx(chave, "version")[0]
+            except OSError:
+                continue
+        return None
+
+    executaveis = ["microsoft-edge", "microsoft-edge-stable", "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge"]
+    for executavel in executaveis:
+        versao = _versao_de_executavel(executavel)
+        if versao:
+            return versao
+    return None
+
+
+def _versao_de_executavel(executavel):
+    if not (os.path.isfile(executavel) or shutil.which(executavel)):
+        return None
+    try:
+        saida = subprocess.run([executavel, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    encontrado = RE_VERSAO.search(saida)
+    return encontrado.group(0) if encontrado else None
+
+
+def versao_principal(versao):
+    return versao.split(".", 1)[0] if versao else None
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+def _carregar_cache():
+    try:
+        with open(ARQUIVO_CACHE, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_cache(cache):
+    os.makedirs(os.path.dirname(ARQUIVO_CACHE), exist_ok=True)
+    temporario = ARQUIVO_CACHE + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(cache, arquivo, indent=2)
+    os.replace(temporario, ARQUIVO_CACHE)
+
+
+def _assinatura(caminho):
+    info = os.stat(caminho)
+    return {"tamanho": info.st_size, "mtime": info.st_mtime}
+
+
+def _entrada_valida(entrada, principal):
+    """Validação barata: o arquivo não mudou desde que foi verificado e a versão principal confere."""
+    try:
+        if _assinatura(entrada["caminho"]) != entrada["assinatura"]:
+            return False
+    except (OSError, KeyError):
+        return False
+    return principal is None or versao_principal(entrada.get("versao_driver")) == principal
+
+
+def resolver_driver():
+    """Caminho do msedgedriver compatível com o Edge instalado.
+
+    Usa o cache quando o Edge não mudou de versão; depois tenta os drivers conhecidos e,
+    só em último caso, o EdgeChromiumDriverManager (que pode acessar a rede).
+    """
+    versao = versao_navegador()
+    principal = versao_principal(versao)
+    chave = versao or "desconhecida"
+    cache = _carregar_cache()
+
+    entrada = cache.get(chave)
+    if entrada and _entrada_valida(entrada, principal):
+        logging.info(f"🗃️ Driver do Edge {chave} encontrado no cache: {entrada['caminho']}")
+        return entrada["caminho"]
+
+    caminho = None
+    for candidato in CAMINHOS_CONHECIDOS + [shutil.which("msedgedriver")]:
+        if candidato and os.path.isfile(candidato):
+            versao_candidato = _versao_de_executavel(candidato)
+            if principal is None or versao_principal(versao_candidato) == principal:
+                caminho = candidato
+                break
+
+    if caminho is None:
+        logging.info(f"⬇️ Resolvendo driver do Edge {chave} pelo webdriver_manager...")
+        caminho = EdgeChromiumDriverManager().install()
+
+    cache[chave] = {
+        "caminho": caminho,
+        "versao_driver": _versao_de_executavel(caminho),
+        "assinatura": _assinatura(caminho),
+    }
+    _salvar_cache(cache)
+    return caminho
@@ -0,0 +1,93 @@
+import json
+from urllib.parse import urljoin, urlsplit
+
+import urllib3
+
+
+class ErroApi(Exception):
+    """Uma API do ALM ou do Pontua recusou ou não respondeu uma requisição."""
+
+    def __init__(self, mensagem, status=None):
+        super().__init__(mensagem)
+        self.status = status
+
+    @property
+    def resultado_incerto(self):
+        """A requisição chegou ao servidor e pode ter sido processada: resposta perdida (timeout de leitura) ou 5xx."""
+        return self.status is None or self.status >= 500
+
+
+class ErroConexao(ErroApi):
+    """Não foi possível conectar: a requisição não chegou ao servidor."""
+
+    resultado_incerto = False
+
+
+class SessaoExpirada(ErroApi):
+    """Os cookies do navegador não autenticam mais a API (401/403 ou redirecionamento para o login)."""
+
+
+def sessao_do_navegador(navegador):
+    """(url base, cookies) da aba atual; get_cookies só devolve os cookies do domínio aberto."""
+    partes = urlsplit(navegador.current_url)
+    cookies = {cookie["name"]: cookie["value"] for cookie in navegador.get_cookies()}
+    return f"{partes.scheme}://{partes.netloc}", cookies
+
+
+# ==============================================================================
+# CLIENTE HTTP AUTENTICADO PELA SESSÃO DO NAVEGADOR
+# ==============================================================================
+class ClienteSessao:
+    """Requisições JSON com os cookies de uma sessão aberta no navegador e conexões em pool.
+
+    Base de pontua_api.ClientePontua e alm_api.ClienteAlm.
+    """
+
+    def __init__(self, url_base, cookies=None, cabecalhos=None, conexoes=4, timeout=30):
+        self.url_base = url_base
+        self.conexoes = conexoes
+        self.cabecalhos = {"Accept": "application/json", "Content-Type": "application/json"}
+        if cookies:
+            self.cabecalhos["Cookie"] = "; ".join(f"{nome}={valor}" for nome, valor in cookies.items())
+        self.cabecalhos.update(cabecalhos or {})
+        # POST não é repetido automaticamente: uma resposta perdida poderia duplicar o registro
+        self._pool = urllib3.PoolManager(
+            num_pools=2,
+            maxsize=conexoes,
+            timeout=urllib3.Timeout(connect=5, read=timeout),
+            retries=urllib3.Retry(total=2, connect=2, read=0, status=0, redirect=0, backoff_factor=0.3),
+        )
+
+    def fechar(self):
+        self._pool.clear()
+
+    def sessao_expirada(self, resposta):
+        return resposta.status in (401, 403) or 300 <= resposta.status < 400
+
+    def requisitar(self, metodo, caminho, corpo=None, cabecalhos=None, aceitar=()):
+        """Retorna a resposta do urllib3; status em `aceitar` não levantam ErroApi."""
+        try:
+            resposta = self._pool.request(
+                metodo,
+                urljoin(self.url_base, caminho),
+                body=json.dumps(corpo, ensure_ascii=False).encode("utf-8") if corpo is not None else None,
+                headers=dict(self.cabecalhos, **(cabecalhos or {})),
+                redirect=False,
+            )
+        except urllib3.exceptions.HTTPError as e:
+            # Com retries, o urllib3 embrulha a causa em MaxRetryError.reason
+            if isinstance(getattr(e, "reason", e), (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError)):
+                raise ErroConexao(f"{metodo} {caminho}: {e}") from e
+            raise ErroApi(f"{metodo} {caminho}: {e}") from e
+        if resposta.status in aceitar:
+            return resposta
+        if self.sessao_expirada(resposta):
+            raise SessaoExpirada(f"{metodo} {caminho}: sessão não autenticada ({resposta.status})", resposta.status)
+        if resposta.status >= 400:
+            detalhe = resposta.data[:200].decode("utf-8", "replace")
+            raise ErroApi(f"{metodo} {caminho}: HTTP {resposta.status} {detalhe}", resposta.status)
+        return resposta
+
+    def requisitar_json(self, metodo, caminho, corpo=None, cabecalhos=None):
+        resposta = self.requisitar(metodo, caminho, corpo, cabecalhos)
+        return json.loads(resposta.data) if resposta.data else {}
@@ -0,0 +1,250 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+import urllib.request
+
+from selenium import webdriver
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+
+from cache_driver import resolver_driver
+
+PORTA_CONTROLE = int(os.environ.get("AUTOMACAO_DAEMON_PORTA", "47800"))
+PORTA_DEPURACAO = int(os.environ.get("AUTOMACAO_DAEMON_DEPURACAO", "9222"))
+INTERVALO_SAUDE = 5
+INTERVALO_KEEPALIVE = 600
+
+# ==============================================================================
+# DAEMON: MANTÉM UM EDGE AQUECIDO COM ALM E PONTUA ABERTOS
+# ==============================================================================
+class DaemonNavegador:
+    """Mantém um Edge iniciado com depuração remota, verifica sua saúde e o reinicia se cair."""
+
+    def __init__(self, urls, user_data_dir, porta_depuracao=PORTA_DEPURACAO, headless=False, sem_gpu=False, viewport="1920,1080"):
+        self.urls = urls  # abas abertas e mantidas autenticadas (ALM e Pontua)
+        self.porta_depuracao = porta_depuracao
+        self.user_data_dir = user_data_dir
+        self.headless = headless
+        self.sem_gpu = sem_gpu
+        self.viewport = viewport
+        self.driver = None
+        self.caminho_driver = None
+        self.abas = []
+        self.reinicios = 0
+        self.iniciado_em = None
+        self.tempo_partida = None
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+
+    @property
+    def endereco_depuracao(self):
+        return f"127.0.0.1:{self.porta_depuracao}"
+
+    def iniciar(self):
+        with self._trava:
+            inicio = time.perf_counter()
+            logging.info(f"🚀 Iniciando Edge aquecido (depuração em {self.endereco_depuracao})...")
+            opcoes = EdgeOptions()
+            opcoes.add_argument(f"user-data-dir={self.user_data_dir}")
+            opcoes.add_argument(f"--remote-debugging-port={self.porta_depuracao}")
+            if self.headless:
+                opcoes.add_argument("--headless=new")
+                opcoes.add_argument(f"--window-size={self.viewport}")
+            if self.sem_gpu:
+                opcoes.add_argument("--disable-gpu")
+                opcoes.add_argument("--disable-dev-shm-usage")
+            self.caminho_driver = self.caminho_driver or resolver_driver()
+            self.driver = webdriver.Edge(service=EdgeService(self.caminho_driver), options=opcoes)
+            if not self.headless:
+                self.driver.maximize_window()
+
+            # Abre ALM e Pontua para que as sessões autenticadas fiquem prontas
+            self.driver.get(self.urls[0])
+            for url in self.urls[1:]:
+                self.driver.execute_script(f"window.open('{url}','_blank');")
+            self.abas = list(self.driver.window_handles)
+            self.driver.switch_to.window(self.abas[0])
+
+            self.iniciado_em = time.time()
+            self.tempo_partida = time.perf_counter() - inicio
+            logging.info(f"✅ Edge pronto em {self.tempo_partida:.1f}s.")
+
+    def encerrar(self):
+        self._parar.set()
+        with self._trava:
+            if self.driver:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+                self.driver = None
+
+    def saudavel(self):
+        try:
+            with urllib.request.urlopen(f"http://{self.endereco_depuracao}/json/version", timeout=2) as resposta:
+                return resposta.status == 200
+        except Exception:
+            return False
+
+    def reiniciar(self):
+        logging.warning("♻️ Reiniciando o Edge do daemon...")
+        with self._trava:
+            try:
+                if self.driver:
+                    self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+        self.reinicios += 1
+        self.iniciar()
+
+    def manter_sessoes(self):
+        """Faz uma requisição autenticada em cada aba do daemon para que as sessões não expirem."""
+        with self._trava:
+            for aba in self.abas:
+                try:
+                    self.driver.switch_to.window(aba)
+                    self.driver.execute_script("fetch(window.location.href, {credentials: 'include'});")
+                except Exception as e:
+                    logging.warning(f"⚠️ Falha no keepalive da aba {aba}: {e}")
+
+    def monitorar(self):
+        ultimo_keepalive = time.monotonic()
+        while not self._parar.wait(INTERVALO_SAUDE):
+            if not self.saudavel():
+                logging.error("💥 Edge do daemon não responde.")
+                try:
+                    self.reiniciar()
+                except Exception as e:
+                    logging.error(f"❌ Falha ao reiniciar o Edge: {e}")
+                continue
+            if time.monotonic() - ultimo_keepalive >= INTERVALO_KEEPALIVE:
+                self.manter_sessoes()
+                ultimo_keepalive = time.monotonic()
+
+    def status(self):
+        return {
+            "saudavel": self.saudavel(),
+            "endereco_depuracao": self.endereco_depuracao,
+            "caminho_driver": self.caminho_driver,
+            "reinicios": self.reinicios,
+            "tempo_partida": self.tempo_partida,
+            "ativo_ha": round(time.time() - self.iniciado_em, 1) if self.iniciado_em else None,
+        }
+
+
+class ManipuladorControle(socketserver.StreamRequestHandler):
+    """Protocolo de controle: uma linha JSON {"comando": ...} por requisição, uma linha JSON de resposta."""
+
+    def handle(self):
+        daemon = self.server.daemon_navegador
+        try:
+            pedido = json.loads(self.rfile.readline() or b"{}")
+            comando = pedido.get("comando", "status")
+            if comando == "status":
+                resposta = daemon.status()
+            elif comando == "reiniciar":
+                daemon.reiniciar()
+                resposta = daemon.status()
+            elif comando == "encerrar":
+                resposta = {"encerrando": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                resposta = {"erro": f"comando desconhecido: {comando}"}
+        except Exception as e:
+            resposta = {"erro": str(e)}
+        self.wfile.write((json.dumps(resposta) + "\n").encode("utf-8"))
+
+
+def executar_daemon(porta_controle=PORTA_CONTROLE, **kwargs):
+    daemon = DaemonNavegador(**kwargs)
+    daemon.iniciar()
+    threading.Thread(target=daemon.monitorar, daemon=True).start()
+
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    with socketserver.ThreadingTCPServer(("127.0.0.1", porta_controle), ManipuladorControle) as servidor:
+        servidor.daemon_navegador = daemon
+        logging.info(f"🛰️ Daemon aguardando conexões em 127.0.0.1:{porta_controle}")
+        try:
+            servidor.serve_forever()
+        finally:
+            daemon.encerrar()
+
+
+# ==============================================================================
+# CLIENTE
+# ==============================================================================
+def enviar_comando(comando, porta_controle=PORTA_CONTROLE, timeout=2):
+    with socket.create_connection(("127.0.0.1", porta_controle), timeout=timeout) as conexao:
+        conexao.sendall((json.dumps({"comando": comando}) + "\n").encode("utf-8"))
+        return json.loads(conexao.makefile("rb").readline())
+
+
+def anexar_ao_daemon(url=None, porta_controle=PORTA_CONTROLE):
+    """Conecta um WebDriver ao Edge do daemon. Retorna None se o daemon não estiver disponível."""
+    inicio = time.perf_counter()
+    try:
+        status = enviar_comando("status", porta_controle)
+    except OSError:
+        return None
+    if not status.get("saudavel"):
+        logging.warning("⚠️ Daemon encontrado, mas o Edge não está saudável.")
+        return None
+
+    opcoes = EdgeOptions()
+    opcoes.add_experimental_option("debuggerAddress", status["endereco_depuracao"])
+    driver = webdriver.Edge(service=EdgeService(status["caminho_driver"]), options=opcoes)
+    driver.anexado_ao_daemon = True
+    driver.switch_to.window(driver.window_handles[0])
+    if url:
+        driver.get(url)
+    logging.info(f"⚡ Anexado ao Edge do daemon; primeira ação em {(time.perf_counter() - inicio) * 1000:.0f} ms.")
+    return driver
+
+
+def obter_navegador(url, iniciar, **kwargs):
+    """Usa o Edge do daemon quando disponível; caso contrário inicia um navegador novo com `iniciar(url, **kwargs)`."""
+    return anexar_ao_daemon(url) or iniciar(url, **kwargs)
+
+
+def liberar_navegador(driver):
+    """Fecha o navegador iniciado por esta execução; do Edge do daemon, só desanexa, para que continue aquecido."""
+    if getattr(driver, "anexado_ao_daemon", False):
+        logging.info("🔌 Desanexando do Edge do daemon.")
+        # Encerra só o msedgedriver desta conexão; quit() fecharia o navegador do daemon
+        driver.service.stop()
+    else:
+        logging.info("Fechando o navegador.")
+        driver.quit()
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mantém um Edge aquecido para a automação se anexar.")
+    parser.add_argument("acao", nargs="?", choices=["iniciar", "status", "reiniciar", "encerrar"], default="iniciar")
+    parser.add_argument("--porta", type=int, default=PORTA_CONTROLE, help="Porta do socket de controle.")
+    parser.add_argument("--porta-depuracao", type=int, default=PORTA_DEPURACAO)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--sem-gpu", action="store_true")
+    parser.add_argument("--viewport", default=None, help="Tamanho da janela no modo headless (largura,altura).")
+    args = parser.parse_args()
+
+    if args.acao == "iniciar":
+        import automation as modulo_automacao
+
+        executar_daemon(
+            args.porta,
+            urls=[modulo_automacao.ALM_URL_BASE.split("#", 1)[0], modulo_automacao.PONTUA_URL],
+            user_data_dir=modulo_automacao.diretorio_perfil_edge(),
+            porta_depuracao=args.porta_depuracao,
+            headless=args.headless,
+            sem_gpu=args.sem_gpu,
+            viewport=args.viewport or modulo_automacao.VIEWPORT_PADRAO,
+        )
+    else:
+        print(json.dumps(enviar_comando(args.acao, args.porta, timeout=120), indent=2, ensure_ascii=False))
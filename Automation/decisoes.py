@@ -0,0 +1,180 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+
+from interacao import Interacao
+
+RE_NUMERO = re.compile(r"(\d+)\s*$")
+VERDADEIROS = {"1", "s", "sim", "true", "x", "y", "yes", "ok"}
+
+
+class RevisaoPendente(Exception):
+    """A demanda não tem decisão suficiente no manifesto e foi enviada para revisão humana."""
+
+
+# ==============================================================================
+# MANIFESTO DE DECISÕES
+# ==============================================================================
+def normalizar_numero(numero):
+    """'Work Item 1234', '1234' e ' 1234 ' viram a mesma chave: '1234'."""
+    numero = str(numero or "").strip()
+    encontrado = RE_NUMERO.search(numero)
+    return encontrado.group(1) if encontrado else numero
+
+
+def _normalizar_pf(valor):
+    if valor is None or str(valor).strip() == "":
+        return None
+    texto = str(valor).strip().replace(",", ".")
+    float(texto)  # ValueError para PF inválido
+    return texto
+
+
+def _normalizar_decisao(linha):
+    aprovado = linha.get("aprovado", True)
+    if isinstance(aprovado, str):
+        aprovado = aprovado.strip().lower() in VERDADEIROS
+    return {
+        "aprovado": bool(aprovado),
+        "pf": _normalizar_pf(linha.get("pf")),
+        "tipo": (linha.get("tipo") or "").strip() or None,
+    }
+
+
+def carregar_manifesto(caminho):
+    """Lê o manifesto em CSV (numero_demanda,aprovado,pf,tipo) ou JSON.
+
+    O JSON pode ser uma lista de decisões ou {"demandas": [...], "tipos": {tipo do ALM: tipo do Pontua}}.
+    Retorna (decisões por número da demanda, mapeamento de tipos).
+    """
+    tipos = {}
+    if caminho.lower().endswith(".csv"):
+        with open(caminho, encoding="utf-8-sig", newline="") as arquivo:
+            linhas = list(csv.DictReader(arquivo))
+    else:
+        with open(caminho, encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        if isinstance(dados, dict):
+            tipos = dados.get("tipos", {})
+            linhas = dados.get("demandas", [])
+        else:
+            linhas = dados
+
+    decisoes = {}
+    for posicao, linha in enumerate(linhas, 1):
+        numero = normalizar_numero(linha.get("numero_demanda"))
+        if not numero:
+            logging.warning(f"⚠️ Linha {posicao} do manifesto sem numero_demanda; ignorada.")
+            continue
+        try:
+            decisoes[numero] = _normalizar_decisao(linha)
+        except ValueError:
+            logging.warning(f"⚠️ PF inválido para a demanda {numero} no manifesto: {linha.get('pf')!r}")
+            decisoes[numero] = {"aprovado": False, "pf": None, "tipo": None, "invalido": True}
+    logging.info(f"📋 Manifesto carregado: {len(decisoes)} demandas, {len(tipos)} mapeamentos de tipo.")
+    return decisoes, tipos
+
+
+# ==============================================================================
+# RESPOSTAS AUTOMÁTICAS A PARTIR DO MANIFESTO
+# ==============================================================================
+class InteracaoDecisoes(Interacao):
+    """Responde as perguntas da automação com as decisões do manifesto para a demanda em andamento.
+
+    Quando falta uma decisão, a demanda é gravada em `arquivo_pendentes` e RevisaoPendente
+    é levantada antes de qualquer gravação no Pontua, para que o lote siga para o próximo item.
+    """
+
+    def __init__(self, caminho_manifesto, arquivo_pendentes="pendentes_revisao.jsonl"):
+        self.decisoes, self.tipos = carregar_manifesto(caminho_manifesto)
+        self.arquivo_pendentes = arquivo_pendentes
+        self._local = threading.local()  # cada worker do pool tem a sua demanda em andamento
+        self._trava = threading.Lock()
+
+    @property
+    def contexto(self):
+        return getattr(self._local, "contexto", None)
+
+    def definir_contexto(self, dados):
+        """Chamado por processar_demanda após a extração do ALM, antes de abrir o Pontua."""
+        self._local.contexto = dados
+        numero = normalizar_numero(dados.get("numeroDemanda"))
+        decisao = self.decisoes.get(numero)
+        if decisao is None:
+            self._pendente("demanda fora do manifesto")
+        if decisao.get("invalido"):
+            self._pendente("PF inválido no manifesto")
+        if not decisao["aprovado"]:
+            self._pendente("demanda não aprovada no manifesto")
+        if decisao["pf"] is None:
+            self._pendente("PF não informado no manifesto")
+
+    def _decisao(self):
+        contexto = self.contexto or {}
+        return self.decisoes.get(normalizar_numero(contexto.get("numeroDemanda")), {})
+
+    def _pendente(self, motivo):
+        contexto = self.contexto or {}
+        registro = {
+            "numero_demanda": contexto.get("numeroDemanda"),
+            "motivo": motivo,
+            "registrado_em": datetime.now().isoformat(timespec="seconds"),
+            "dados": contexto,
+        }
+        with self._trava:
+            pasta = os.path.dirname(self.arquivo_pendentes)
+            if pasta:
+                os.makedirs(pasta, exist_ok=True)
+            with open(self.arquivo_pendentes, "a", encoding="utf-8") as saida:
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        logging.warning(f"📝 Demanda {registro['numero_demanda']} enviada para revisão: {motivo}.")
+        raise RevisaoPendente(motivo)
+
+    def perguntar(self, texto, titulo, chave=None):
+        decisao = self._decisao()
+        if chave == "pf":
+            return decisao["pf"]
+        if chave == "tipo_demanda":
+            tipo = decisao.get("tipo") or self.tipos.get((self.contexto or {}).get("tipo_demanda"))
+            if not tipo:
+                self._pendente(f"tipo de demanda '{(self.contexto or {}).get('tipo_demanda')}' sem mapeamento")
+            return tipo
+        self._pendente(f"pergunta sem resposta no manifesto: {chave or texto}")
+
+    def confirmar(self, texto, titulo, botoes=("OK", "Cancelar"), chave=None):
+        # definir_contexto já garantiu que a demanda está aprovada
+        return botoes[0]
+
+
+def resumir_pendentes(caminho="pendentes_revisao.jsonl"):
+    """Última pendência registrada de cada demanda, na ordem em que apareceram."""
+    pendentes = {}
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    registro = json.loads(linha)
+                    pendentes[registro["numero_demanda"]] = registro
+    except OSError:
+        return []
+    return list(pendentes.values())
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida um manifesto de decisões e lista as demandas pendentes de revisão.")
+    parser.add_argument("manifesto", nargs="?", help="Manifesto CSV ou JSON a validar.")
+    parser.add_argument("--pendentes", default="pendentes_revisao.jsonl")
+    args = parser.parse_args()
+
+    if args.manifesto:
+        decisoes, _ = carregar_manifesto(args.manifesto)
+        prontas = sum(1 for d in decisoes.values() if d["aprovado"] and d["pf"] is not None)
+        print(f"{prontas}/{len(decisoes)} demandas prontas para execução sem intervenção.")
+    for registro in resumir_pendentes(args.pendentes):
+        print(f"{registro['numero_demanda']}\t{registro['motivo']}")
@@ -0,0 +1,219 @@
+import argparse
+import csv
+import functools
+import glob
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+CAMPOS_CSV = ["tipo", "nome", "inicio", "duracao", "comandos", "retentativas", "sucesso"]
+
+# ==============================================================================
+# INSTRUMENTAÇÃO DE UMA EXECUÇÃO
+# ==============================================================================
+class Instrumentacao:
+    """Mede tempo, comandos WebDriver e retentativas de cada etapa e de cada ação da automação."""
+
+    def __init__(self, driver=None):
+        self.comandos = 0
+        self.registros = []
+        self.execucao = None
+        self.anexos = {}
+        self._abertos = []
+        self._inicio_execucao = time.perf_counter()
+        if driver is not None:
+            self.contar_comandos(driver)
+
+    def contar_comandos(self, driver):
+        """Envolve driver.execute, por onde passam todos os comandos WebDriver, para contá-los."""
+        if getattr(driver, "_instrumentacao", None) is self:
+            return
+        execute_original = driver.execute
+
+        def execute(comando, parametros=None):
+            self.comandos += 1
+            return execute_original(comando, parametros)
+
+        driver.execute = execute
+        driver._instrumentacao = self
+
+    def nova_execucao(self, identificador):
+        self.execucao = identificador
+        self.registros = []
+        self.anexos = {}
+        self._abertos = []
+        self._inicio_execucao = time.perf_counter()
+
+    @contextmanager
+    def medir(self, tipo, nome):
+        registro = {"tipo": tipo, "nome": nome, "inicio": round(time.perf_counter() - self._inicio_execucao, 3),
+                    "retentativas": 0, "sucesso": True}
+        comandos_inicio = self.comandos
+        inicio = time.perf_counter()
+        self._abertos.append(registro)
+        try:
+            yield registro
+        except BaseException:
+            registro["sucesso"] = False
+            raise
+        finally:
+            self._abertos.pop()
+            registro["duracao"] = round(time.perf_counter() - inicio, 4)
+            registro["comandos"] = self.comandos - comandos_inicio
+            self.registros.append(registro)
+
+    @contextmanager
+    def etapa(self, numero, descricao, total=12):
+        print(f"✅ [{numero}/{total}] {descricao}")
+        with self.medir("etapa", f"{numero:02d} {descricao}") as registro:
+            yield registro
+        logging.info(f"⏱️ Etapa {numero}/{total} em {registro['duracao']:.2f}s ({registro['comandos']} comandos).")
+
+    def acao(self, nome):
+        return self.medir("acao", nome)
+
+    def registrar_retentativa(self):
+        for registro in self._abertos:
+            registro["retentativas"] += 1
+
+    def anexar(self, chave, valor):
+        """Inclui no relatório da execução dados de outros módulos (ex.: contadores de retentativas)."""
+        self.anexos[chave] = valor
+
+    # ---------------- relatório ----------------
+    def relatorio(self):
+        return dict(
+            {
+                "execucao": self.execucao,
+                "data": datetime.now().isoformat(timespec="seconds"),
+                "duracao": round(time.perf_counter() - self._inicio_execucao, 3),
+                "comandos": sum(r["comandos"] for r in self.registros if r["tipo"] == "etapa"),
+                "registros": sorted(self.registros, key=lambda r: (r["inicio"], r["tipo"] != "etapa")),
+            },
+            **self.anexos,
+        )
+
+    def salvar_relatorio(self, caminho):
+        """Grava o relatório da execução em JSON ou CSV, conforme a extensão do arquivo."""
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        relatorio = self.relatorio()
+        if caminho.endswith(".csv"):
+            with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+                escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_CSV, extrasaction="ignore")
+                escritor.writeheader()
+                escritor.writerows(relatorio["registros"])
+        else:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        logging.info(f"📝 Relatório de execução gravado em {caminho}")
+        return caminho
+
+
+def instrumentado(metodo):
+    """Decorador para métodos da classe automation: mede a chamada como uma ação."""
+    @functools.wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        instrumentacao = getattr(self, "instrumentacao", None)
+        if instrumentacao is None:
+            return metodo(self, *args, **kwargs)
+        # O primeiro argumento identifica o alvo (localizador, placeholder, índice); textos longos ficam de fora
+        alvo = args[0] if args else None
+        if isinstance(alvo, (str, int)) and len(str(alvo)) <= 60:
+            nome = f"{metodo.__name__}({alvo})"
+        else:
+            nome = metodo.__name__
+        # Os métodos da automação levantam FalhaAcao quando falham: medir marca sucesso=False
+        # na exceção, e retornar (mesmo None ou um texto vazio) conta como sucesso
+        with instrumentacao.acao(nome):
+            return metodo(self, *args, **kwargs)
+    return envolvido
+
+
+# ==============================================================================
+# RESUMO DE VÁRIAS EXECUÇÕES
+# ==============================================================================
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def resumir_relatorios(relatorios):
+    """Agrupa as medições por (tipo, nome) e calcula p50/p95 de duração e comandos."""
+    grupos = {}
+    for relatorio in relatorios:
+        for registro in relatorio["registros"]:
+            grupos.setdefault((registro["tipo"], registro["nome"]), []).append(registro)
+        grupos.setdefault(("execucao", "total"), []).append(
+            {"duracao": relatorio["duracao"], "comandos": relatorio["comandos"], "retentativas": 0}
+        )
+
+    resumo = []
+    for (tipo, nome), registros in sorted(grupos.items()):
+        duracoes = [r["duracao"] for r in registros]
+        comandos = [r["comandos"] for r in registros]
+        resumo.append({
+            "tipo": tipo,
+            "nome": nome,
+            "amostras": len(registros),
+            "p50": round(percentil(duracoes, 50), 4),
+            "p95": round(percentil(duracoes, 95), 4),
+            "comandos_p50": percentil(comandos, 50),
+            "retentativas": sum(r["retentativas"] for r in registros),
+        })
+    return resumo
+
+
+def resumir_retentativas(relatorios):
+    """Soma, por classe de falha, as retentativas e o tempo perdido com elas em várias execuções."""
+    por_classe = {}
+    for relatorio in relatorios:
+        for classe, contador in (relatorio.get("retentativas") or {}).get("por_classe", {}).items():
+            total = por_classe.setdefault(classe, {"retentativas": 0, "tempo_perdido": 0.0})
+            total["retentativas"] += contador["retentativas"]
+            total["tempo_perdido"] += contador["tempo_perdido"]
+    return por_classe
+
+
+def carregar_relatorios(padroes):
+    relatorios = []
+    for padrao in padroes:
+        for caminho in sorted(glob.glob(padrao)):
+            with open(caminho, encoding="utf-8") as arquivo:
+                relatorios.append(json.load(arquivo))
+    return relatorios
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume p50/p95 de vários relatórios de execução.")
+    parser.add_argument("relatorios", nargs="+", help="Arquivos ou padrões glob dos relatórios JSON.")
+    parser.add_argument("--csv", help="Grava o resumo também em CSV.")
+    args = parser.parse_args()
+
+    relatorios = carregar_relatorios(args.relatorios)
+    resumo = resumir_relatorios(relatorios)
+    print(f"{len(relatorios)} execuções")
+    print(f"{'tipo':<10}{'nome':<55}{'n':>5}{'p50 (s)':>10}{'p95 (s)':>10}{'cmds':>7}{'retent.':>9}")
+    for linha in resumo:
+        print(f"{linha['tipo']:<10}{linha['nome'][:54]:<55}{linha['amostras']:>5}{linha['p50']:>10.2f}"
+              f"{linha['p95']:>10.2f}{linha['comandos_p50']:>7.0f}{linha['retentativas']:>9}")
+    retentativas = resumir_retentativas(relatorios)
+    if retentativas:
+        print("\nTempo perdido em retentativas por classe de falha")
+        for classe, total in sorted(retentativas.items(), key=lambda item: -item[1]["tempo_perdido"]):
+            print(f"{classe:<25}{total['retentativas']:>6}{total['tempo_perdido']:>10.2f}s")
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=list(resumo[0].keys()) if resumo else ["tipo"])
+            escritor.writeheader()
+            escritor.writerows(resumo)
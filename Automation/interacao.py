@@ -0,0 +1,148 @@
+import json
+import logging
+import threading
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+# Respostas usadas contra o simulador local (pool.py --simulador, bench_fluxo.py)
+RESPOSTAS_SIMULADOR = {
+    "confirmar_contagem": "OK",
+    "confirmar_finalizacao": "OK",
+    "tipo_demanda": "Manutenção Evolutiva",
+    "pf": "10",
+}
+
+TECLAS = {"ctrl": Keys.CONTROL, "shift": Keys.SHIFT, "alt": Keys.ALT, "enter": Keys.ENTER, "tab": Keys.TAB}
+
+
+class RespostaAusente(Exception):
+    """Uma pergunta não tem resposta pré-definida e não há ninguém para responder."""
+
+
+class OperacaoCancelada(Exception):
+    """O usuário cancelou uma confirmação; o progresso já gravado permite retomar depois."""
+
+
+# ==============================================================================
+# BACKENDS DE INTERAÇÃO COM O USUÁRIO
+# ==============================================================================
+# Toda pergunta tem uma `chave` estável ("pf", "tipo_demanda", "confirmar_contagem"...)
+# para que respostas possam ser fornecidas por arquivo, sem depender do texto exibido.
+class Interacao:
+    """Interface comum: perguntar, confirmar, alertar e enviar atalhos de teclado ao navegador."""
+
+    def definir_contexto(self, dados):
+        """Recebe os dados extraídos do ALM da demanda em andamento; backends com decisões prévias os usam."""
+
+    def perguntar(self, texto, titulo, chave=None):
+        raise NotImplementedError
+
+    def confirmar(self, texto, titulo, botoes=("OK", "Cancelar"), chave=None):
+        raise NotImplementedError
+
+    def alertar(self, texto, titulo):
+        logging.info(f"[{titulo}] {texto}")
+
+    def atalho(self, driver, *teclas):
+        """Pressiona a combinação de teclas no elemento focado, pelo próprio WebDriver."""
+        acoes = ActionChains(driver)
+        modificadores = [TECLAS.get(t, t) for t in teclas[:-1]]
+        for tecla in modificadores:
+            acoes.key_down(tecla)
+        acoes.send_keys(TECLAS.get(teclas[-1], teclas[-1]))
+        for tecla in reversed(modificadores):
+            acoes.key_up(tecla)
+        acoes.perform()
+
+
+class InteracaoGUI(Interacao):
+    """Caixas de diálogo do pyautogui. Uma trava garante um diálogo por vez quando há vários workers."""
+
+    def __init__(self):
+        self._pg = None
+        self._trava = threading.Lock()
+
+    @property
+    def pg(self):
+        # Importado só no primeiro uso: o pyautogui exige um display mesmo para ser importado
+        if self._pg is None:
+            import pyautogui
+
+            self._pg = pyautogui
+        return self._pg
+
+    def perguntar(self, texto, titulo, chave=None):
+        with self._trava:
+            return self.pg.prompt(text=texto, title=titulo)
+
+    def confirmar(self, texto, titulo, botoes=("OK", "Cancelar"), chave=None):
+        with self._trava:
+            return self.pg.confirm(texto, titulo, list(botoes))
+
+    def alertar(self, texto, titulo):
+        with self._trava:
+            return self.pg.alert(texto, titulo)
+
+    def atalho(self, driver, *teclas):
+        with self._trava:
+            return self.pg.hotkey(*teclas)
+
+
+class InteracaoCLI(Interacao):
+    """Perguntas no terminal, para execuções sem interface gráfica."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+
+    def perguntar(self, texto, titulo, chave=None):
+        # None (resposta vazia ou stdin fechado) equivale ao Cancelar da caixa de diálogo
+        with self._trava:
+            try:
+                return input(f"[{titulo}] {texto} ").strip() or None
+            except EOFError:
+                return None
+
+    def confirmar(self, texto, titulo, botoes=("OK", "Cancelar"), chave=None):
+        # Sem resposta reconhecida retorna None: nunca confirma por omissão
+        resposta = self.perguntar(f"{texto} ({'/'.join(botoes)})", titulo, chave)
+        for botao in botoes:
+            if resposta and resposta.lower() == botao.lower():
+                return botao
+        return None
+
+
+class InteracaoArquivo(Interacao):
+    """Respostas pré-definidas em um arquivo JSON {chave: resposta}. Sem resposta, a execução falha."""
+
+    def __init__(self, caminho=None, respostas=None):
+        self.respostas = dict(respostas or {})
+        if caminho:
+            with open(caminho, encoding="utf-8") as arquivo:
+                self.respostas.update(json.load(arquivo))
+
+    def _resposta(self, chave, texto):
+        if chave not in self.respostas:
+            raise RespostaAusente(f"Sem resposta pré-definida para '{chave}' ({texto})")
+        logging.info(f"🤖 Resposta automática para '{chave}': {self.respostas[chave]}")
+        return str(self.respostas[chave])
+
+    def perguntar(self, texto, titulo, chave=None):
+        return self._resposta(chave, texto)
+
+    def confirmar(self, texto, titulo, botoes=("OK", "Cancelar"), chave=None):
+        return self._resposta(chave, texto)
+
+
+def criar_interacao(tipo="gui", arquivo_respostas=None):
+    if tipo == "manifesto":
+        from decisoes import InteracaoDecisoes
+
+        return InteracaoDecisoes(arquivo_respostas)
+    if tipo == "cli":
+        return InteracaoCLI()
+    if tipo == "arquivo":
+        return InteracaoArquivo(arquivo_respostas)
+    if tipo == "simulador":
+        return InteracaoArquivo(respostas=RESPOSTAS_SIMULADOR)
+    return InteracaoGUI()
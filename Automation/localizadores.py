@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import threading
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+ARQUIVO_LOCALIZADORES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "localizadores.json")
+ARQUIVO_ESTRATEGIAS = os.environ.get(
+    "AUTOMACAO_CACHE_ESTRATEGIAS",
+    os.path.join(os.path.expanduser("~"), ".cache", "automation-serpro", "estrategias.json"),
+)
+
+# ==============================================================================
+# REGISTRO COMPILADO DE LOCALIZADORES
+# ==============================================================================
+class Localizador:
+    """Um campo da página com suas estratégias de busca, da preferida para a de reserva."""
+
+    def __init__(self, nome, estrategias, indice=0):
+        self.nome = nome
+        self.estrategias = [tuple(estrategia) for estrategia in estrategias]
+        self.indice = indice
+
+    @property
+    def principal(self):
+        return self.estrategias[0]
+
+
+def carregar_registro(caminho=ARQUIVO_LOCALIZADORES):
+    with open(caminho, encoding="utf-8") as arquivo:
+        dados = json.load(arquivo)
+    return {
+        nome: Localizador(nome, definicao["estrategias"], definicao.get("indice", 0))
+        for nome, definicao in dados.items()
+    }
+
+
+# Carregados uma única vez, na importação do módulo
+REGISTRO = carregar_registro()
+LOCATORS = {nome: localizador.principal for nome, localizador in REGISTRO.items() if localizador.principal[0] != "js"}
+
+
+# ==============================================================================
+# MEMÓRIA DA ESTRATÉGIA QUE FUNCIONOU POR HOST
+# ==============================================================================
+class MemoriaEstrategias:
+    """Lembra, por host e por campo, qual estratégia encontrou o elemento da última vez."""
+
+    def __init__(self, caminho=ARQUIVO_ESTRATEGIAS):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        try:
+            with open(caminho, encoding="utf-8") as arquivo:
+                self._dados = json.load(arquivo)
+        except (OSError, ValueError):
+            self._dados = {}
+
+    def ordenar(self, host, localizador):
+        """Estratégias do campo com a última que funcionou neste host em primeiro lugar."""
+        ultima = self._dados.get(host, {}).get(localizador.nome)
+        estrategias = list(localizador.estrategias)
+        for posicao, estrategia in enumerate(estrategias):
+            if list(estrategia) == ultima:
+                estrategias.insert(0, estrategias.pop(posicao))
+                break
+        return estrategias
+
+    def registrar(self, host, nome, estrategia):
+        with self._trava:
+            if self._dados.get(host, {}).get(nome) == list(estrategia):
+                return
+            self._dados.setdefault(host, {})[nome] = list(estrategia)
+            try:
+                os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+                with open(self.caminho, "w", encoding="utf-8") as arquivo:
+                    json.dump(self._dados, arquivo, ensure_ascii=False, indent=2)
+            except OSError as e:
+                logging.warning(f"⚠️ Não foi possível gravar a memória de localizadores: {e}")
+
+
+MEMORIA = MemoriaEstrategias()
+
+
+def host_da_url(url):
+    return urlparse(url).hostname or ""
+
+
+def buscar_elementos(driver, estrategia):
+    """Executa uma estratégia de busca e retorna a lista de elementos encontrados."""
+    tipo, valor = estrategia
+    if tipo == "js":
+        resultado = driver.execute_script(valor)
+        if not resultado:
+            return []
+        return list(resultado) if isinstance(resultado, (list, tuple)) else [resultado]
+    return driver.find_elements(tipo, valor)
+
+
+def condicao_localizador(localizador, host, clicavel=False, memoria=MEMORIA):
+    """Condição de WebDriverWait que testa as estratégias na ordem aprendida e memoriza a que funcionar.
+
+    Retorna a lista de elementos encontrados; com `clicavel=True`, exige que o primeiro
+    esteja visível e habilitado, como EC.element_to_be_clickable.
+    """
+    estrategias = memoria.ordenar(host, localizador)
+
+    def condicao(driver):
+        for estrategia in estrategias:
+            elementos = buscar_elementos(driver, estrategia)
+            if not elementos:
+                continue
+            try:
+                if clicavel and not (elementos[0].is_displayed() and elementos[0].is_enabled()):
+                    continue
+            except StaleElementReferenceException:
+                continue
+            memoria.registrar(host, localizador.nome, estrategia)
+            return elementos
+        return False
+
+    return condicao
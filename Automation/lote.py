@@ -0,0 +1,160 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+
+import automation as modulo_automacao
+from automation import (
+    ALM_URL_BASE,
+    automation,
+    iniciar_navegador_com_perfil_usuario,
+    processar_demanda,
+)
+from armazem import ARQUIVO_BANCO, ArmazemDemandas, chave_do_item
+from decisoes import InteracaoDecisoes, RevisaoPendente
+from interacao import OperacaoCancelada, criar_interacao
+from regras import REGRAS
+
+# ==============================================================================
+# LEITURA DA FILA DE DEMANDAS
+# ==============================================================================
+def normalizar_item(item):
+    """Converte um ID de work item ou link do ALM em URL completa."""
+    item = item.strip()
+    if item.isdigit():
+        return ALM_URL_BASE + item
+    if not (item.startswith("http://") or item.startswith("https://")):
+        item = "https://" + item
+    return item
+
+
+def ler_itens(origem=None):
+    """Lê os itens do lote de um arquivo (um por linha) ou da entrada padrão quando `origem` é None ou '-'."""
+    if origem in (None, "-"):
+        linhas = sys.stdin.read().splitlines()
+    else:
+        with open(origem, encoding="utf-8") as arquivo:
+            linhas = arquivo.read().splitlines()
+    return [normalizar_item(linha) for linha in linhas if linha.strip() and not linha.strip().startswith("#")]
+
+
+# ==============================================================================
+# EXECUÇÃO EM LOTE
+# ==============================================================================
+def executar_lote(itens, arquivo_resultados="resultados_lote.jsonl", armazem=None, **opcoes_navegador):
+    """Processa todos os itens em uma única sessão do navegador e uma única aba do Pontua.
+
+    Cada item gera uma linha JSON em `arquivo_resultados` assim que termina, com sucesso
+    ou falha. Com um `armazem`, itens já concluídos em execuções anteriores são pulados
+    sem abrir o ALM. Retorna a lista de registros.
+    """
+    if armazem:
+        concluidos = [item for item in itens if armazem.concluida(chave_do_item(item))]
+        if concluidos:
+            logging.info(f"🗃️ {len(concluidos)} itens já concluídos no banco local serão pulados.")
+        itens = [item for item in itens if item not in concluidos]
+    if not itens:
+        logging.warning("Nenhum item para processar.")
+        return []
+
+    navegador = iniciar_navegador_com_perfil_usuario(itens[0], **opcoes_navegador)
+    if not navegador:
+        return []
+
+    resultados = []
+    aba_pontua = None
+    inicio_lote = time.perf_counter()
+    try:
+        automacao = automation(navegador)
+        with open(arquivo_resultados, "a", encoding="utf-8") as saida:
+            for posicao, link_alm in enumerate(itens, start=1):
+                logging.info(f"📦 [{posicao}/{len(itens)}] Processando {link_alm}")
+                registro = {
+                    "item": link_alm,
+                    "inicio": datetime.now().isoformat(timespec="seconds"),
+                    "sucesso": False,
+                }
+                inicio_item = time.perf_counter()
+                try:
+                    # O primeiro item já foi carregado ao iniciar o navegador
+                    dados, aba_pontua = processar_demanda(
+                        navegador, automacao, link_alm if posicao > 1 else None, aba_pontua, armazem, item=link_alm
+                    )
+                    registro.update(
+                        sucesso=True,
+                        numero_demanda=dados["numeroDemanda"],
+                        link_pontua=dados["link_pontua"],
+                        pf=dados["pf"],
+                        tempos=dados["tempos"],
+                        retentativas=dados["retentativas"]["por_classe"],
+                    )
+                except RevisaoPendente as e:
+                    registro.update(pendente_revisao=True, erro=str(e))
+                except OperacaoCancelada as e:
+                    # Cancelar uma confirmação interrompe o lote; o banco local permite retomar
+                    registro["erro"] = str(e)
+                    registro["duracao"] = round(time.perf_counter() - inicio_item, 3)
+                    resultados.append(registro)
+                    saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                    break
+                except Exception as e:
+                    logging.error(f"❌ Falha ao processar {link_alm}: {e}")
+                    registro["erro"] = str(e)
+                registro["duracao"] = round(time.perf_counter() - inicio_item, 3)
+
+                resultados.append(registro)
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                saida.flush()
+    finally:
+        logging.info("Fechando o navegador.")
+        navegador.quit()
+
+    resumir_lote(resultados, time.perf_counter() - inicio_lote)
+    return resultados
+
+
+def resumir_lote(resultados, duracao):
+    sucessos = sum(1 for r in resultados if r["sucesso"])
+    pendentes = sum(1 for r in resultados if r.get("pendente_revisao"))
+    por_hora = sucessos / duracao * 3600 if duracao > 0 else 0.0
+    logging.info(
+        f"📊 Lote finalizado: {sucessos}/{len(resultados)} demandas com sucesso em {duracao:.1f}s "
+        f"({por_hora:.1f} demandas/hora)."
+    )
+    if pendentes:
+        logging.info(f"📝 {pendentes} demandas aguardando revisão humana.")
+    regras = REGRAS.resumo()
+    if regras["total_sem_regra"]:
+        logging.info(f"📐 {regras['total_sem_regra']} valores do ALM sem regra, escolhidos manualmente: {regras['sem_regra']}.")
+    return por_hora
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Processa uma fila de demandas do ALM em uma única sessão do navegador.")
+    parser.add_argument("origem", nargs="?", default="-", help="Arquivo com links ou IDs do ALM, um por linha ('-' para stdin).")
+    parser.add_argument("-o", "--saida", default="resultados_lote.jsonl", help="Arquivo JSONL de resultados.")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--banco", default=ARQUIVO_BANCO, help="Banco SQLite com as demandas já extraídas ('' desativa).")
+    parser.add_argument("--sem-gpu", action="store_true", help="Desativa GPU e /dev/shm (servidores e containers).")
+    parser.add_argument("--viewport", default=modulo_automacao.VIEWPORT_PADRAO,
+                        help="Tamanho da janela no modo headless (largura,altura).")
+    parser.add_argument("--interacao", choices=["gui", "cli", "arquivo"], default=None,
+                        help="Como responder perguntas e confirmações (padrão: AUTOMACAO_INTERACAO ou gui).")
+    parser.add_argument("--respostas", default=None, help="Arquivo JSON {chave: resposta} para as perguntas da automação.")
+    parser.add_argument("--manifesto", default=None,
+                        help="Manifesto CSV/JSON de demandas aprovadas com PF e tipo; as demais vão para revisão.")
+    parser.add_argument("--pendentes", default="pendentes_revisao.jsonl", help="Fila de demandas para revisão humana.")
+    args = parser.parse_args()
+
+    if args.manifesto:
+        modulo_automacao.interacao = InteracaoDecisoes(args.manifesto, args.pendentes)
+    elif args.interacao:
+        modulo_automacao.interacao = criar_interacao(args.interacao, args.respostas)
+    elif args.respostas:
+        modulo_automacao.interacao = criar_interacao("arquivo", args.respostas)
+    armazem = ArmazemDemandas(args.banco) if args.banco else None
+    executar_lote(ler_itens(args.origem), args.saida, armazem,
+                  headless=args.headless, sem_gpu=args.sem_gpu, viewport=args.viewport)
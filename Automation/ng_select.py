@@ -0,0 +1,125 @@
+import logging
+import threading
+
+from selenium.common.exceptions import NoSuchElementException
+
+# Abre o ng-select, espera as opções, clica a opção exata e devolve o rótulo selecionado,
+# tudo em um único comando WebDriver. Só digita no campo de busca se a opção não estiver
+# entre as renderizadas (listas longas com rolagem virtual).
+SCRIPT_SELECIONAR = """
+const [placeholder, termo, exata, timeoutMs, concluir] = arguments;
+const normalizar = t => (t || '').trim().toLowerCase();
+const sel = Array.from(document.querySelectorAll('ng-select')).find(s => s.getAttribute('placeholder') === placeholder);
+if (!sel) { return concluir({erro: 'ng-select não encontrado'}); }
+const alvo = normalizar(exata || termo);
+const limite = Date.now() + timeoutMs;
+const rotulo = () => { const r = sel.querySelector('.ng-value-label'); return r ? r.textContent.trim() : ''; };
+const opcoes = () => {
+    // O painel pode estar dentro do ng-select ou anexado ao body (appendTo="body")
+    const painel = sel.querySelector('ng-dropdown-panel') || document.querySelector('ng-dropdown-panel');
+    return painel ? Array.from(painel.querySelectorAll('.ng-option:not(.ng-option-disabled)')) : [];
+};
+let lista = null, digitou = false;
+
+// O ng-select do Angular abre no mousedown; o simulador, no click
+(sel.querySelector('.ng-select-container') || sel).dispatchEvent(new MouseEvent('mousedown', {bubbles: true}));
+sel.click();
+
+function confirmar(escolhida) {
+    if (normalizar(rotulo()) === normalizar(escolhida) || Date.now() > limite) {
+        return concluir({opcoes: lista, escolhida: escolhida, rotulo: rotulo()});
+    }
+    setTimeout(() => confirmar(escolhida), 10);
+}
+
+function tentar() {
+    const atuais = opcoes();
+    const textos = atuais.map(o => o.textContent.trim());
+    if (atuais.length && !digitou) { lista = textos; }
+    let i = textos.findIndex(t => normalizar(t) === alvo);
+    if (i < 0 && !exata) { i = textos.findIndex(t => normalizar(t).includes(alvo)); }
+    if (i >= 0) {
+        atuais[i].scrollIntoView({block: 'nearest'});
+        atuais[i].click();
+        return confirmar(textos[i]);
+    }
+    if (atuais.length && !digitou) {
+        const entrada = sel.querySelector('input');
+        if (entrada) {
+            entrada.value = exata || termo;
+            entrada.dispatchEvent(new Event('input', {bubbles: true}));
+            digitou = true;
+        }
+    }
+    if (Date.now() > limite) { return concluir({opcoes: lista, erro: 'opção não encontrada'}); }
+    setTimeout(tentar, 25);
+}
+tentar();
+"""
+
+
+# ==============================================================================
+# CACHE DAS OPÇÕES DE CADA NG-SELECT
+# ==============================================================================
+class OpcoesNgSelect:
+    """Opções já vistas em cada ng-select do Pontua, por placeholder, compartilhadas entre instâncias.
+
+    Com a lista em cache, o texto pedido (ex.: '80728') vira o texto exato da opção
+    ('80728 - Sistema de Exemplo Java'), e a seleção não depende de filtro por substring.
+    """
+
+    def __init__(self):
+        self._opcoes = {}
+        self._trava = threading.Lock()
+
+    def opcoes(self, placeholder):
+        with self._trava:
+            return list(self._opcoes.get(placeholder, []))
+
+    def registrar(self, placeholder, opcoes):
+        if not opcoes:
+            return
+        with self._trava:
+            conhecidas = self._opcoes.setdefault(placeholder, [])
+            conhecidas.extend(o for o in opcoes if o not in conhecidas)
+
+    def resolver(self, placeholder, texto):
+        """Texto exato da opção em cache que corresponde a `texto`, ou None se ainda não houver."""
+        termo = (texto or "").strip().lower()
+        opcoes = self.opcoes(placeholder)
+        for opcao in opcoes:
+            if opcao.lower() == termo:
+                return opcao
+        parciais = [opcao for opcao in opcoes if termo in opcao.lower()]
+        return parciais[0] if len(parciais) == 1 else None
+
+    def limpar(self):
+        with self._trava:
+            self._opcoes.clear()
+
+
+OPCOES = OpcoesNgSelect()
+
+
+# ==============================================================================
+# SELEÇÃO DIRETA
+# ==============================================================================
+def selecionar_opcao(driver, placeholder, texto, timeout=10, cache=OPCOES):
+    """Seleciona a opção de `texto` no ng-select de `placeholder` com um único comando.
+
+    Retorna o rótulo selecionado se ele confere com a opção clicada, ou None quando a seleção
+    não foi confirmada (quem chama usa o caminho digitando). Opção ou ng-select inexistentes
+    levantam NoSuchElementException. `timeout` deve ficar abaixo do script timeout do driver (30s).
+    """
+    exata = cache.resolver(placeholder, texto)
+    resultado = driver.execute_async_script(SCRIPT_SELECIONAR, placeholder, texto, exata, int(timeout * 1000))
+    cache.registrar(placeholder, resultado.get("opcoes"))
+    if resultado.get("erro"):
+        disponiveis = ", ".join(resultado.get("opcoes") or [])
+        raise NoSuchElementException(f"'{texto}' em '{placeholder}': {resultado['erro']} (opções: {disponiveis or '-'})")
+    if resultado["rotulo"].strip().lower() != resultado["escolhida"].strip().lower():
+        logging.warning(
+            f"⚠️ '{placeholder}': clicou '{resultado['escolhida']}', mas o valor exibido é '{resultado['rotulo']}'."
+        )
+        return None
+    return resultado["rotulo"]
@@ -0,0 +1,176 @@
+import functools
+import os
+import re
+from datetime import date, datetime, timedelta, timezone
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+# Fuso em que o ALM exibe as datas; as APIs OSLC devolvem horários em UTC ("...T10:15:00.000Z")
+FUSO_ALM = os.environ.get("AUTOMACAO_FUSO", "America/Sao_Paulo")
+
+# ==============================================================================
+# TABELAS E PADRÕES PRÉ-COMPILADOS
+# ==============================================================================
+MESES = {
+    "jan": 1, "fev": 2, "feb": 2, "mar": 3, "abr": 4, "apr": 4, "mai": 5, "may": 5,
+    "jun": 6, "jul": 7, "ago": 8, "aug": 8, "set": 9, "sep": 9, "out": 10, "oct": 10,
+    "nov": 11, "dez": 12, "dec": 12,
+}
+MES_2_DIGITOS = [f"{mes:02d}" for mes in range(13)]
+
+# Formatos de data exibidos pelo ALM conforme idioma e versão; o primeiro que casar vence.
+# O formato da tela em pt-BR vem primeiro: é o de quase todos os registros.
+PADROES_DATA = [
+    # 12 de mar de 2024 10:15 / 12 de março de 2024
+    ("dia_mes_ano", re.compile(r"(?P<dia>\d{1,2})\s+de\s+(?P<mes>[a-zç]{3})[a-zç]*\.?\s+de\s+(?P<ano>\d{4})", re.I)),
+    # 12/03/2024 ou 12-03-2024
+    ("numerica", re.compile(r"(?P<dia>\d{1,2})[/-](?P<mes>\d{1,2})[/-](?P<ano>\d{4})")),
+    # 2024-03-12T13:15:00.000Z ou 2024-03-12T10:15:00-03:00 (API OSLC): convertido para o fuso do ALM.
+    # Precisa vir antes de "iso", que casaria com a mesma data sem converter o fuso.
+    ("iso_com_fuso", re.compile(
+        r"(?P<ano>\d{4})-(?P<mes>\d{1,2})-(?P<dia>\d{1,2})T(?P<hora>\d{1,2}):(?P<minuto>\d{2})"
+        r"(?::(?P<segundo>\d{2})(?:\.\d+)?)?\s*(?P<fuso>Z|[+-]\d{2}:?\d{2})"
+    )),
+    # 2024-03-12 ou 2024-03-12T10:15:00
+    ("iso", re.compile(r"(?P<ano>\d{4})-(?P<mes>\d{1,2})-(?P<dia>\d{1,2})")),
+    # Mar 12, 2024 10:15 AM
+    ("mes_dia_ano", re.compile(r"(?P<mes>[a-z]{3})[a-z]*\.?\s+(?P<dia>\d{1,2}),?\s+(?P<ano>\d{4})", re.I)),
+    # 12-mar-2024 / 12 mar 2024
+    ("dia_mes_abreviado", re.compile(r"(?P<dia>\d{1,2})[\s-](?P<mes>[a-zç]{3})[a-zç]*\.?[\s-](?P<ano>\d{4})", re.I)),
+]
+
+# Número do work item: último número do título, após prefixos como "Demanda Interna", "Work Item" ou "#"
+RE_NUMERO_TITULO = re.compile(r"(\d+)\s*(?::.*)?$")
+# Código da aplicação: grupo de 5 dígitos no fim do código de serviço ("Sistema X - 80728")
+RE_CODIGO_APLICACAO = re.compile(r"(\d{5})\D*$")
+
+
+class FormatoInvalido(ValueError):
+    """O texto extraído do ALM não está em nenhum dos formatos conhecidos."""
+
+
+def _fuso_alm():
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(FUSO_ALM)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass  # Windows sem o pacote tzdata
+    return timezone(timedelta(hours=-3), "BRT")  # sem horário de verão desde 2019
+
+
+FUSO_LOCAL = _fuso_alm()
+
+
+def _data_local(encontrado):
+    """Data no fuso do ALM de um horário com fuso explícito, como a tela exibiria."""
+    fuso = encontrado["fuso"]
+    if fuso == "Z":
+        deslocamento = timezone.utc
+    else:
+        sinal = -1 if fuso[0] == "-" else 1
+        horas, minutos = int(fuso[1:3]), int(fuso[-2:])
+        deslocamento = timezone(sinal * timedelta(hours=horas, minutes=minutos))
+    instante = datetime(
+        int(encontrado["ano"]), int(encontrado["mes"]), int(encontrado["dia"]),
+        int(encontrado["hora"]), int(encontrado["minuto"]), int(encontrado["segundo"] or 0), tzinfo=deslocamento,
+    )
+    return instante.astimezone(FUSO_LOCAL).strftime("%d/%m/%Y")
+
+
+def _formatar_data(dia, mes, ano):
+    """'dd/mm/aaaa', ou None para datas impossíveis como 31/02/2024, que os padrões sozinhos aceitariam."""
+    if not 1 <= mes <= 12:
+        return None
+    numero_dia = int(dia)
+    if not 1 <= numero_dia <= 28:  # até o dia 28 todo mês é válido; acima, depende do mês e do ano
+        try:
+            date(int(ano), mes, numero_dia)
+        except ValueError:
+            return None
+    return f"{dia.zfill(2)}/{MES_2_DIGITOS[mes]}/{ano}"
+
+
+# ==============================================================================
+# NORMALIZAÇÃO DE CAMPOS
+# ==============================================================================
+@functools.lru_cache(maxsize=4096)
+def normalizar_data(texto):
+    """Data do ALM em qualquer formato conhecido para 'dd/mm/aaaa'."""
+    texto = (texto or "").strip()
+    # Caminho rápido, sem regex, para o formato da tela em pt-BR ("12 de mar de 2024 10:15");
+    # dias acima de 28 seguem para os padrões, que conferem se a data existe
+    partes = texto.split(None, 5)
+    if len(partes) >= 5 and partes[1] == partes[3] == "de":
+        dia, mes, ano = partes[0], MESES.get(partes[2][:3].lower()), partes[4]
+        if mes and dia.isdigit() and 0 < int(dia) <= 28 and len(ano) == 4 and ano.isdigit():
+            return f"{dia.zfill(2)}/{MES_2_DIGITOS[mes]}/{ano}"
+    for _, padrao in PADROES_DATA:
+        encontrado = padrao.search(texto)
+        if not encontrado:
+            continue
+        if "fuso" in padrao.groupindex:
+            try:
+                return _data_local(encontrado)
+            except ValueError:
+                continue
+        mes = encontrado["mes"]
+        mes = int(mes) if mes.isdigit() else MESES.get(mes[:3].lower())
+        if not mes:
+            continue
+        data = _formatar_data(encontrado["dia"], mes, encontrado["ano"])
+        if data:
+            return data
+    raise FormatoInvalido(f"Data em formato desconhecido: {texto!r}")
+
+
+def numero_do_titulo(titulo):
+    """'Demanda Interna 1234', 'Work Item 1234: resumo' ou '#1234' -> '1234'."""
+    # Caso comum sem regex: o número é a última palavra de um título sem ':'
+    titulo = titulo or ""
+    if ":" not in titulo:
+        ultima = titulo.rpartition(" ")[2].lstrip("#")
+        if ultima.isdigit():
+            return ultima
+    encontrado = RE_NUMERO_TITULO.search(titulo.strip())
+    if not encontrado:
+        raise FormatoInvalido(f"Título sem número de demanda: {titulo!r}")
+    return encontrado.group(1)
+
+
+def codigo_aplicacao(codigo_servico):
+    """'Sistema de Exemplo - 80728' -> '80728'."""
+    final = (codigo_servico or "")[-5:]
+    if final.isdigit():
+        return final
+    encontrado = RE_CODIGO_APLICACAO.search(codigo_servico or "")
+    if not encontrado:
+        raise FormatoInvalido(f"Código de serviço sem código de aplicação: {codigo_servico!r}")
+    return encontrado.group(1)
+
+
+def normalizar_registro(textos):
+    """Acrescenta aos textos extraídos do ALM os campos derivados usados no Pontua."""
+    return dict(
+        textos,
+        numeroDemanda=numero_do_titulo(textos.get("numero_demanda")),
+        data_formatada=normalizar_data(textos.get("data_criacao")),
+        codigo_aplicacao=codigo_aplicacao(textos.get("codigo_servico")),
+    )
+
+
+def normalizar_lote(registros):
+    """Normaliza vários registros de uma vez. Retorna (normalizados, erros por posição).
+
+    Datas repetidas no lote (comuns em demandas abertas no mesmo dia) saem do cache de normalizar_data.
+    """
+    normalizados, erros = [], {}
+    for posicao, textos in enumerate(registros):
+        try:
+            normalizados.append(normalizar_registro(textos))
+        except FormatoInvalido as e:
+            normalizados.append(None)
+            erros[posicao] = str(e)
+    return normalizados, erros
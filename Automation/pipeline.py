@@ -0,0 +1,238 @@
+import argparse
+import logging
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+import automation as modulo_automacao
+from automation import (
+    atualizar_alm,
+    automation,
+    diretorio_perfil_edge,
+    extrair_dados_alm,
+    iniciar_navegador_com_perfil_usuario,
+    link_pontua_registrado,
+    registrar_ou_continuar,
+)
+from armazem import (
+    ARQUIVO_BANCO,
+    CAMPOS_ALM,
+    CONCLUIDO,
+    EXTRAIDO,
+    PENDENTE,
+    REGISTRADO,
+    ArmazemDemandas,
+    chave_do_item,
+)
+from decisoes import InteracaoDecisoes, RevisaoPendente
+from lote import ler_itens
+from pool import preparar_perfil
+from regras import REGRAS
+
+FIM = None  # sentinela que encerra a fase seguinte
+
+# ==============================================================================
+# FASES
+# ==============================================================================
+class Fase(threading.Thread):
+    """Consome chaves de `entrada`, processa cada item com seu próprio navegador e publica em `saida`."""
+
+    nome_fase = ""
+    url_inicial = ""
+
+    def __init__(self, armazem, entrada, saida, perfil, opcoes_navegador):
+        super().__init__(name=self.nome_fase)
+        self.armazem = armazem
+        self.entrada = entrada
+        self.saida = saida
+        self.perfil = perfil
+        self.opcoes_navegador = opcoes_navegador
+        self.navegador = None
+        self.automacao = None
+
+    def run(self):
+        try:
+            while True:
+                chave = self.entrada.get()
+                if chave is FIM:
+                    break
+                registro = self.armazem.carregar(chave)
+                inicio = time.perf_counter()
+                try:
+                    if self.navegador is None:
+                        self.navegador = iniciar_navegador_com_perfil_usuario(
+                            self.url_inicial, user_data_dir=self.perfil, **self.opcoes_navegador
+                        )
+                        if not self.navegador:
+                            raise RuntimeError("não foi possível iniciar o navegador")
+                        self.automacao = automation(self.navegador)
+                    self.automacao.instrumentacao.nova_execucao(f"{self.nome_fase}:{chave}")
+                    campos = self.processar(registro)
+                    campos["tempos"] = dict(registro.get("tempos", {}))
+                    campos["tempos"][self.nome_fase] = round(time.perf_counter() - inicio, 3)
+                    self.armazem.atualizar(chave, erro=None, **campos)
+                    if self.saida is not None:
+                        self.saida.put(chave)
+                except RevisaoPendente as e:
+                    # Quem já está no Pontua continua registrado, para não ser criado de novo ao retomar
+                    estado = registro.get("estado") if registro.get("estado") in (REGISTRADO, CONCLUIDO) else PENDENTE
+                    self.armazem.atualizar(chave, estado=estado, erro=str(e))
+                except Exception as e:
+                    logging.error(f"❌ [{self.nome_fase}] Falha no item {chave}: {e}")
+                    self.armazem.atualizar(chave, erro=f"{self.nome_fase}: {e}")
+        finally:
+            if self.saida is not None:
+                self.saida.put(FIM)
+            if self.navegador:
+                self.navegador.quit()
+
+    def processar(self, registro):
+        raise NotImplementedError
+
+    def checkpoint(self, chave):
+        return lambda etapa, **saidas: self.armazem.registrar_etapa(chave, etapa, **saidas)
+
+
+class FaseExtracao(Fase):
+    """Fase 1: lê os campos do work item no ALM."""
+
+    nome_fase = "alm_extracao"
+
+    def processar(self, registro):
+        conhecidos = self.armazem.campos_validos(registro["chave"])
+        if len(conhecidos) < len(CAMPOS_ALM):
+            self.navegador.get(registro["item"])
+        dados = extrair_dados_alm(self.navegador, self.automacao, conhecidos, registro["chave"])
+        self.armazem.registrar_extracao(
+            registro["chave"], registro["item"], dados, [campo for campo in CAMPOS_ALM if campo not in conhecidos]
+        )
+        # Demandas sem decisão no manifesto param aqui, antes de chegar ao Pontua
+        modulo_automacao.interacao.definir_contexto(dados)
+        return {"estado": EXTRAIDO}
+
+
+class FasePontua(Fase):
+    """Fase 2: cria a demanda e a contagem no Pontua, sempre na mesma aba."""
+
+    nome_fase = "pontua"
+
+    def processar(self, registro):
+        modulo_automacao.interacao.definir_contexto(registro["dados"])
+        link_pontua = link_pontua_registrado(registro)
+        if not link_pontua:
+            link_pontua, _ = registrar_ou_continuar(
+                self.navegador, self.automacao, registro["dados"], registro.get("etapas") or {},
+                self.navegador.current_window_handle, self.checkpoint(registro["chave"]),
+            )
+        return {"estado": REGISTRADO, "link_pontua": link_pontua}
+
+
+class FaseAtualizacao(Fase):
+    """Fase 3: grava comentário, link do Pontua e tamanho em PF de volta no ALM."""
+
+    nome_fase = "alm_atualizacao"
+
+    def processar(self, registro):
+        modulo_automacao.interacao.definir_contexto(registro["dados"])
+        self.navegador.get(registro["item"])
+        pf = atualizar_alm(
+            self.navegador, self.automacao, registro["dados"], registro["link_pontua"], self.navegador.current_window_handle,
+            (registro["etapas"].get("10") or {}).get("pf"), self.checkpoint(registro["chave"]), registro["chave"],
+            (registro["etapas"].get("11") or {}).get("operacoes") or (),
+        )
+        return {"estado": CONCLUIDO, "pf": pf}
+
+
+# ==============================================================================
+# ORQUESTRAÇÃO
+# ==============================================================================
+def executar_pipeline(itens, armazem, headless=False, sem_gpu=False, perfil_base=None):
+    """Executa as três fases em paralelo, encadeadas por filas.
+
+    O estado de cada item fica no `armazem` (armazem.ArmazemDemandas); ao executar de novo,
+    cada item retoma da fase em que parou e itens já concluídos são ignorados.
+    """
+    fila_extracao, fila_pontua, fila_atualizacao = queue.Queue(), queue.Queue(), queue.Queue()
+
+    # Itens retomados entram direto na fila da fase em que pararam
+    retomados = {EXTRAIDO: 0, REGISTRADO: 0, CONCLUIDO: 0}
+    for link_alm in itens:
+        chave = chave_do_item(link_alm)
+        estado = (armazem.carregar(chave) or {}).get("estado")
+        if estado == CONCLUIDO:
+            retomados[CONCLUIDO] += 1
+        elif estado == REGISTRADO:
+            fila_atualizacao.put(chave)
+            retomados[REGISTRADO] += 1
+        elif estado == EXTRAIDO:
+            fila_pontua.put(chave)
+            retomados[EXTRAIDO] += 1
+        else:
+            armazem.atualizar(chave, item=link_alm)
+            fila_extracao.put(chave)
+    fila_extracao.put(FIM)
+    logging.info(
+        f"🔁 Retomando: {retomados[EXTRAIDO]} extraídos, {retomados[REGISTRADO]} registrados no Pontua, "
+        f"{retomados[CONCLUIDO]} já concluídos; {fila_extracao.qsize() - 1} a extrair."
+    )
+
+    opcoes_navegador = {"headless": headless, "sem_gpu": sem_gpu}
+    url_alm = modulo_automacao.ALM_URL_BASE.split("#", 1)[0]
+    pasta_perfis = tempfile.mkdtemp(prefix="automacao-pipeline-")
+    inicio = time.perf_counter()
+    try:
+        fases = [
+            FaseExtracao(armazem, fila_extracao, fila_pontua, preparar_perfil(0, perfil_base, pasta_perfis), opcoes_navegador),
+            FasePontua(armazem, fila_pontua, fila_atualizacao, preparar_perfil(1, perfil_base, pasta_perfis), opcoes_navegador),
+            FaseAtualizacao(armazem, fila_atualizacao, None, preparar_perfil(2, perfil_base, pasta_perfis), opcoes_navegador),
+        ]
+        fases[0].url_inicial = fases[2].url_inicial = url_alm
+        fases[1].url_inicial = modulo_automacao.PONTUA_URL
+        for fase in fases:
+            fase.start()
+        for fase in fases:
+            fase.join()
+    finally:
+        shutil.rmtree(pasta_perfis, ignore_errors=True)
+
+    registros = [armazem.carregar(chave_do_item(link_alm)) or {} for link_alm in itens]
+    resumir_pipeline(registros, time.perf_counter() - inicio)
+    return registros
+
+
+def resumir_pipeline(registros, duracao):
+    contagem = {}
+    for registro in registros:
+        estado = registro.get("estado") or "nao_extraido"
+        contagem[estado] = contagem.get(estado, 0) + 1
+    concluidos = contagem.get(CONCLUIDO, 0)
+    por_hora = concluidos / duracao * 3600 if duracao > 0 else 0.0
+    detalhes = ", ".join(f"{estado}: {total}" for estado, total in sorted(contagem.items()))
+    logging.info(f"📊 Pipeline finalizado em {duracao:.1f}s ({por_hora:.1f} demandas/hora) — {detalhes}.")
+    regras = REGRAS.resumo()
+    if regras["total_sem_regra"]:
+        logging.info(f"📐 {regras['total_sem_regra']} valores do ALM sem regra, escolhidos manualmente: {regras['sem_regra']}.")
+    return contagem
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Processa demandas em três fases paralelas: extração no ALM, registro no Pontua e atualização do ALM."
+    )
+    parser.add_argument("origem", nargs="?", default="-", help="Arquivo com links ou IDs do ALM ('-' para stdin).")
+    parser.add_argument("--banco", default=ARQUIVO_BANCO, help="Banco SQLite com o estado de cada item (permite retomar).")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--sem-gpu", action="store_true", help="Desativa GPU e /dev/shm (servidores e containers).")
+    parser.add_argument("--perfil-base", default=None, help="Perfil do Edge copiado para o navegador de cada fase.")
+    parser.add_argument("--manifesto", default=None, help="Manifesto CSV/JSON de decisões (ver decisoes.py).")
+    parser.add_argument("--pendentes", default="pendentes_revisao.jsonl")
+    args = parser.parse_args()
+
+    if args.manifesto:
+        modulo_automacao.interacao = InteracaoDecisoes(args.manifesto, args.pendentes)
+    executar_pipeline(
+        ler_itens(args.origem), ArmazemDemandas(args.banco), args.headless, args.sem_gpu, args.perfil_base or diretorio_perfil_edge()
+    )
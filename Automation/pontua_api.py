@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+from urllib.parse import urljoin
+
+from cliente_http import ClienteSessao, ErroApi, sessao_do_navegador
+
+ARQUIVO_CONFIGURACAO = os.environ.get(
+    "AUTOMACAO_PONTUA_API", os.path.join(os.path.dirname(os.path.abspath(__file__)), "pontua_api.json")
+)
+
+# Valores fixos da contagem, os mesmos escolhidos na tela (as opções "1: MANUTENCAO" e
+# "5: CONTAGEM_SFP" do Angular têm o índice da opção antes do valor)
+TIPO_CONTAGEM = "MANUTENCAO"
+METODO_CONTAGEM = "CONTAGEM_SFP"
+ROTEIRO = "SERPRO V3"
+PROPOSITO = "Fornecer o tamanho funcional de uma demanda de manutenção da aplicação."
+
+
+def carregar_configuracao(caminho=ARQUIVO_CONFIGURACAO):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+# ==============================================================================
+# CORPO DAS REQUISIÇÕES
+# ==============================================================================
+def payload_demanda(dados, opcoes, data_inicio):
+    """Campos do formulário 'Incluir demanda'. `opcoes` traz o valor escolhido em cada ng-select."""
+    return {
+        "nome": f"{dados['numeroDemanda']}: {dados['resumo']}",
+        "descricao": f"Solicitação: {dados['resumo']}",
+        "fronteira": opcoes["fronteira"],
+        "processo": opcoes["processo"],
+        "tipo": opcoes["tipo_demanda"],
+        "data_abertura": dados["data_formatada"],
+        "data_inicio": data_inicio,
+        "responsavel": dados["responsavel"],
+        "numero": dados["numeroDemanda"],
+        "plataforma": opcoes["plataforma"],
+        "linguagem": opcoes["linguagem"],
+        "banco": opcoes["banco_de_dados"],
+    }
+
+
+def payload_contagem(dados, roteiro=ROTEIRO):
+    """Campos do formulário da contagem criada a partir da demanda."""
+    return {
+        "demanda": dados["numeroDemanda"],
+        "descricao": f"Contagem da {dados['numero_demanda']}",
+        "tipo": TIPO_CONTAGEM,
+        "metodo": METODO_CONTAGEM,
+        "roteiro": roteiro,
+        "proposito": PROPOSITO,
+        "escopo": PROPOSITO,
+    }
+
+
+# ==============================================================================
+# CLIENTE HTTP AUTENTICADO PELA SESSÃO DO NAVEGADOR
+# ==============================================================================
+class ClientePontua(ClienteSessao):
+    """Cria demandas e contagens pela API do Pontua, com os cookies da sessão aberta no navegador.
+
+    As conexões ficam em um pool e são reaproveitadas entre demandas. Os caminhos da API,
+    o cookie/cabeçalho anti-CSRF e o campo de ID das respostas vêm de pontua_api.json.
+    """
+
+    def __init__(self, url_base, cookies=None, configuracao=None, token=None, conexoes=4, timeout=30):
+        self.configuracao = configuracao or carregar_configuracao()
+        cookies = cookies or {}
+        cabecalhos = {}
+        xsrf = cookies.get(self.configuracao.get("cookie_xsrf") or "")
+        if xsrf:
+            cabecalhos[self.configuracao["cabecalho_xsrf"]] = xsrf
+        if token:
+            cabecalhos["Authorization"] = f"Bearer {token}"
+        super().__init__(url_base, cookies, cabecalhos, conexoes, timeout)
+
+    @classmethod
+    def do_navegador(cls, navegador, configuracao=None):
+        """Cliente com os cookies da aba atual, que deve estar no Pontua e autenticada."""
+        configuracao = configuracao or carregar_configuracao()
+        url_base, cookies = sessao_do_navegador(navegador)
+        token = None
+        if configuracao.get("token_local_storage"):
+            token = navegador.execute_script("return localStorage.getItem(arguments[0]);", configuracao["token_local_storage"])
+        return cls(url_base, cookies, configuracao, token)
+
+    def _requisitar(self, metodo, endpoint, corpo=None, **parametros):
+        caminho = self.configuracao["endpoints"][endpoint].format(**parametros)
+        return self.requisitar_json(metodo, caminho, corpo)
+
+    def _id(self, resposta, endpoint):
+        identificador = resposta.get(self.configuracao.get("campo_id", "id"))
+        if identificador is None:
+            raise ErroApi(f"Resposta de '{endpoint}' sem o campo de ID: {str(resposta)[:200]}")
+        return identificador
+
+    def criar_demanda(self, campos):
+        """Retorna o ID da demanda criada."""
+        return self._id(self._requisitar("POST", "demanda", campos), "demanda")
+
+    def criar_contagem(self, id_demanda, campos):
+        """Retorna o link da contagem criada, no mesmo formato da URL exibida pelo navegador."""
+        id_contagem = self._id(self._requisitar("POST", "contagem", campos, id_demanda=id_demanda), "contagem")
+        link = self.configuracao["link_contagem"].format(id_demanda=id_demanda, id_contagem=id_contagem, **campos)
+        logging.info(f"🌐 Contagem {id_contagem} criada pela API do Pontua.")
+        return urljoin(self.url_base, link)
+
+    def link_demanda(self, id_demanda):
+        return urljoin(self.url_base, self.configuracao["link_demanda"].format(id_demanda=id_demanda))
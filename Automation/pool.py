@@ -0,0 +1,195 @@
+import argparse
+import json
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+
+import automation as modulo_automacao
+from automation import automation, diretorio_perfil_edge, iniciar_navegador_com_perfil_usuario, processar_demanda
+from armazem import ARQUIVO_BANCO, ArmazemDemandas, chave_do_item
+from decisoes import InteracaoDecisoes, RevisaoPendente
+from interacao import criar_interacao
+from lote import ler_itens, resumir_lote
+
+# Arquivos do perfil que não devem ser copiados: travas do processo e caches descartáveis
+IGNORAR_NO_PERFIL = shutil.ignore_patterns(
+    "Singleton*", "lockfile", "LOCK", "Cache", "Code Cache", "GPUCache", "GrShaderCache", "ShaderCache", "Crashpad",
+)
+
+# ==============================================================================
+# WORKERS
+# ==============================================================================
+class FiltroWorker(logging.Filter):
+    def __init__(self, nome_worker):
+        super().__init__()
+        self.nome_worker = nome_worker
+
+    def filter(self, record):
+        return record.threadName == self.nome_worker
+
+
+def preparar_perfil(indice, perfil_base, pasta_perfis):
+    """Cria uma cópia isolada do perfil do Edge para o worker, ou um perfil vazio se não houver base."""
+    destino = os.path.join(pasta_perfis, f"worker-{indice}")
+    if perfil_base and os.path.isdir(perfil_base):
+        logging.info(f"📁 Copiando perfil do Edge para {destino}...")
+        shutil.copytree(perfil_base, destino, ignore=IGNORAR_NO_PERFIL, dirs_exist_ok=True)
+    else:
+        os.makedirs(destino, exist_ok=True)
+    return destino
+
+
+def executar_worker(indice, fila, perfil, opcoes_navegador, pasta_logs, resultados, trava_resultados, armazem=None):
+    nome = threading.current_thread().name
+    manipulador = logging.FileHandler(os.path.join(pasta_logs, f"{nome}.log"), encoding="utf-8")
+    manipulador.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    manipulador.addFilter(FiltroWorker(nome))
+    logging.getLogger().addHandler(manipulador)
+
+    navegador = None
+    aba_pontua = None
+    arquivo_worker = os.path.join(pasta_logs, f"{nome}.jsonl")
+    try:
+        with open(arquivo_worker, "w", encoding="utf-8") as saida:
+            while True:
+                try:
+                    posicao, link_alm = fila.get_nowait()
+                except queue.Empty:
+                    break
+
+                registro = {"posicao": posicao, "item": link_alm, "worker": indice, "sucesso": False}
+                inicio = time.perf_counter()
+                try:
+                    if navegador is None:
+                        navegador = iniciar_navegador_com_perfil_usuario(link_alm, user_data_dir=perfil, **opcoes_navegador)
+                        if not navegador:
+                            raise RuntimeError("não foi possível iniciar o navegador")
+                        automacao = automation(navegador)
+                        dados, aba_pontua = processar_demanda(navegador, automacao, armazem=armazem, item=link_alm)
+                    else:
+                        dados, aba_pontua = processar_demanda(navegador, automacao, link_alm, aba_pontua, armazem)
+                    registro.update(
+                        sucesso=True,
+                        numero_demanda=dados["numeroDemanda"],
+                        link_pontua=dados["link_pontua"],
+                        pf=dados["pf"],
+                        tempos=dados["tempos"],
+                        retentativas=dados["retentativas"]["por_classe"],
+                    )
+                except RevisaoPendente as e:
+                    registro.update(pendente_revisao=True, erro=str(e))
+                except Exception as e:
+                    logging.error(f"❌ Falha ao processar {link_alm}: {e}")
+                    registro["erro"] = str(e)
+                finally:
+                    fila.task_done()
+                registro["duracao"] = round(time.perf_counter() - inicio, 3)
+
+                saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+                saida.flush()
+                with trava_resultados:
+                    resultados.append(registro)
+    finally:
+        if navegador:
+            navegador.quit()
+        logging.getLogger().removeHandler(manipulador)
+        manipulador.close()
+
+
+def executar_pool(itens, workers=2, arquivo_resultados="resultados_pool.jsonl", headless=False,
+                  perfil_base=None, pasta_logs="logs_pool", interacao=None, sem_gpu=False, armazem=None,
+                  viewport=modulo_automacao.VIEWPORT_PADRAO):
+    """Distribui os itens entre `workers` navegadores independentes e grava os resultados mesclados.
+
+    `interacao` substitui o backend de perguntas de automation.py; os backends já
+    serializam as caixas de diálogo entre os workers. Com um `armazem`, itens já
+    concluídos são pulados e o banco é compartilhado entre os workers.
+    """
+    if armazem:
+        itens = [item for item in itens if not armazem.concluida(chave_do_item(item))]
+    os.makedirs(pasta_logs, exist_ok=True)
+    if interacao is not None:
+        modulo_automacao.interacao = interacao
+    opcoes_navegador = {"headless": headless, "sem_gpu": sem_gpu, "viewport": viewport}
+
+    fila = queue.Queue()
+    for posicao, item in enumerate(itens):
+        fila.put((posicao, item))
+
+    resultados = []
+    trava_resultados = threading.Lock()
+    pasta_perfis = tempfile.mkdtemp(prefix="automacao-perfis-")
+    inicio = time.perf_counter()
+    try:
+        threads = []
+        for indice in range(min(workers, len(itens))):
+            perfil = preparar_perfil(indice, perfil_base, pasta_perfis)
+            thread = threading.Thread(
+                target=executar_worker,
+                name=f"worker-{indice}",
+                args=(indice, fila, perfil, opcoes_navegador, pasta_logs, resultados, trava_resultados, armazem),
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+    finally:
+        shutil.rmtree(pasta_perfis, ignore_errors=True)
+
+    resultados.sort(key=lambda r: r["posicao"])
+    with open(arquivo_resultados, "w", encoding="utf-8") as saida:
+        for registro in resultados:
+            saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+    resumir_lote(resultados, time.perf_counter() - inicio)
+    return resultados
+
+
+# EXECUÇÃO PRINCIPAL
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Processa demandas do ALM com vários navegadores em paralelo.")
+    parser.add_argument("origem", nargs="?", default="-", help="Arquivo com links ou IDs do ALM ('-' para stdin).")
+    parser.add_argument("-n", "--workers", type=int, default=2)
+    parser.add_argument("-o", "--saida", default="resultados_pool.jsonl")
+    parser.add_argument("--logs", default="logs_pool", help="Pasta dos logs e resultados parciais de cada worker.")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--banco", default=ARQUIVO_BANCO, help="Banco SQLite com as demandas já extraídas ('' desativa).")
+    parser.add_argument("--sem-gpu", action="store_true", help="Desativa GPU e /dev/shm (servidores e containers).")
+    parser.add_argument("--viewport", default=modulo_automacao.VIEWPORT_PADRAO,
+                        help="Tamanho da janela no modo headless (largura,altura).")
+    parser.add_argument("--interacao", choices=["gui", "cli", "arquivo"], default=None,
+                        help="Como responder perguntas e confirmações (padrão: AUTOMACAO_INTERACAO ou gui).")
+    parser.add_argument("--respostas", default=None, help="Arquivo JSON {chave: resposta} para as perguntas da automação.")
+    parser.add_argument("--manifesto", default=None,
+                        help="Manifesto CSV/JSON de demandas aprovadas com PF e tipo; as demais vão para revisão.")
+    parser.add_argument("--pendentes", default="pendentes_revisao.jsonl", help="Fila de demandas para revisão humana.")
+    parser.add_argument("--perfil-base", default=None, help="Perfil do Edge a ser copiado para cada worker.")
+    parser.add_argument("--simulador", action="store_true",
+                        help="Sobe o simulador local do ALM/Pontua e responde as caixas de diálogo automaticamente.")
+    args = parser.parse_args()
+
+    perfil_base = args.perfil_base
+    interacao = None
+    if args.interacao:
+        interacao = criar_interacao(args.interacao, args.respostas)
+    elif args.respostas:
+        interacao = criar_interacao("arquivo", args.respostas)
+    if args.manifesto:
+        interacao = InteracaoDecisoes(args.manifesto, args.pendentes)
+    if args.simulador:
+        from simulador.servidor import iniciar_servidor, urls_do_simulador
+
+        servidor, url_base = iniciar_servidor()
+        interacao = interacao or criar_interacao("simulador")
+        modulo_automacao.ALM_URL_BASE, modulo_automacao.PONTUA_URL = urls_do_simulador(url_base)
+        itens = [modulo_automacao.ALM_URL_BASE + item.rsplit("=", 1)[-1] for item in ler_itens(args.origem)]
+    else:
+        perfil_base = perfil_base or diretorio_perfil_edge()
+        itens = ler_itens(args.origem)
+
+    armazem = ArmazemDemandas(args.banco) if args.banco else None
+    executar_pool(itens, args.workers, args.saida, args.headless, perfil_base, args.logs, interacao, args.sem_gpu, armazem,
+                  args.viewport)
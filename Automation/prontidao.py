@@ -0,0 +1,221 @@
+import json
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Requisições sem loadingFinished/Failed há mais tempo que isso (long-poll, EventSource)
+# deixam de contar como rede ocupada
+IDADE_MAXIMA_REQUISICAO = 10
+
+# ==============================================================================
+# SCRIPTS DE PRONTIDÃO
+# ==============================================================================
+# Instalado em cada documento via CDP: conta requisições XHR/fetch em andamento.
+SCRIPT_MONITOR_REDE = """
+(function () {
+    if (window.__automacaoPendentes !== undefined) return;
+    window.__automacaoPendentes = 0;
+    const enviar = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        window.__automacaoPendentes++;
+        this.addEventListener("loadend", function () { window.__automacaoPendentes--; });
+        return enviar.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const buscar = window.fetch;
+        window.fetch = function () {
+            window.__automacaoPendentes++;
+            return buscar.apply(this, arguments).finally(function () { window.__automacaoPendentes--; });
+        };
+    }
+})();
+"""
+
+# Resolve quando o DOM passa `arguments[0]` ms sem mutações.
+SCRIPT_DOM_ESTAVEL = """
+const quietoMs = arguments[0];
+const concluir = arguments[arguments.length - 1];
+let temporizador = setTimeout(fim, quietoMs);
+const observador = new MutationObserver(function () {
+    clearTimeout(temporizador);
+    temporizador = setTimeout(fim, quietoMs);
+});
+observador.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+function fim() { observador.disconnect(); concluir(true); }
+"""
+
+# Verdadeiro quando Angular (Pontua) e Dojo (ALM) não têm trabalho pendente.
+SCRIPT_FRAMEWORKS_OCIOSOS = """
+if (document.readyState !== "complete") return false;
+if (window.getAllAngularTestabilities) {
+    const testabilidades = window.getAllAngularTestabilities();
+    if (!testabilidades.every(function (t) { return t.isStable(); })) return false;
+}
+if (window.dojo && window.dojo.io && window.dojo.io.script && window.dojo.io.script._inFlightCount > 0) return false;
+if (window.__automacaoPendentes > 0) return false;
+return true;
+"""
+
+# Verdadeiro quando o centro do elemento está na viewport e não está coberto por outro elemento.
+SCRIPT_ELEMENTO_DESOBSTRUIDO = """
+const elemento = arguments[0];
+const caixa = elemento.getBoundingClientRect();
+const x = caixa.left + caixa.width / 2, y = caixa.top + caixa.height / 2;
+if (x < 0 || y < 0 || x > window.innerWidth || y > window.innerHeight) return false;
+const topo = document.elementFromPoint(x, y);
+return topo !== null && (topo === elemento || elemento.contains(topo));
+"""
+
+
+# ==============================================================================
+# MOTOR DE PRONTIDÃO
+# ==============================================================================
+class Prontidao:
+    """Espera por sinais concretos da página em vez de pausas fixas e registra quanto cada espera durou."""
+
+    def __init__(self, driver, timeout=20):
+        self.driver = driver
+        self.timeout = timeout
+        self.esperas = []
+        self._requisicoes_cdp = {}  # requestId -> (início, em segundos de relógio, loaderId)
+        self._aba_cdp = None
+        self._cdp_ativo = self._ativar_cdp()
+
+    def _ativar_cdp(self):
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return False
+        try:
+            self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SCRIPT_MONITOR_REDE})
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_script(SCRIPT_MONITOR_REDE)
+            return "performance" in (self.driver.log_types or [])
+        except Exception as e:
+            logging.warning(f"⚠️ CDP indisponível, usando apenas sinais da página: {e}")
+            return False
+
+    def aguardar(self, nome, condicao, timeout=None):
+        """Espera `condicao(driver)` ser verdadeira e registra a duração. Retorna o valor da condição ou None."""
+        timeout = timeout or self.timeout
+        inicio = time.perf_counter()
+        resultado = None
+        try:
+            resultado = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condicao)
+        except TimeoutException:
+            logging.warning(f"⏰ Prontidão '{nome}' não atingida após {timeout} segundos.")
+        duracao = time.perf_counter() - inicio
+        self.esperas.append({"espera": nome, "duracao": round(duracao, 3), "sucesso": resultado is not None})
+        logging.info(f"⏱️ Prontidão '{nome}' em {duracao * 1000:.0f} ms.")
+        return resultado
+
+    # ---------------- sinais ----------------
+    def dom_estavel(self, quieto_ms=300, timeout=None):
+        timeout = timeout or self.timeout
+        # O timeout de script vale para a sessão inteira: restaura o anterior para os demais execute_async_script
+        anterior = self.driver.timeouts.script
+        self.driver.set_script_timeout(timeout)
+        inicio = time.perf_counter()
+        try:
+            self.driver.execute_async_script(SCRIPT_DOM_ESTAVEL, quieto_ms)
+            sucesso = True
+        except Exception as e:
+            logging.warning(f"⏰ DOM não estabilizou: {e}")
+            sucesso = False
+        finally:
+            self.driver.set_script_timeout(anterior)
+        duracao = time.perf_counter() - inicio
+        self.esperas.append({"espera": "dom_estavel", "duracao": round(duracao, 3), "sucesso": sucesso})
+        return sucesso
+
+    def _rede_ociosa_cdp(self, driver):
+        aba = driver.current_window_handle
+        if aba != self._aba_cdp:
+            # O log de desempenho é da aba atual: as pendências de outra aba nunca terminariam aqui
+            self._requisicoes_cdp.clear()
+            self._aba_cdp = aba
+        for entrada in driver.get_log("performance"):
+            mensagem = json.loads(entrada["message"])["message"]
+            metodo = mensagem.get("method", "")
+            parametros = mensagem.get("params", {})
+            if metodo == "Network.requestWillBeSent":
+                self._requisicoes_cdp[parametros["requestId"]] = (entrada["timestamp"] / 1000, parametros.get("loaderId"))
+            elif metodo in ("Network.loadingFinished", "Network.loadingFailed"):
+                self._requisicoes_cdp.pop(parametros.get("requestId"), None)
+            elif metodo == "Page.frameNavigated" and not parametros["frame"].get("parentId"):
+                # Novo documento no frame principal: as requisições do anterior não terminam mais
+                loader = parametros["frame"].get("loaderId")
+                self._requisicoes_cdp = {id_: req for id_, req in self._requisicoes_cdp.items() if req[1] == loader}
+        limite = time.time() - IDADE_MAXIMA_REQUISICAO
+        self._requisicoes_cdp = {id_: req for id_, req in self._requisicoes_cdp.items() if req[0] >= limite}
+        return not self._requisicoes_cdp
+
+    def _ociosa(self, quieto_s):
+        """Condição que só é verdadeira após `quieto_s` segundos seguidos sem rede nem frameworks ocupados."""
+        estado = {"desde": None}
+
+        def condicao(driver):
+            ociosa = driver.execute_script(SCRIPT_FRAMEWORKS_OCIOSOS)
+            if ociosa and self._cdp_ativo:
+                ociosa = self._rede_ociosa_cdp(driver)
+            if not ociosa:
+                estado["desde"] = None
+                return False
+            estado["desde"] = estado["desde"] or time.perf_counter()
+            return time.perf_counter() - estado["desde"] >= quieto_s
+
+        return condicao
+
+    def pagina_ociosa(self, quieto_s=0.3, timeout=None):
+        return self.aguardar("pagina_ociosa", self._ociosa(quieto_s), timeout)
+
+    def pagina_alm_pronta(self, timeout=None):
+        self.aguardar("alm_titulo", EC.presence_of_element_located((By.CLASS_NAME, "TitleText")), timeout)
+        return self.pagina_ociosa(timeout=timeout)
+
+    def swal_visivel(self, timeout=None):
+        return self.aguardar("swal2", EC.visibility_of_element_located((By.CSS_SELECTOR, ".swal2-confirm")), timeout)
+
+    def elemento_desobstruido(self, elemento, timeout=None):
+        return self.aguardar(
+            "elemento_desobstruido",
+            lambda driver: driver.execute_script(SCRIPT_ELEMENTO_DESOBSTRUIDO, elemento),
+            timeout,
+        )
+
+    def elemento_focado(self, elemento, timeout=None):
+        return self.aguardar(
+            "elemento_focado",
+            lambda driver: driver.execute_script(
+                "return arguments[0] === document.activeElement || arguments[0].contains(document.activeElement);",
+                elemento,
+            ),
+            timeout,
+        )
+
+    def opcao_ng_select(self, texto_opcao, timeout=None):
+        """Espera aparecer uma opção de ng-select que contenha o texto digitado."""
+        return self.aguardar(
+            "ng_option",
+            lambda driver: driver.execute_script(
+                "const termo = arguments[0];"
+                "return Array.from(document.querySelectorAll('div.ng-option'))"
+                ".find(o => o.textContent.toLowerCase().includes(termo)) || false;",
+                texto_opcao.lower(),
+            ),
+            timeout,
+        )
+
+    # ---------------- relatório ----------------
+    def total_esperado(self):
+        return sum(e["duracao"] for e in self.esperas)
+
+    def resumo(self):
+        por_espera = {}
+        for e in self.esperas:
+            atual = por_espera.setdefault(e["espera"], {"quantidade": 0, "duracao": 0.0})
+            atual["quantidade"] += 1
+            atual["duracao"] = round(atual["duracao"] + e["duracao"], 3)
+        return por_espera
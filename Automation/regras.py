@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import threading
+import time
+
+ARQUIVO_REGRAS = os.environ.get(
+    "AUTOMACAO_REGRAS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "regras.json")
+)
+# Intervalo mínimo entre verificações do arquivo, para não fazer um stat por consulta
+INTERVALO_VERIFICACAO = 2.0
+PADRAO = "*"
+
+
+# ==============================================================================
+# TABELA DE REGRAS DE MAPEAMENTO ALM -> PONTUA
+# ==============================================================================
+class Regras:
+    """Tabelas {valor no ALM: opção no Pontua} carregadas de regras.json.
+
+    Cada tabela é um dict (consulta O(1)); a chave "*" é o valor padrão e "{chave}" no valor
+    repete o valor do ALM. O arquivo é recarregado quando muda, sem reiniciar os workers.
+    Valores do ALM sem regra são contados por tabela, cada um uma vez só, mesmo que seja
+    consultado várias vezes: são as escolhas que dependem de uma pessoa.
+    """
+
+    def __init__(self, caminho=ARQUIVO_REGRAS):
+        self.caminho = caminho
+        self.tabelas = {}
+        self.recargas = 0
+        self.sem_regra = {}  # tabela -> valores do ALM sem regra
+        self._mtime = None
+        self._verificado_em = 0.0
+        self._trava = threading.Lock()
+        self.recarregar_se_mudou(forcar=True)
+
+    def recarregar_se_mudou(self, forcar=False):
+        agora = time.monotonic()
+        if not forcar and agora - self._verificado_em < INTERVALO_VERIFICACAO:
+            return False
+        self._verificado_em = agora
+        try:
+            mtime = os.stat(self.caminho).st_mtime
+        except OSError as e:
+            logging.warning(f"⚠️ Arquivo de regras indisponível ({e}); mantendo as regras atuais.")
+            return False
+        if mtime == self._mtime:
+            return False
+        try:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                tabelas = json.load(arquivo)
+            if not isinstance(tabelas, dict) or not all(isinstance(tabela, dict) for tabela in tabelas.values()):
+                raise ValueError("cada tabela deve ser um objeto {valor no ALM: opção no Pontua}")
+            for nome, tabela in tabelas.items():
+                for chave, valor in tabela.items():
+                    if not isinstance(valor, str):
+                        raise ValueError(f"'{nome}'['{chave}'] deve ser um texto, não {type(valor).__name__}")
+        except (OSError, ValueError) as e:
+            logging.error(f"❌ Regras inválidas em {self.caminho}: {e}; mantendo as regras atuais.")
+            return False
+        with self._trava:
+            self.tabelas = tabelas
+            self._mtime = mtime
+            self.recargas += 1
+        logging.info(f"📐 Regras carregadas de {self.caminho}: {', '.join(sorted(tabelas))}.")
+        return True
+
+    def resolver(self, tabela, chave):
+        """Opção do Pontua para `chave` na `tabela`, ou None quando nenhuma regra se aplica."""
+        self.recarregar_se_mudou()
+        regras = self.tabelas.get(tabela, {})
+        valor = regras.get(chave, regras.get(PADRAO))
+        if valor is None:
+            with self._trava:
+                self.sem_regra.setdefault(tabela, set()).add(chave)
+            logging.warning(f"📐 Sem regra para '{chave}' em '{tabela}'; será necessária resposta manual.")
+            return None
+        return valor.replace("{chave}", str(chave))
+
+    def resumo(self):
+        with self._trava:
+            sem_regra = {tabela: len(chaves) for tabela, chaves in self.sem_regra.items()}
+        return {"recargas": self.recargas, "sem_regra": sem_regra, "total_sem_regra": sum(sem_regra.values())}
+
+
+REGRAS = Regras()
@@ -0,0 +1,137 @@
+import functools
+import logging
+import os
+import time
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+
+# Classes de falha
+OBSOLETO = "elemento_obsoleto"
+INTERCEPTADO = "clique_interceptado"
+TIMEOUT = "timeout"
+NAO_ENCONTRADO = "nao_encontrado"
+FATAL = "fatal"
+
+# Por classe: (retentativas, espera inicial em segundos, fator de crescimento da espera)
+POLITICAS = {
+    OBSOLETO: (3, 0.1, 2.0),       # o Angular/Dojo re-renderizou o nó: nova busca quase sempre resolve
+    INTERCEPTADO: (3, 0.3, 2.0),   # overlay ou animação na frente: espera um pouco mais a cada vez
+    NAO_ENCONTRADO: (2, 0.5, 2.0),
+    TIMEOUT: (1, 1.0, 1.0),        # a espera já consumiu o timeout inteiro: uma única nova chance
+    FATAL: (0, 0.0, 1.0),          # sessão perdida, seletor inválido, localizador inexistente...
+}
+
+# Orçamento por execução (uma demanda): número de retentativas e segundos gastos com elas
+LIMITE_RETENTATIVAS = int(os.environ.get("AUTOMACAO_LIMITE_RETENTATIVAS", "20"))
+LIMITE_TEMPO_RETENTATIVAS = float(os.environ.get("AUTOMACAO_LIMITE_TEMPO_RETENTATIVAS", "90"))
+
+
+class FalhaAcao(Exception):
+    """Uma ação da automação falhou depois das retentativas permitidas (ou sem direito a elas)."""
+
+    def __init__(self, acao, classe, causa):
+        detalhe = str(causa).strip().splitlines()[0] if str(causa).strip() else type(causa).__name__
+        super().__init__(f"{acao} falhou ({classe}): {detalhe}")
+        self.acao = acao
+        self.classe = classe
+        self.causa = causa
+
+
+def classificar(erro):
+    if isinstance(erro, StaleElementReferenceException):
+        return OBSOLETO
+    if isinstance(erro, (ElementClickInterceptedException, ElementNotInteractableException)):
+        return INTERCEPTADO
+    if isinstance(erro, TimeoutException):
+        return TIMEOUT
+    if isinstance(erro, NoSuchElementException):
+        return NAO_ENCONTRADO
+    return FATAL
+
+
+# ==============================================================================
+# POLÍTICA DE RETENTATIVAS COM ORÇAMENTO POR EXECUÇÃO
+# ==============================================================================
+class Retentativas:
+    """Repete ações que falharam conforme a classe da falha, dentro de um orçamento por execução.
+
+    Os contadores mostram, por classe e por ação, quantas retentativas houve e quanto
+    tempo foi gasto nelas (tentativas que falharam mais as esperas).
+    """
+
+    def __init__(self, limite=LIMITE_RETENTATIVAS, limite_tempo=LIMITE_TEMPO_RETENTATIVAS, politicas=POLITICAS):
+        self.limite = limite
+        self.limite_tempo = limite_tempo
+        self.politicas = politicas
+        self.nova_execucao()
+
+    def nova_execucao(self):
+        self.usadas = 0
+        self.tempo_perdido = 0.0
+        self.por_classe = {}
+        self.por_acao = {}
+
+    def _contabilizar(self, acao, classe, segundos):
+        for contadores, chave in ((self.por_classe, classe), (self.por_acao, acao)):
+            contador = contadores.setdefault(chave, {"retentativas": 0, "tempo_perdido": 0.0})
+            contador["retentativas"] += 1
+            contador["tempo_perdido"] += segundos
+        self.usadas += 1
+        self.tempo_perdido += segundos
+
+    def executar(self, acao, funcao, instrumentacao=None):
+        tentativa = 0
+        while True:
+            inicio = time.perf_counter()
+            try:
+                return funcao()
+            except Exception as erro:
+                classe = classificar(erro)
+                maximo, espera, fator = self.politicas[classe]
+                if tentativa >= maximo:
+                    raise FalhaAcao(acao, classe, erro) from erro
+                if self.usadas >= self.limite or self.tempo_perdido >= self.limite_tempo:
+                    logging.error(f"🛑 Orçamento de retentativas esgotado ({self.usadas}, {self.tempo_perdido:.1f}s).")
+                    raise FalhaAcao(acao, classe, erro) from erro
+                atraso = espera * fator ** tentativa
+                tentativa += 1
+                logging.warning(f"🔁 {acao}: {classe}; nova tentativa {tentativa}/{maximo} em {atraso:.1f}s.")
+                time.sleep(atraso)
+                self._contabilizar(acao, classe, time.perf_counter() - inicio)
+                if instrumentacao is not None:
+                    instrumentacao.registrar_retentativa()
+
+    def resumo(self):
+        def arredondar(contadores):
+            return {
+                chave: {"retentativas": c["retentativas"], "tempo_perdido": round(c["tempo_perdido"], 3)}
+                for chave, c in contadores.items()
+            }
+
+        return {
+            "usadas": self.usadas,
+            "tempo_perdido": round(self.tempo_perdido, 3),
+            "por_classe": arredondar(self.por_classe),
+            "por_acao": arredondar(self.por_acao),
+        }
+
+
+def retentavel(metodo):
+    """Decorador para métodos da classe automation: repete o método conforme self.retentativas.
+
+    Deve ficar abaixo de @instrumentado, para que a ação medida inclua as retentativas.
+    """
+    @functools.wraps(metodo)
+    def envolvido(self, *args, **kwargs):
+        alvo = args[0] if args else None
+        acao = f"{metodo.__name__}({alvo})" if isinstance(alvo, (str, int)) and len(str(alvo)) <= 60 else metodo.__name__
+        return self.retentativas.executar(
+            acao, lambda: metodo(self, *args, **kwargs), getattr(self, "instrumentacao", None)
+        )
+    return envolvido
@@ -0,0 +1,228 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ==============================================================================
+# SIMULADOR LOCAL DO ALM E DO PONTUA
+# ==============================================================================
+# Serve páginas HTML que reproduzem o DOM usado por automation.locators, para que o
+# fluxo completo rode sem acesso a alm.serpro e pontua.estaleiro.serpro.gov.br.
+PASTA_PAGINAS = os.path.dirname(os.path.abspath(__file__))
+
+ROTAS = {
+    "/ccm/web/": "alm.html",
+    "/pontua-web/": "pontua.html",
+}
+
+# Latências artificiais em milissegundos: "rede" atrasa cada resposta do servidor,
+# "render" atrasa a exibição de telas e diálogos e "opcoes" a lista dos ng-select.
+LATENCIA_PADRAO = {"rede": 0, "render": 0, "opcoes": 0}
+
+# Sessão do Pontua simulado: a página grava os cookies e a API (pontua_api.py) exige os dois
+COOKIE_SESSAO = "PONTUA_SESSAO"
+TOKEN_XSRF = "simulador-xsrf"
+# Sessão do ALM simulado: sem o cookie, a API OSLC responde como o Jazz (200 + cabeçalho authrequired)
+COOKIE_SESSAO_ALM = "JSESSIONID"
+
+
+def dados_item_alm(id_item):
+    """Campos determinísticos de um work item do ALM simulado."""
+    return {
+        "id": id_item,
+        "titulo": f"Demanda Interna {id_item}",
+        "estado": "Novo",
+        "solicitante": "Fulano de Tal",
+        "responsavel": "Beltrano da Silva",
+        "tipo": "Melhoria" if id_item % 2 else "Apuração",
+        "criacao": "12 de mar de 2024 10:15",
+        "servico": f"Sistema de Exemplo - {'80728' if id_item % 3 == 0 else '91234'}",
+        "resumo": f"Ajuste no relatório do item {id_item}",
+    }
+
+
+def recurso_oslc(id_item, atributos=None):
+    """Work item simulado no formato JSON da API OSLC do Jazz CCM (ver alm_api.json)."""
+    item = dados_item_alm(id_item)
+    tipo, numero = item["titulo"].rsplit(" ", 1)
+    return dict(
+        {
+            "dc:identifier": int(numero),
+            "dc:type": {"dc:title": tipo},
+            "dc:title": item["resumo"],
+            "dc:description": f"<p>{item['resumo']}</p>",
+            "dc:creator": {"dc:title": item["solicitante"]},
+            "dc:created": "2024-03-12T13:15:00.000Z",  # 10:15 em Brasília, como a página exibe
+            "rtc_cm:codigoServico": item["servico"],
+            "rtc_cm:tipoDemanda": {"dc:title": item["tipo"]},
+            "rtc_cm:ownedBy": {"dc:title": item["responsavel"]},
+            "rtc_cm:tamanhoPF": None,
+        },
+        **(atributos or {}),
+    )
+
+
+class ManipuladorSimulador(BaseHTTPRequestHandler):
+    def log_message(self, formato, *args):
+        logging.debug(f"[simulador] {formato % args}")
+
+    def _responder(self, status, corpo, tipo="text/html; charset=utf-8", cabecalhos=()):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        for nome, valor in cabecalhos:
+            self.send_header(nome, valor)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _pagina(self, nome):
+        with open(os.path.join(PASTA_PAGINAS, nome), encoding="utf-8") as arquivo:
+            html = arquivo.read()
+        configuracao = f"<script>window.SIMULADOR_LATENCIA = {json.dumps(self.server.latencia)};</script>"
+        return html.replace("<!--CONFIG-->", configuracao).encode("utf-8")
+
+    def do_GET(self):
+        time.sleep(self.server.latencia["rede"] / 1000)
+        caminho = self.path.split("?", 1)[0]
+        if caminho.startswith("/simulador/alm/"):
+            id_item = int(caminho.rsplit("/", 1)[-1])
+            self._responder(200, json.dumps(dados_item_alm(id_item), ensure_ascii=False).encode("utf-8"), "application/json")
+            return
+        if caminho.startswith("/ccm/oslc/"):
+            self._api_alm("GET", caminho, None)
+            return
+        if caminho == "/simulador/eventos":
+            with self.server.trava:
+                corpo = json.dumps(self.server.eventos, ensure_ascii=False).encode("utf-8")
+            self._responder(200, corpo, "application/json")
+            return
+
+        for prefixo, pagina in ROTAS.items():
+            if caminho.startswith(prefixo):
+                cabecalhos = ()
+                if pagina == "alm.html":
+                    cabecalhos = (("Set-Cookie", f"{COOKIE_SESSAO_ALM}=simulador; Path=/ccm"),)
+                if pagina == "pontua.html":
+                    cabecalhos = (("Set-Cookie", f"{COOKIE_SESSAO}=simulador; Path=/"), ("Set-Cookie", f"XSRF-TOKEN={TOKEN_XSRF}; Path=/"))
+                self._responder(200, self._pagina(pagina), cabecalhos=cabecalhos)
+                return
+        self._responder(404, b"nao encontrado", "text/plain")
+
+    def do_POST(self):
+        time.sleep(self.server.latencia["rede"] / 1000)
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        corpo = self.rfile.read(tamanho)
+        if self.path == "/simulador/eventos":
+            with self.server.trava:
+                self.server.eventos.append(json.loads(corpo or b"{}"))
+            self._responder(204, b"", "text/plain")
+            return
+        if self.path.startswith("/ccm/oslc/"):
+            self._api_alm("POST", self.path.split("?", 1)[0], json.loads(corpo or b"{}"))
+            return
+        if self.path.startswith("/pontua-api/"):
+            self._api_pontua(self.path.split("?", 1)[0], json.loads(corpo or b"{}"))
+            return
+        self._responder(404, b"nao encontrado", "text/plain")
+
+    def do_PUT(self):
+        time.sleep(self.server.latencia["rede"] / 1000)
+        corpo = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.startswith("/ccm/oslc/"):
+            self._api_alm("PUT", self.path.split("?", 1)[0], json.loads(corpo or b"{}"))
+            return
+        self._responder(404, b"nao encontrado", "text/plain")
+
+    def _api_alm(self, metodo, caminho, dados):
+        """API OSLC mínima do ALM: leitura do work item, comentários, links e atualização de atributos."""
+        if f"{COOKIE_SESSAO_ALM}=" not in (self.headers.get("Cookie") or ""):
+            self._responder(200, b"<html>login</html>", cabecalhos=(("X-com-ibm-team-repository-web-auth-msg", "authrequired"),))
+            return
+        partes = caminho.strip("/").split("/")  # ccm, oslc, workitems, <id>.json | <id>, <coleção>
+        if len(partes) < 4 or partes[2] != "workitems":
+            self._responder(404, b'{"erro": "nao encontrado"}', "application/json")
+            return
+        id_item = int(partes[3].split(".", 1)[0])
+        with self.server.trava:
+            versao, atributos = self.server.itens_alm.get(id_item, (0, {}))
+            if len(partes) == 4 and metodo == "GET":
+                corpo = json.dumps(recurso_oslc(id_item, atributos), ensure_ascii=False).encode("utf-8")
+                self._responder(200, corpo, "application/json", (("ETag", f'"{versao}"'),))
+                return
+            if len(partes) == 4 and metodo == "PUT":
+                if self.headers.get("If-Match") != f'"{versao}"':
+                    self._responder(412, b'{"erro": "etag desatualizado"}', "application/json")
+                    return
+                self.server.itens_alm[id_item] = (versao + 1, dict(atributos, **dados))
+                self.server.eventos.append({"tipo": "alm_atributos", "dados": dict(dados, item=id_item), "origem": "api"})
+                self._responder(200, b"{}", "application/json", (("ETag", f'"{versao + 1}"'),))
+                return
+            if len(partes) == 5 and metodo == "POST":
+                tipo = "alm_comentario" if partes[4] == "rtc_cm:comments" else "alm_link"
+                self.server.eventos.append({"tipo": tipo, "dados": dict(dados, item=id_item), "origem": "api"})
+                self._responder(201, b"{}", "application/json")
+                return
+        self._responder(405, b'{"erro": "metodo nao suportado"}', "application/json")
+
+    def _api_pontua(self, caminho, dados):
+        """API mínima do Pontua: registra demandas e contagens como os eventos gravados pela página."""
+        if f"{COOKIE_SESSAO}=" not in (self.headers.get("Cookie") or "") or self.headers.get("X-XSRF-TOKEN") != TOKEN_XSRF:
+            self._responder(401, b'{"erro": "nao autenticado"}', "application/json")
+            return
+        partes = caminho.strip("/").split("/")
+        if partes == ["pontua-api", "demandas"]:
+            tipo = "demanda"
+        elif len(partes) == 4 and partes[1] == "demandas" and partes[3] == "contagens":
+            tipo = "contagem"
+        else:
+            self._responder(404, b'{"erro": "nao encontrado"}', "application/json")
+            return
+        with self.server.trava:
+            self.server.eventos.append({"tipo": tipo, "dados": dados, "origem": "api"})
+            identificador = sum(1 for e in self.server.eventos if e.get("tipo") == tipo)
+        self._responder(201, json.dumps({"id": identificador}).encode("utf-8"), "application/json")
+
+
+def iniciar_servidor(porta=0, host="127.0.0.1", latencia=None):
+    """Sobe o simulador em uma thread de fundo e retorna (servidor, url_base)."""
+    servidor = ThreadingHTTPServer((host, porta), ManipuladorSimulador)
+    servidor.daemon_threads = True
+    servidor.latencia = dict(LATENCIA_PADRAO, **(latencia or {}))
+    servidor.eventos = []
+    servidor.itens_alm = {}  # id -> (versão para o ETag, atributos gravados pela API)
+    servidor.trava = threading.Lock()
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url_base = f"http://{host}:{servidor.server_address[1]}"
+    logging.info(f"🧪 Simulador ALM/Pontua em {url_base}")
+    return servidor, url_base
+
+
+def urls_do_simulador(url_base):
+    """Retorna os valores de ALM_URL_BASE e PONTUA_URL que apontam para o simulador."""
+    return (
+        f"{url_base}/ccm/web/projects/Simulador#action=com.ibm.team.workitem.viewWorkItem&id=",
+        f"{url_base}/pontua-web/#/dashboard",
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Simulador local do ALM e do Pontua.")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--latencia-rede", type=int, default=0, help="Atraso de cada resposta HTTP, em ms.")
+    parser.add_argument("--latencia-render", type=int, default=0, help="Atraso de exibição de telas e diálogos, em ms.")
+    parser.add_argument("--latencia-opcoes", type=int, default=0, help="Atraso das opções dos ng-select, em ms.")
+    args = parser.parse_args()
+
+    latencia = {"rede": args.latencia_rede, "render": args.latencia_render, "opcoes": args.latencia_opcoes}
+    servidor, url_base = iniciar_servidor(args.porta, latencia=latencia)
+    alm, pontua = urls_do_simulador(url_base)
+    print(f"AUTOMACAO_ALM_URL_BASE={alm}")
+    print(f"AUTOMACAO_PONTUA_URL={pontua}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
@@ -6,20 +6,25 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+from cache_driver import resolver_driver
 from selenium.webdriver.common.keys import Keys # Importar Keys para usar atalhos
+from daemon_navegador import anexar_ao_daemon, liberar_navegador
 
 # --- Configuração do Logging ---
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
 def iniciar_navegador():
     """Configura e inicia o navegador Microsoft Edge com um perfil de usuário."""
+    driver = anexar_ao_daemon()
+    if driver:
+        return driver
+
     logging.info("🚀 Iniciando o navegador Microsoft Edge...")
     options = EdgeOptions()
     user_data_dir = os.path.join(os.path.expanduser("~"), "AppData", "Local", "Microsoft", "Edge", "User Data")
     options.add_argument(f"user-data-dir={user_data_dir}")
     
-    service = EdgeService(EdgeChromiumDriverManager().install())
+    service = EdgeService(resolver_driver())
     driver = webdriver.Edge(service=service, options=options)
     driver.maximize_window()
     return driver
@@ -56,8 +61,8 @@ def executar_automacao(driver, url):
 
     finally:
         input("\nPressione Enter para fechar o navegador...")
-        driver.quit()
-        logging.info("🏁 Navegador fechado.")
+        liberar_navegador(driver)
+        logging.info("🏁 Navegador liberado.")
 
 
 # --- Ponto de Entrada do Script ---
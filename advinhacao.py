@@ -1,35 +1,89 @@
-
-import socket
+import argparse
 import re
-import time
+
+from protocolo_io import AsyncSocketReader, ConnectionClosed, ProtocolTimeout, SocketReader
 
 HOST = "desafio.ctfsecurityweek.serpro"
 PORT = 10006
 NTIMES_REQUIRED = 25
 
+try:
+    import numpy as np  # opcional: untemper de todas as saídas em uma única operação de array
+except ImportError:
+    np = None
+
 # ----------------- funções de untemper -----------------
 def u32(x): return x & 0xFFFFFFFF
 
-def undo_right_shift_xor(y, shift):
+# Versões bit a bit (referência para bench_mt19937.py): 32 iterações por etapa
+def undo_right_shift_xor_bitwise(y, shift):
     res = 0
-    for i in range(32):
+    for i in range(31, -1, -1):  # do bit mais alto para o mais baixo: cada bit depende dos de cima
         part = (y ^ (res >> shift)) & (1 << i)
         res |= part
     return u32(res)
 
-def undo_left_shift_xor_mask(y, shift, mask):
+def undo_left_shift_xor_mask_bitwise(y, shift, mask):
     res = 0
     for i in range(32):
         bit = (y ^ ((res << shift) & mask)) & (1 << i)
         res |= bit
     return u32(res)
 
-def untemper(y):
+def untemper_bitwise(y):
+    y = undo_right_shift_xor_bitwise(y, 18)
+    y = undo_left_shift_xor_mask_bitwise(y, 15, 0xEFC60000)
+    y = undo_left_shift_xor_mask_bitwise(y, 7, 0x9D2C5680)
+    y = undo_right_shift_xor_bitwise(y, 11)
+    return u32(y)
+
+# Forma fechada: y = x ^ (x >> s) se inverte com x = y ^ (y >> s) ^ (y >> 2s) ^ ...,
+# calculado dobrando o deslocamento (s, 2s, 4s...) até passar de 32 bits
+def undo_right_shift_xor(y, shift):
+    while shift < 32:
+        y ^= y >> shift
+        shift <<= 1
+    return y
+
+# Com máscara não há como dobrar: cada passo recupera mais `shift` bits (5 passos para 7, 2 para 15)
+def undo_left_shift_xor_mask(y, shift, mask):
+    res = y
+    for _ in range(31 // shift):
+        res = y ^ ((res << shift) & mask)
+    return u32(res)
+
+def untemper_closed_form(y):
     y = undo_right_shift_xor(y, 18)
     y = undo_left_shift_xor_mask(y, 15, 0xEFC60000)
     y = undo_left_shift_xor_mask(y, 7, 0x9D2C5680)
     y = undo_right_shift_xor(y, 11)
-    return u32(y)
+    return y
+
+# O tempering é linear em GF(2): untemper(y) é o XOR do untemper de cada byte na sua posição,
+# então 4 tabelas de 256 entradas resolvem qualquer palavra com 4 consultas
+UNTEMPER_TABLES = [[untemper_closed_form(b << (8 * i)) for b in range(256)] for i in range(4)]
+
+def untemper(y):
+    t0, t1, t2, t3 = UNTEMPER_TABLES
+    return t0[y & 0xFF] ^ t1[(y >> 8) & 0xFF] ^ t2[(y >> 16) & 0xFF] ^ t3[y >> 24]
+
+def untemper_all(nums):
+    """Untemper de todas as saídas coletadas; com NumPy, em uma única operação sobre o array."""
+    if np is None:
+        return [untemper(n) for n in nums]
+    y = np.asarray(nums, dtype=np.uint32)
+    # mesmas etapas de untemper_closed_form, aplicadas às 624 palavras de uma vez
+    for shift, mask in ((18, None), (15, 0xEFC60000), (7, 0x9D2C5680), (11, None)):
+        if mask is None:
+            while shift < 32:
+                y = y ^ (y >> np.uint32(shift))
+                shift <<= 1
+        else:
+            res = y
+            for _ in range(31 // shift):
+                res = y ^ ((res << np.uint32(shift)) & np.uint32(mask))
+            y = res
+    return y.tolist()
 
 # ----------------- implementação MT19937 -----------------
 class MT19937:
@@ -54,69 +108,184 @@ class MT19937:
         self.index += 1
         return u32(y)
 
+# ----------------- MT19937 vetorizado (NumPy) -----------------
+# Cada palavra nova depende de mt[i+1] (antigo) e de mt[i+397], que para i >= 227 já é a palavra
+# nova mt[i-227]. O twist vira três segmentos sem sobreposição: [0, 227) só com valores antigos,
+# [227, 623) em blocos de 227 (cada bloco lê o anterior, já atualizado) e a última palavra, que
+# usa mt[0] e mt[396] novos.
+def _twist_segment(cur, nxt, far):
+    y = (cur & np.uint32(0x80000000)) | (nxt & np.uint32(0x7fffffff))
+    return far ^ (y >> np.uint32(1)) ^ ((y & np.uint32(1)) * np.uint32(0x9908b0df))
+
+def twist_array(mt):
+    mt = mt.copy()
+    mt[:227] = _twist_segment(mt[:227], mt[1:228], mt[397:])
+    for start in range(227, 623, 227):
+        end = min(start + 227, 623)
+        mt[start:end] = _twist_segment(mt[start:end], mt[start+1:end+1], mt[start-227:end-227])
+    mt[623:] = _twist_segment(mt[623:], mt[:1], mt[396:397])
+    return mt
+
+def temper_array(y):
+    y = y ^ (y >> np.uint32(11))
+    y = y ^ ((y << np.uint32(7)) & np.uint32(0x9D2C5680))
+    y = y ^ ((y << np.uint32(15)) & np.uint32(0xEFC60000))
+    return y ^ (y >> np.uint32(18))
+
+class MT19937Batch:
+    """Mesma sequência de MT19937 (que fica como referência), gerada em blocos com NumPy."""
+
+    def __init__(self, state):
+        if np is None:
+            raise RuntimeError("MT19937Batch precisa do NumPy; use MT19937.")
+        self.mt = np.asarray(state, dtype=np.uint32).copy()
+        self.index = 624
+
+    def next_outputs(self, k):
+        """Próximas `k` saídas temperadas, como um array uint32."""
+        out = np.empty(k, dtype=np.uint32)
+        pos = 0
+        while pos < k:
+            if self.index >= 624:
+                self.mt = twist_array(self.mt)
+                self.index = 0
+            n = min(624 - self.index, k - pos)
+            out[pos:pos+n] = self.mt[self.index:self.index+n]
+            self.index += n
+            pos += n
+        return temper_array(out)
+
+    def extract_number(self):
+        return int(self.next_outputs(1)[0])
+
 # ----------------- coleta e envio de palpites -----------------
 RE_NUM = re.compile(r"eu estava pensando no número:\s*([0-9]+)", re.IGNORECASE)
+# Consome a linha inteira: o \n que sobrasse no buffer seria lido como a resposta do próximo palpite
+RE_NUM_DONE = re.compile(RE_NUM.pattern + r"[^\n]*\n", re.IGNORECASE)
+RE_PRONTO = re.compile(r'digite\s*"?pronto"?[^\n]*', re.IGNORECASE)
+RE_FLAG = re.compile(r"[A-Za-z0-9_]*\{[^}\n]*\}")
+
+def collect_numbers(reader, n_needed, window=32, timeout=5.0):
+    """Coleta `n_needed` números com até `window` palpites errados em trânsito.
+
+    Nunca envia mais que `n_needed` palpites, para que o estado do servidor fique
+    exatamente após a última saída coletada. Cada resposta é lida assim que chega;
+    o timeout só estoura se o servidor parar de responder.
+    """
+    window = max(1, window)
+    nums = []
+    sent = 0
+    while len(nums) < n_needed:
+        burst = min(window - (sent - len(nums)), n_needed - sent)
+        if burst > 0:
+            reader.send(b"0\n" * burst)  # palpites errados
+            sent += burst
+        _, (num,) = reader.read_match(RE_NUM_DONE, timeout)
+        nums.append(int(num))
+        if len(nums) % window == 0 or len(nums) == n_needed:
+            print(f"[coletado] {len(nums)}/{n_needed}")
+    return nums
 
-def recv_all(sock, timeout=0.5):
-    sock.settimeout(timeout)
-    data = b""
+def main(host=HOST, port=PORT, window=32, timeout=5.0):
+    """Joga uma sessão; retorna (resposta de cada um dos 25 palpites, flag ou None)."""
+    print(f"Conectando a {host}:{port} ...")
+    reader = SocketReader.connect(host, port, timeout=timeout)
     try:
-        while True:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-    except socket.timeout:
-        pass
-    return data.decode('utf-8', errors='ignore')
-
-def collect_numbers(sock, n_needed):
+        try:
+            welcome = reader.read_until(RE_PRONTO, timeout)
+        except ProtocolTimeout:
+            welcome = reader.take_all()  # sem o prompt esperado: segue com o que chegou
+        print(welcome.decode("utf-8", errors="ignore"))
+
+        # envia "pronto" para iniciar
+        reader.send_line("pronto")
+
+        # coleta 624 números para reconstruir MT19937
+        print("Coletando 624 números do servidor...")
+        nums = collect_numbers(reader, 624, window=window, timeout=timeout)
+
+        # untemper e criar MT local
+        state = untemper_all(nums)
+        mt = MT19937(state)
+
+        # envia os 25 palpites corretos
+        print("Enviando 25 palpites corretos...")
+        responses = []
+        for i in range(NTIMES_REQUIRED):
+            nxt = mt.extract_number()
+            reader.send_line(str(nxt))
+            resp = reader.read_line(timeout).decode("utf-8", errors="ignore")
+            responses.append(resp)
+            print(resp.rstrip())
+
+        # a flag pode ter vindo junto da última resposta
+        print("=== FLAG ===")
+        m = RE_FLAG.search(responses[-1])
+        if not m:
+            try:
+                m = RE_FLAG.search(reader.read_until(RE_FLAG, timeout).decode("utf-8", errors="ignore"))
+            except (ProtocolTimeout, ConnectionClosed) as e:
+                print(e.data.decode("utf-8", errors="ignore"))
+        flag = m.group(0) if m else None
+        if flag:
+            print(flag)
+        return responses, flag
+    finally:
+        reader.close()
+
+# ----------------- sessão assíncrona (várias em paralelo: sessoes_advinhacao.py) -----------------
+async def collect_numbers_async(reader, n_needed, window=32, timeout=5.0):
+    """Mesma coleta de collect_numbers, sobre um AsyncSocketReader."""
+    window = max(1, window)
     nums = []
+    sent = 0
     while len(nums) < n_needed:
-        sock.sendall(b"0\n")  # palpite errado
-        time.sleep(0.05)
-        text = recv_all(sock, timeout=0.5)
-        m = RE_NUM.search(text)
-        if m:
-            nums.append(int(m.group(1)))
-            print(f"[coletado] {len(nums)}: {nums[-1]}")
+        burst = min(window - (sent - len(nums)), n_needed - sent)
+        if burst > 0:
+            await reader.send(b"0\n" * burst)  # palpites errados
+            sent += burst
+        _, (num,) = await reader.read_match(RE_NUM_DONE, timeout)
+        nums.append(int(num))
     return nums
 
-def main():
-    print(f"Conectando a {HOST}:{PORT} ...")
-    s = socket.create_connection((HOST, PORT))
-    time.sleep(0.1)
-    welcome = recv_all(s, timeout=1)
-    print(welcome)
-
-    # envia "pronto" para iniciar
-    s.sendall(b"pronto\n")
-    time.sleep(0.1)
-    recv_all(s, timeout=0.5)
-
-    # coleta 624 números para reconstruir MT19937
-    print("Coletando 624 números do servidor...")
-    nums = collect_numbers(s, 624)
-
-    # untemper e criar MT local
-    state = [untemper(n) for n in nums]
-    mt = MT19937(state)
-
-    # envia os 25 palpites corretos
-    print("Enviando 25 palpites corretos...")
-    for i in range(NTIMES_REQUIRED):
-        nxt = mt.extract_number()
-        s.sendall(f"{nxt}\n".encode())
-        time.sleep(0.05)
-        resp = recv_all(s, timeout=0.5)
-        print(resp)
-
-    # receber resposta final (flag)
-    time.sleep(0.2)
-    final = recv_all(s, timeout=1)
-    print("=== FLAG ===")
-    print(final)
-    s.close()
+async def play_session(host=HOST, port=PORT, window=32, timeout=5.0):
+    """Uma sessão completa, com a sua própria conexão e o seu próprio MT; retorna a flag ou None.
+
+    Levanta ValueError assim que lê a resposta de um palpite errado.
+    """
+    reader = await AsyncSocketReader.connect(host, port, timeout=timeout)
+    try:
+        try:
+            await reader.read_until(RE_PRONTO, timeout)
+        except ProtocolTimeout:
+            reader.take_all()
+        await reader.send_line("pronto")
+        nums = await collect_numbers_async(reader, 624, window=window, timeout=timeout)
+        mt = MT19937(untemper_all(nums))
+        resp = ""
+        for i in range(NTIMES_REQUIRED):
+            await reader.send_line(str(mt.extract_number()))
+            resp = (await reader.read_line(timeout)).decode("utf-8", errors="ignore")
+            m = RE_NUM.search(resp)
+            if m:
+                raise ValueError(f"palpite {i + 1} errado: o servidor pensou em {m.group(1)}")
+        m = RE_FLAG.search(resp)
+        if m:
+            return m.group(0)
+        try:
+            return RE_FLAG.search((await reader.read_until(RE_FLAG, timeout)).decode("utf-8", errors="ignore")).group(0)
+        except (ProtocolTimeout, ConnectionClosed):
+            return None
+    finally:
+        await reader.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Recupera o MT19937 do servidor e acerta os próximos números.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--window", type=int, default=32,
+                        help="Palpites em trânsito durante a coleta (1: um por vez).")
+    parser.add_argument("--timeout", type=float, default=5.0,
+                        help="Segundos sem resposta do servidor antes de desistir.")
+    args = parser.parse_args()
+    main(args.host, args.port, args.window, args.timeout)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import argparse
+import random
+import time
+
+import advinhacao
+from advinhacao import MT19937, MT19937Batch, untemper, untemper_all, untemper_bitwise, untemper_closed_form
+
+# ----------------- correção contra o random do Python -----------------
+def random_outputs(seed):
+    """624 saídas de 32 bits do random do Python e o estado interno que as gerou."""
+    rng = random.Random(seed)
+    outputs = [rng.getrandbits(32) for _ in range(624)]
+    return outputs, list(rng.getstate()[1][:624])
+
+def check_untemper(seeds=5):
+    for seed in range(seeds):
+        outputs, state = random_outputs(seed)
+        for name, func in (("bit a bit", untemper_bitwise), ("forma fechada", untemper_closed_form), ("tabelas", untemper)):
+            assert [func(y) for y in outputs] == state, f"untemper {name} divergiu do random (seed {seed})"
+        assert untemper_all(outputs) == state, f"untemper_all divergiu do random (seed {seed})"
+    print(f"[ok] untemper confere com o estado do random em {seeds} seeds"
+          f" ({'com' if advinhacao.np is not None else 'sem'} NumPy)")
+
+def check_generation(count=5000):
+    rng = random.Random(42)
+    state = untemper_all([rng.getrandbits(32) for _ in range(624)])
+    expected = [rng.getrandbits(32) for _ in range(count)]
+    reference = MT19937(state)
+    assert [reference.extract_number() for _ in range(count)] == expected, "MT19937 divergiu do random"
+    assert MT19937Batch(state).next_outputs(count).tolist() == expected, "MT19937Batch divergiu do random"
+    print(f"[ok] MT19937 e MT19937Batch reproduzem as próximas {count} saídas do random")
+
+# ----------------- benchmark -----------------
+def best_of(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_untemper(repeat):
+    outputs, _ = random_outputs(1234)
+    results = [
+        ("bit a bit (referência)", best_of(lambda: [untemper_bitwise(y) for y in outputs], repeat)),
+        ("forma fechada", best_of(lambda: [untemper_closed_form(y) for y in outputs], repeat)),
+        ("tabelas", best_of(lambda: [untemper(y) for y in outputs], repeat)),
+    ]
+    if advinhacao.np is not None:
+        results.append(("NumPy (untemper_all)", best_of(lambda: untemper_all(outputs), repeat)))
+    reference = results[0][1]
+    print(f"{'untemper de 624 saídas':<28}{'tempo (ms)':>12}{'speedup':>10}")
+    for name, elapsed in results:
+        print(f"{name:<28}{elapsed * 1000:>12.3f}{reference / elapsed:>9.1f}x")
+
+def bench_generation(count):
+    _, state = random_outputs(1234)
+    reference = MT19937(state)
+    start = time.perf_counter()
+    for _ in range(count):
+        reference.extract_number()
+    reference_time = time.perf_counter() - start
+    start = time.perf_counter()
+    MT19937Batch(state).next_outputs(count)
+    batch_time = time.perf_counter() - start
+    print(f"{f'gerar {count} saídas':<28}{'tempo (ms)':>12}{'speedup':>10}")
+    print(f"{'MT19937 (referência)':<28}{reference_time * 1000:>12.1f}{1:>9.1f}x")
+    print(f"{'MT19937Batch (NumPy)':<28}{batch_time * 1000:>12.1f}{reference_time / batch_time:>9.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Confere e mede a recuperação do estado e a geração do MT19937 usadas em advinhacao.py.")
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    parser.add_argument("-n", "--count", type=int, default=2_000_000, help="Saídas geradas no benchmark de geração.")
+    args = parser.parse_args()
+    check_untemper()
+    bench_untemper(args.repeat)
+    if advinhacao.np is None:
+        print("NumPy não instalado: benchmark de geração em lote ignorado.")
+    else:
+        check_generation()
+        bench_generation(args.count)
@@ -1,8 +1,8 @@
-import socket
 import re
 from math import isqrt
 import sys
-import time
+
+from protocolo_io import ConnectionClosed, ProtocolTimeout, SocketReader
 
 HOST = "desafio.ctfsecurityweek.serpro"
 PORT = 10007
@@ -63,57 +63,45 @@ def decrypt_flag_from_Nec(n_str, e_str, c_str):
         return b''
     return m.to_bytes(blen, 'big')
 
-def readline_timeout(f):
-    # f é o file-like object do socket.makefile('rwb' or 'r', encoding)
+# prompt inicial: 'digite "pronto"' ou uma linha terminada em ':' ou '?'
+RE_PROMPT = re.compile(r'digite\s*"[Pp]ronto"[^\n]*|[^\n]*[:?][ \t]*\r?\n')
+
+def read_text(reader, pattern):
+    # None se o servidor fechar a conexão ou não responder a tempo
     try:
-        line = f.readline()
-        if line == '':
-            # EOF
-            return None
-        return line
-    except Exception:
-        return None
+        return reader.read_until(pattern, RECV_TIMEOUT).decode('utf-8', errors='replace')
+    except ConnectionClosed as e:
+        print(e.data.decode('utf-8', errors='replace').rstrip())
+        print("Servidor fechou a conexão.")
+    except ProtocolTimeout as e:
+        print(e.data.decode('utf-8', errors='replace').rstrip())
+        print(f"Timeout lendo do servidor ({RECV_TIMEOUT:.0f}s).")
+    return None
 
 def run():
     print(f"Conectando em {HOST}:{PORT} ...")
-    s = socket.create_connection((HOST, PORT), timeout=RECV_TIMEOUT)
-    # usar makefile para leitura por linha
-    f = s.makefile('rw', encoding='utf-8', newline='\n')
+    reader = SocketReader.connect(HOST, PORT, timeout=RECV_TIMEOUT)
     try:
-        # ler cabeçalho inicial até prompt
-        buffer = []
-        while True:
-            line = f.readline()
-            if not line:
-                print("Conexão fechada pelo servidor.")
-                return
-            print(line.rstrip())
-            buffer.append(line)
-            # esperar o prompt onde o servidor perguntou "digite 'pronto'..." ou similar
-            if re.search(r'digite\s*"[Pp]ronto"', line) or re.search(r'digite\s+"pronto"', line):
-                break
-            # caso o prompt venha sem essa frase, também vamos romper se aparecer input prompt com '?'
-            if line.strip().endswith(':') or line.strip().endswith('?'):
-                break
+        # ler cabeçalho inicial até o prompt (retorna assim que ele chega, mesmo sem quebra de linha)
+        header = read_text(reader, RE_PROMPT)
+        if header is None:
+            return
+        print(header.rstrip())
 
         # enviar "pronto"
         print('Enviando: pronto')
-        f.write('pronto\n')
-        f.flush()
+        reader.send_line('pronto')
 
         # agora entra loop dos desafios; parsearemos N, e, c por bloco
         desafio_idx = 0
         while True:
-            # ler até encontrarmos N, e, c
+            # ler linhas até acharmos N, e e c
             N_val = None
             e_val = None
             c_val = None
-            # ler linhas até acharmos c ou até timeout/EOF
-            start_time = time.time()
             while True:
-                line = f.readline()
-                if not line:
-                    print("Servidor fechou a conexão.")
+                line = read_text(reader, b'\n')
+                if line is None:
                     return
                 print(line.rstrip())
 
@@ -150,30 +138,16 @@ def run():
                         print("Flag calculada:", flag_str)
                         # enviar resposta (com newline)
                         print("Enviando flag para o servidor...")
-                        f.write(flag_str + '\n')
-                        f.flush()
+                        reader.send_line(flag_str)
                     except Exception as ex:
                         print("Erro ao calcular flag:", ex)
                         print("Enviando resposta vazia para abortar.")
-                        f.write('\n')
-                        f.flush()
+                        reader.send(b'\n')
                     # após enviar, continuar lendo próximo bloco
                     break
 
-                # safety timeout para não travar
-                if time.time() - start_time > 30:
-                    print("Timeout lendo do servidor (30s).")
-                    return
-
     finally:
-        try:
-            f.close()
-        except Exception:
-            pass
-        try:
-            s.close()
-        except Exception:
-            pass
+        reader.close()
 
 if __name__ == "__main__":
     try:
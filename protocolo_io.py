@@ -0,0 +1,209 @@
+import asyncio
+import re
+import socket
+import time
+
+# ----------------- leitura de protocolos de linha/prompt sobre sockets -----------------
+# Em vez de ler até estourar um timeout, os leitores acumulam os bytes recebidos em um
+# bytearray e retornam assim que o delimitador (bytes literais ou regex) aparece; o timeout
+# só vale quando o servidor para de responder.
+CHUNK_SIZE = 65536
+
+class ProtocolTimeout(TimeoutError):
+    """O padrão não apareceu dentro do timeout; `data` tem o que chegou até então (não consumido)."""
+
+    def __init__(self, message, data=b""):
+        super().__init__(message)
+        self.data = data
+
+class ConnectTimeout(ProtocolTimeout):
+    """A conexão com o servidor não abriu dentro do timeout."""
+
+class ConnectionClosed(EOFError):
+    """O servidor fechou a conexão antes do padrão; `data` tem o que chegou até então (não consumido)."""
+
+    def __init__(self, message, data=b""):
+        super().__init__(message)
+        self.data = data
+
+def compile_pattern(pattern):
+    """Delimitador em bytes, regex em texto ou regex compilada (str ou bytes) -> regex sobre bytes."""
+    if isinstance(pattern, (bytes, bytearray)):
+        return re.compile(re.escape(bytes(pattern)))
+    if isinstance(pattern, str):
+        return re.compile(pattern.encode())
+    if isinstance(pattern.pattern, str):
+        return re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+    return pattern
+
+class _Buffer:
+    """Buffer de recepção comum aos leitores síncrono e assíncrono."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self._patterns = {}
+
+    def _compiled(self, pattern):
+        compiled = self._patterns.get(pattern)
+        if compiled is None:
+            compiled = self._patterns[pattern] = compile_pattern(pattern)
+        return compiled
+
+    def _take(self, pattern):
+        """Consome o buffer até o fim da primeira ocorrência: (bytes consumidos, grupos), ou None."""
+        m = pattern.search(self.buffer)
+        if m is None:
+            return None
+        groups = m.groups()  # antes de alterar o buffer, ao qual o match se refere
+        end = m.end()
+        data = bytes(self.buffer[:end])
+        del self.buffer[:end]
+        return data, groups
+
+    def take_all(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+# ----------------- versão síncrona (socket) -----------------
+class SocketReader(_Buffer):
+    def __init__(self, sock, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.sock = sock
+        self._chunk = bytearray(chunk_size)
+        self._view = memoryview(self._chunk)
+
+    @classmethod
+    def connect(cls, host, port, timeout=10.0):
+        try:
+            return cls(socket.create_connection((host, port), timeout=timeout))
+        except socket.timeout:
+            raise ConnectTimeout(f"conexão com {host}:{port} não abriu em {timeout}s") from None
+
+    def send(self, data):
+        self.sock.sendall(data)
+
+    def send_line(self, text):
+        self.sock.sendall(text.encode() + b"\n")
+
+    def close(self):
+        self.sock.close()
+
+    def _fill(self, deadline):
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise socket.timeout
+        self.sock.settimeout(remaining)
+        n = self.sock.recv_into(self._view)
+        if n == 0:
+            return False
+        self.buffer += self._view[:n]
+        return True
+
+    def read_match(self, pattern, timeout=None):
+        """Lê até `pattern` e retorna (bytes consumidos, grupos da regex)."""
+        pattern = self._compiled(pattern)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            found = self._take(pattern)
+            if found is not None:
+                return found
+            try:
+                if not self._fill(deadline):
+                    raise ConnectionClosed(f"conexão fechada antes de {pattern.pattern!r}", bytes(self.buffer))
+            except socket.timeout:
+                raise ProtocolTimeout(f"{pattern.pattern!r} não chegou em {timeout}s", bytes(self.buffer)) from None
+
+    def read_until(self, pattern, timeout=None):
+        """Bytes até o fim da primeira ocorrência de `pattern` (inclusive)."""
+        return self.read_match(pattern, timeout)[0]
+
+    def read_line(self, timeout=None):
+        return self.read_until(b"\n", timeout)
+
+    def read_until_close(self, timeout=None):
+        """Tudo o que chegar até o servidor fechar a conexão (ou até o timeout)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while self._fill(deadline):
+                pass
+        except socket.timeout:
+            pass
+        return self.take_all()
+
+# ----------------- versão assíncrona (asyncio) -----------------
+class AsyncSocketReader(_Buffer):
+    def __init__(self, reader, writer, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.reader = reader
+        self.writer = writer
+        self.chunk_size = chunk_size
+
+    @classmethod
+    async def connect(cls, host, port, timeout=10.0):
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        except asyncio.TimeoutError:
+            # Sem isso, o TimeoutError cru se confundiria com o limite de tempo de quem chamou
+            raise ConnectTimeout(f"conexão com {host}:{port} não abriu em {timeout}s") from None
+        return cls(reader, writer)
+
+    async def send(self, data):
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def send_line(self, text):
+        await self.send(text.encode() + b"\n")
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _fill(self, deadline):
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise asyncio.TimeoutError
+        if remaining is None:
+            chunk = await self.reader.read(self.chunk_size)
+        elif hasattr(asyncio, "timeout"):
+            # asyncio.timeout (3.11+) não engole o cancelamento de quem chamou quando a leitura
+            # termina junto com ele, como o wait_for das versões anteriores à 3.12
+            async with asyncio.timeout(remaining):
+                chunk = await self.reader.read(self.chunk_size)
+        else:
+            chunk = await asyncio.wait_for(self.reader.read(self.chunk_size), remaining)
+        if not chunk:
+            return False
+        self.buffer += chunk
+        return True
+
+    async def read_match(self, pattern, timeout=None):
+        pattern = self._compiled(pattern)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            found = self._take(pattern)
+            if found is not None:
+                return found
+            try:
+                if not await self._fill(deadline):
+                    raise ConnectionClosed(f"conexão fechada antes de {pattern.pattern!r}", bytes(self.buffer))
+            except asyncio.TimeoutError:
+                raise ProtocolTimeout(f"{pattern.pattern!r} não chegou em {timeout}s", bytes(self.buffer)) from None
+
+    async def read_until(self, pattern, timeout=None):
+        return (await self.read_match(pattern, timeout))[0]
+
+    async def read_line(self, timeout=None):
+        return await self.read_until(b"\n", timeout)
+
+    async def read_until_close(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while await self._fill(deadline):
+                pass
+        except asyncio.TimeoutError:
+            pass
+        return self.take_all()
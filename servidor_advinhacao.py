@@ -0,0 +1,70 @@
+import argparse
+import asyncio
+import random
+
+# ----------------- servidor local do jogo de adivinhação -----------------
+# Imita o desafio de advinhacao.py para testes: cada conexão tem o seu random.Random(),
+# responde palpites errados com o número sorteado e entrega a flag após 25 acertos seguidos.
+FLAG = "CTF{simulador_local_mt19937}"
+NTIMES_REQUIRED = 25
+
+WELCOME = (
+    "Bem-vindo ao jogo de adivinhação!\n"
+    f"Acerte {NTIMES_REQUIRED} números seguidos para ganhar a flag.\n"
+    'Quando estiver preparado, digite "pronto": '
+)
+
+async def handle(reader, writer):
+    rng = random.Random()
+    try:
+        writer.write(WELCOME.encode())
+        await writer.drain()
+        line = await reader.readline()
+        if line.strip().lower() != b"pronto":
+            writer.write("Até a próxima!\n".encode())
+            return
+        streak = 0
+        while streak < NTIMES_REQUIRED:
+            writer.write("Qual número estou pensando? ".encode())
+            await writer.drain()
+            line = await reader.readline()
+            if not line:
+                return
+            number = rng.getrandbits(32)
+            try:
+                guess = int(line.strip())
+            except ValueError:
+                guess = None
+            if guess == number:
+                streak += 1
+                writer.write(f"Acertou! ({streak}/{NTIMES_REQUIRED})\n".encode())
+            else:
+                streak = 0
+                writer.write(f"Errou! eu estava pensando no número: {number}\n".encode())
+        writer.write(f"Parabéns! {FLAG}\n".encode())
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+async def start_server(host="127.0.0.1", port=0):
+    """Sobe o servidor e retorna (server, porta); a porta 0 escolhe uma livre."""
+    server = await asyncio.start_server(handle, host, port)
+    return server, server.sockets[0].getsockname()[1]
+
+async def serve(host, port):
+    server, port = await start_server(host, port)
+    print(f"Servidor de adivinhação em {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local que imita o desafio de advinhacao.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10006)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import time
+
+from advinhacao import HOST, PORT, play_session
+from protocolo_io import ConnectionClosed, ConnectTimeout, ProtocolTimeout
+import servidor_advinhacao
+
+# ----------------- várias sessões do jogo de adivinhação em paralelo -----------------
+# Cada sessão abre a sua conexão, coleta as suas 624 saídas e recupera o seu próprio MT
+# (advinhacao.play_session); um semáforo limita quantas ficam abertas ao mesmo tempo.
+async def timed_session(semaphore, host, port, window, timeout, session_timeout):
+    """(ok, segundos, flag ou erro) de uma sessão; o tempo conta só depois de obter uma vaga."""
+    async with semaphore:
+        start = time.perf_counter()
+        try:
+            flag = await asyncio.wait_for(play_session(host, port, window, timeout), session_timeout)
+            result = (flag is not None, flag or "sem flag")
+        # ProtocolTimeout também é um TimeoutError: precisa vir antes do limite da sessão
+        except ConnectTimeout:
+            result = (False, f"conexão não abriu em {timeout}s")
+        except ProtocolTimeout:
+            result = (False, f"sem resposta do servidor em {timeout}s")
+        except ConnectionClosed:
+            result = (False, "servidor fechou a conexão")
+        except asyncio.TimeoutError:
+            result = (False, f"sessão passou de {session_timeout}s")
+        except Exception as e:
+            # Uma sessão com erro inesperado não derruba as demais no gather
+            result = (False, f"{type(e).__name__}: {e}")
+        return result[0], time.perf_counter() - start, result[1]
+
+async def run_sessions(host, port, sessions, concurrency=8, window=32, timeout=5.0, session_timeout=60.0):
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        timed_session(semaphore, host, port, window, timeout, session_timeout) for _ in range(sessions)
+    ))
+    return results, time.perf_counter() - start
+
+# ----------------- estatísticas -----------------
+def percentile(sorted_values, p):
+    """Percentil pelo posto mais próximo (valores já ordenados)."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+def print_stats(results, elapsed):
+    ok = [seconds for success, seconds, _ in results if success]
+    latencies = sorted(seconds for _, seconds, _ in results)
+    print(f"sessões: {len(results)}  sucesso: {len(ok)} ({100 * len(ok) / len(results):.1f}%)"
+          f"  tempo total: {elapsed:.2f}s  ({len(results) / elapsed:.1f} sessões/s)")
+    print(f"{'latência (ms)':<16}" + "".join(f"{name:>10}" for name in ("p50", "p90", "p99", "máx")))
+    print(f"{'todas':<16}" + "".join(f"{percentile(latencies, p) * 1000:>10.1f}" for p in (50, 90, 99, 100)))
+    errors = {}
+    for success, _, detail in results:
+        if not success:
+            errors[detail] = errors.get(detail, 0) + 1
+    for detail, count in sorted(errors.items(), key=lambda item: -item[1]):
+        print(f"[falha] {count}x {detail}")
+    flags = {detail for success, _, detail in results if success}
+    if flags:
+        print("=== FLAG ===")
+        print("\n".join(sorted(flags)))
+
+async def main(args):
+    server = None
+    host, port = args.host, args.port
+    if args.local:
+        server, port = await servidor_advinhacao.start_server()
+        host = "127.0.0.1"
+        print(f"Servidor local em {host}:{port}")
+    try:
+        print(f"{args.sessions} sessões contra {host}:{port}, até {args.concurrency} ao mesmo tempo...")
+        results, elapsed = await run_sessions(host, port, args.sessions, args.concurrency,
+                                              args.window, args.timeout, args.session_timeout)
+        print_stats(results, elapsed)
+    finally:
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Roda várias sessões independentes de advinhacao.py em paralelo (asyncio).")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--local", action="store_true", help="Sobe servidor_advinhacao.py no mesmo processo e joga contra ele.")
+    parser.add_argument("-n", "--sessions", type=int, default=20)
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Sessões abertas ao mesmo tempo.")
+    parser.add_argument("--window", type=int, default=32, help="Palpites em trânsito durante a coleta de cada sessão.")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Segundos sem resposta do servidor antes de desistir.")
+    parser.add_argument("--session-timeout", type=float, default=60.0, help="Limite de tempo de uma sessão inteira.")
+    asyncio.run(main(parser.parse_args()))
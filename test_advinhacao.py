@@ -0,0 +1,80 @@
+import asyncio
+import threading
+
+import pytest
+
+import advinhacao
+import servidor_advinhacao
+
+# ----------------- servidor local em uma thread, para o cliente síncrono -----------------
+def start_local_server():
+    """Sobe servidor_advinhacao em um loop próprio; retorna (porta, função para parar)."""
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    state = {}
+
+    def run():
+        asyncio.set_event_loop(loop)
+        state["server"], state["port"] = loop.run_until_complete(servidor_advinhacao.start_server())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait(5)
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        state["server"].close()
+
+    return state["port"], stop
+
+def test_main_reads_the_response_of_each_guess():
+    port, stop = start_local_server()
+    try:
+        responses, flag = advinhacao.main("127.0.0.1", port, window=32, timeout=5.0)
+    finally:
+        stop()
+    assert len(responses) == servidor_advinhacao.NTIMES_REQUIRED
+    for i, resp in enumerate(responses, start=1):
+        assert f"Acertou! ({i}/{servidor_advinhacao.NTIMES_REQUIRED})" in resp
+    assert flag == servidor_advinhacao.FLAG
+
+# ----------------- sessão assíncrona -----------------
+async def play_local(window=32, timeout=5.0):
+    server, port = await servidor_advinhacao.start_server()
+    try:
+        return await advinhacao.play_session("127.0.0.1", port, window, timeout)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+def test_play_session_returns_the_flag():
+    assert asyncio.run(play_local()) == servidor_advinhacao.FLAG
+
+def test_play_session_fails_on_a_wrong_last_guess(monkeypatch):
+    extract = advinhacao.MT19937.extract_number
+    calls = {"n": 0}
+
+    def wrong_last(self):
+        calls["n"] += 1
+        value = extract(self)
+        return value ^ 1 if calls["n"] == advinhacao.NTIMES_REQUIRED else value
+
+    monkeypatch.setattr(advinhacao.MT19937, "extract_number", wrong_last)
+    # timeout longo: a falha tem de vir da resposta lida, não de esperar o servidor
+    with pytest.raises(ValueError, match=f"palpite {advinhacao.NTIMES_REQUIRED} errado"):
+        asyncio.run(asyncio.wait_for(play_local(timeout=30.0), 10.0))
+
+def test_connect_timeout_is_not_reported_as_session_overrun(monkeypatch):
+    import sessoes_advinhacao
+
+    async def never_connects(host, port):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(asyncio, "open_connection", never_connects)
+    ok, _, detail = asyncio.run(sessoes_advinhacao.timed_session(
+        asyncio.Semaphore(1), "127.0.0.1", 1, 32, 0.05, 60.0))
+    assert not ok
+    assert detail == "conexão não abriu em 0.05s"